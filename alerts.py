@@ -0,0 +1,131 @@
+import datetime
+
+# Alert severities, most severe first
+CRITICAL = "critical"
+WARNING = "warning"
+INFO = "info"
+SEVERITIES = (CRITICAL, WARNING, INFO)
+
+# Alert types
+STOCK = "stock"  # out of stock (critical) or low on stock (warning)
+NO_SUPPLIER_ALERT = "no_supplier"
+GREENHOUSE = "greenhouse"
+FORECAST = "forecast"  # forecast to run out soon at the rate it is being used (info)
+
+# Plants with less than this quantity in stock are low on stock
+LOW_STOCK = 5
+
+# This class represents one alert shown in the alerts list
+class Alert:
+    def __init__(self, plant_id, alert_type, severity, message):
+        self.plant_id = plant_id  # None for alerts about the whole inventory
+        self.alert_type = alert_type
+        self.severity = severity
+        self.message = message
+
+# Method that returns the (severity, message) of the stock alert a plant needs, or None when it has enough stock
+# The plant is low on stock below reorder_point and out of stock at 0
+def stock_alert(plant, reorder_point=LOW_STOCK):
+    quantity = plant.quantity
+    if quantity == 0:
+        return CRITICAL, f"CRITICAL ALERT: Plant '{plant.name}' is out of stock (Quantity: {quantity})"
+    if quantity < reorder_point:
+        return WARNING, f"Alert: Plant '{plant.name}' is low on stock (Quantity: {quantity})"
+    return None
+
+# Method that returns the (severity, message) of the forecast alert a plant needs, or None
+# days_left is the days until the plant runs out at the rate it is being used, or None when it
+# is not being used; plants running out within alert_days are alerted on
+def forecast_alert(plant, days_left, alert_days):
+    if days_left is None or days_left > alert_days or plant.quantity == 0:
+        return None
+    when = "within a day" if days_left < 1 else f"in about {round(days_left)} day{'s' if round(days_left) != 1 else ''}"
+    return INFO, f"Forecast: Plant '{plant.name}' will run out {when} at its current rate (Quantity: {plant.quantity})"
+
+# Method that returns whether a month (1-12) is in the greenhouse season
+# season is the (first, last) month, which may run past the end of the year, e.g. (10, 5) for October to May
+def in_greenhouse_season(month, season):
+    first, last = season
+    if first <= last:
+        return first <= month <= last
+    return month >= first or month <= last
+
+# Method that returns the time after now at which the greenhouse season next starts or ends
+# The season starts on the 1st of its first month and ends on the 1st of the month after its last
+def next_season_change(now, season):
+    first, last = season
+    if not (1 <= first <= 12 and 1 <= last <= 12):
+        raise ValueError(f"The greenhouse season must be two months from 1 to 12, not {season}.")
+    boundaries = (first, last % 12 + 1)
+    year, month = now.year, now.month
+    while True:
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        if month in boundaries:
+            return datetime.datetime(year, month, 1)
+
+# This class holds the current alerts keyed by (plant_id, alert_type)
+# A plant has at most one alert of each type, so adding an alert again replaces
+# it instead of creating a duplicate, and clearing a plant's alerts does not
+# have to search through every alert.
+class AlertRegistry:
+    def __init__(self):
+        self.alerts = {}  # (plant_id, alert_type) -> Alert, in the order they were raised
+        self.types_by_plant = {}  # plant_id -> set of alert types raised for it
+        # Function called with no arguments after the alerts change, for example to redraw a list
+        self.on_change = None
+
+    # Method that tells on_change that the alerts changed
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
+
+    # Method that raises an alert, replacing any alert of the same type for the plant
+    def add(self, plant_id, alert_type, severity, message):
+        key = (plant_id, alert_type)
+        current = self.alerts.get(key)
+        if current and current.severity == severity and current.message == message:
+            return current
+        alert = Alert(plant_id, alert_type, severity, message)
+        self.alerts[key] = alert
+        self.types_by_plant.setdefault(plant_id, set()).add(alert_type)
+        self._changed()
+        return alert
+
+    # Method that returns the alert of a type for a plant, or None
+    def get(self, plant_id, alert_type):
+        return self.alerts.get((plant_id, alert_type))
+
+    # Method that clears one type of alert for a plant, or all of its alerts when no type is given
+    def clear(self, plant_id, alert_type=None):
+        types = self.types_by_plant.get(plant_id)
+        if not types:
+            return
+        cleared = list(types) if alert_type is None else [alert_type] if alert_type in types else []
+        for cleared_type in cleared:
+            del self.alerts[(plant_id, cleared_type)]
+            types.discard(cleared_type)
+        if not types:
+            del self.types_by_plant[plant_id]
+        if cleared:
+            self._changed()
+
+    # Method that moves a plant's alerts to a new plant id
+    def move(self, old_id, new_id):
+        for alert_type in self.types_by_plant.pop(old_id, ()):
+            alert = self.alerts.pop((old_id, alert_type))
+            alert.plant_id = new_id
+            self.alerts[(new_id, alert_type)] = alert
+            self.types_by_plant.setdefault(new_id, set()).add(alert_type)
+        self._changed()
+
+    # Method that returns the alerts at or above a severity, in the order they were raised
+    def filtered(self, min_severity=INFO):
+        allowed = SEVERITIES[:SEVERITIES.index(min_severity) + 1]
+        return [alert for alert in self.alerts.values() if alert.severity in allowed]
+
+    # Method that returns the number of alerts of each severity
+    def counts(self):
+        counts = dict.fromkeys(SEVERITIES, 0)
+        for alert in self.alerts.values():
+            counts[alert.severity] += 1
+        return counts
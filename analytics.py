@@ -0,0 +1,285 @@
+import csv
+import json
+import os
+import time
+from operator import attrgetter
+from alerts import LOW_STOCK
+from storage import atomic_write_json
+
+# NumPy is optional; without it the same reports are worked out with plain Python loops
+# It is imported by load_numpy the first time a report is worked out, because importing it
+# takes longer than starting the rest of the program
+numpy = None
+numpy_checked = False
+
+# Columns of the low stock list when a report is exported as csv
+LOW_STOCK_FIELDS = ("id", "name", "supplier", "quantity", "reorder_point", "out_of_stock")
+# Seconds in a day, to turn the times in the stock log into days
+SECONDS_PER_DAY = 86400
+
+# This class holds the reorder points used to decide which plants are low on stock
+# A plant is low on stock when its quantity is below its reorder point, which is the one set
+# for the plant, else the one set for its supplier, else the default. Plants with a quantity
+# of 0 are out of stock whatever their reorder point.
+class ReorderPoints:
+    def __init__(self, default=LOW_STOCK, suppliers=None, plants=None):
+        self.default = default
+        self.suppliers = dict(suppliers or {})  # supplier name -> reorder point
+        self.plants = dict(plants or {})  # plant id -> reorder point
+
+    # Method that returns the reorder point of a plant
+    def for_plant(self, plant):
+        point = self.plants.get(plant.plant_id)
+        if point is None:
+            point = self.suppliers.get(plant.supplier, self.default)
+        return point
+
+    # Method that moves a plant's reorder point to its new id; returns whether it had one
+    def rename_plant(self, old_id, new_id):
+        if old_id not in self.plants:
+            return False
+        self.plants[new_id] = self.plants.pop(old_id)
+        return True
+
+    # Method that moves a supplier's reorder point to its new name; returns whether it had one
+    def rename_supplier(self, old_name, new_name):
+        if old_name not in self.suppliers or old_name == new_name:
+            return False
+        self.suppliers[new_name] = self.suppliers.pop(old_name)
+        return True
+
+    # Method that builds reorder points from the json saved by to_dict
+    @classmethod
+    def from_dict(cls, data):
+        return cls(int(data.get("default", LOW_STOCK)),
+                   {name: int(point) for name, point in data.get("suppliers", {}).items()},
+                   {int(plant_id): int(point) for plant_id, point in data.get("plants", {}).items()})
+
+    # Method that converts the reorder points to json; plant ids become text because json keys must be
+    def to_dict(self):
+        return {
+            "default": self.default,
+            "suppliers": self.suppliers,
+            "plants": {str(plant_id): point for plant_id, point in self.plants.items()}
+        }
+
+    # Method that reads the reorder points from a json file, or returns the defaults if there is none yet
+    @classmethod
+    def from_file(cls, path):
+        if not os.path.exists(path):
+            return cls()
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    # Method that writes the reorder points to a json file
+    def save(self, path):
+        atomic_write_json(path, self.to_dict(), indent=4)
+
+# This class holds the outcome of a stock report
+class StockReport:
+    def __init__(self):
+        self.plant_count = 0
+        self.total_quantity = 0
+        self.greenhouse_share = 0.0  # fraction of plants that require a greenhouse
+        # One row per low stock plant, most urgent first:
+        # {"id", "name", "supplier", "quantity", "reorder_point", "out_of_stock"}
+        self.low_stock = []
+        # supplier name -> {"plants", "quantity", "low_stock", "reorder_point"}
+        self.totals_by_supplier = {}
+
+    # Method that converts the report to json-ready data
+    def to_dict(self):
+        return {
+            "plant_count": self.plant_count,
+            "total_quantity": self.total_quantity,
+            "greenhouse_share": self.greenhouse_share,
+            "totals_by_supplier": self.totals_by_supplier,
+            "low_stock": self.low_stock
+        }
+
+# This class holds how fast each plant is being sold or used, worked out from the stock log
+class StockForecast:
+    def __init__(self):
+        self.days = 0.0  # days of the log the rates were worked out from
+        self.rates = {}  # plant id -> units used per day, for the plants used in those days
+        self.days_left = {}  # plant id -> days until the plant runs out at its rate, when the forecast was made
+
+    # Method that returns the days until a plant runs out at its current quantity, or None when it is not being used
+    def days_until_stockout(self, plant):
+        rate = self.rates.get(plant.plant_id)
+        return plant.quantity / rate if rate else None
+
+# Method that imports NumPy the first time it is called and returns it, or None when it is not installed
+def load_numpy():
+    global numpy, numpy_checked
+    if not numpy_checked:
+        numpy_checked = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy
+
+# Method that works out the stock report for every plant in the inventory
+# The plants are read once into columns of ids, quantities, supplier numbers and greenhouse
+# flags, and the comparisons and totals are then done on whole columns with NumPy
+def stock_report(inventory, reorder_points):
+    plants = list(inventory.plants.values())
+    # Suppliers are numbered so they can be totalled by position; plants may name a supplier
+    # that is not in the supplier list, such as "No Supplier Assigned"
+    supplier_numbers = {name: number for number, name in enumerate(inventory.suppliers)}
+    for plant in plants:
+        if plant.supplier not in supplier_numbers:
+            supplier_numbers[plant.supplier] = len(supplier_numbers)
+    supplier_names = list(supplier_numbers)
+    supplier_points = [reorder_points.suppliers.get(name, reorder_points.default) for name in supplier_names]
+
+    if load_numpy() is not None:
+        return _numpy_report(plants, supplier_numbers, supplier_names, supplier_points, reorder_points)
+    return _python_report(plants, supplier_numbers, supplier_names, supplier_points, reorder_points)
+
+# Method that builds the report rows shared by both ways of working out the report
+# low_quantities and low_points are the quantities and reorder points of the plants at low_positions
+def _fill_report(plants, low_positions, low_quantities, low_points, supplier_names, supplier_points, totals):
+    report = StockReport()
+    report.low_stock = [
+        {"id": plants[position].plant_id, "name": plants[position].name, "supplier": plants[position].supplier,
+         "quantity": quantity, "reorder_point": point, "out_of_stock": quantity == 0}
+        for position, quantity, point in zip(low_positions, low_quantities, low_points)
+    ]
+    for number, name in enumerate(supplier_names):
+        plant_count, quantity, low_count = totals[number]
+        report.totals_by_supplier[name] = {"plants": int(plant_count), "quantity": int(quantity),
+                                           "low_stock": int(low_count), "reorder_point": supplier_points[number]}
+    return report
+
+# Method that works out the report on NumPy columns
+def _numpy_report(plants, supplier_numbers, supplier_names, supplier_points, reorder_points):
+    count = len(plants)
+    ids = numpy.fromiter(map(attrgetter("plant_id"), plants), dtype=numpy.int64, count=count)
+    quantities = numpy.fromiter(map(attrgetter("quantity"), plants), dtype=numpy.int64, count=count)
+    greenhouse = numpy.fromiter(map(attrgetter("greenhouse"), plants), dtype=bool, count=count)
+    suppliers = numpy.fromiter(map(supplier_numbers.__getitem__, map(attrgetter("supplier"), plants)), dtype=numpy.int64, count=count)
+
+    # Each plant's reorder point is its supplier's, replaced for the plants that have their own
+    points = numpy.array(supplier_points, dtype=numpy.int64)[suppliers]
+    if reorder_points.plants:
+        own = numpy.isin(ids, numpy.fromiter(reorder_points.plants, dtype=numpy.int64))
+        points[own] = [reorder_points.plants[plant_id] for plant_id in ids[own].tolist()]
+
+    low = (quantities < points) | (quantities == 0)
+    # Most urgent first: lowest quantity, then furthest below the reorder point
+    low_positions = numpy.flatnonzero(low)
+    low_positions = low_positions[numpy.lexsort((quantities[low_positions] - points[low_positions], quantities[low_positions]))]
+
+    supplier_count = len(supplier_names)
+    totals = numpy.stack([
+        numpy.bincount(suppliers, minlength=supplier_count),
+        numpy.bincount(suppliers, weights=quantities, minlength=supplier_count),
+        numpy.bincount(suppliers[low], minlength=supplier_count)
+    ], axis=1)
+
+    report = _fill_report(plants, low_positions.tolist(), quantities[low_positions].tolist(), points[low_positions].tolist(),
+                          supplier_names, supplier_points, totals)
+    report.plant_count = count
+    report.total_quantity = int(quantities.sum())
+    report.greenhouse_share = float(greenhouse.mean()) if count else 0.0
+    return report
+
+# Method that works out the same report with plain Python, for when NumPy is not installed
+def _python_report(plants, supplier_numbers, supplier_names, supplier_points, reorder_points):
+    quantities = []
+    points = []
+    totals = [[0, 0, 0] for _ in supplier_names]
+    low_positions = []
+    greenhouse_count = 0
+    for position, plant in enumerate(plants):
+        number = supplier_numbers[plant.supplier]
+        point = reorder_points.plants.get(plant.plant_id, supplier_points[number])
+        quantity = plant.quantity
+        quantities.append(quantity)
+        points.append(point)
+        supplier_totals = totals[number]
+        supplier_totals[0] += 1
+        supplier_totals[1] += quantity
+        if quantity < point or quantity == 0:
+            supplier_totals[2] += 1
+            low_positions.append(position)
+        greenhouse_count += plant.greenhouse
+    low_positions.sort(key=lambda position: (quantities[position], quantities[position] - points[position]))
+
+    report = _fill_report(plants, low_positions, [quantities[position] for position in low_positions],
+                          [points[position] for position in low_positions], supplier_names, supplier_points, totals)
+    report.plant_count = len(plants)
+    report.total_quantity = sum(quantities)
+    report.greenhouse_share = greenhouse_count / len(plants) if plants else 0.0
+    return report
+
+# Method that works out, for every plant in the inventory, how many units a day it is being used
+# and in how many days it will run out, from the quantity changes in the stock log
+# Only stock taken away counts towards the rates, less what was put back by undoing it; stock
+# received does not slow them down. The rates are over the last window_days days, or the time
+# the log covers if it is younger, but at least a day, so a few sales just after the log was
+# started do not look like a rush. Only the columns of the changes in the window are read, and
+# they are totalled per plant in one pass with NumPy.
+def forecast_stockouts(inventory, stock_log, window_days, now=None):
+    forecast = StockForecast()
+    first = stock_log.first_time()
+    if first is None:
+        return forecast
+    now = time.time() if now is None else now
+    start = now - window_days * SECONDS_PER_DAY
+    forecast.days = max((now - max(start, first)) / SECONDS_PER_DAY, 1.0)
+    position = stock_log.position_at(start)
+
+    if load_numpy() is not None:
+        _numpy_forecast(forecast, inventory, stock_log, position)
+    else:
+        _python_forecast(forecast, inventory, stock_log, position)
+    return forecast
+
+# Method that works out the forecast on NumPy columns
+def _numpy_forecast(forecast, inventory, stock_log, position):
+    ids = stock_log.read("ids", position, numpy)
+    changes = stock_log.read("changes", position, numpy)
+    undone = stock_log.read("undone", position, numpy).astype(bool)
+    # Stock taken away, and stock put back by undoing that, which counts against it
+    used = ((changes < 0) & ~undone) | ((changes > 0) & undone)
+    plant_ids, numbers = numpy.unique(ids[used], return_inverse=True)
+    rates = numpy.bincount(numbers, weights=-changes[used], minlength=len(plant_ids)) / forecast.days
+
+    # Plants deleted since, or given a new id, have no forecast, nor plants whose sales were all undone
+    plants = inventory.plants
+    present = numpy.fromiter((plant_id in plants for plant_id in plant_ids.tolist()), dtype=bool, count=len(plant_ids))
+    present &= rates > 0
+    plant_ids, rates = plant_ids[present], rates[present]
+    quantities = numpy.fromiter((plants[plant_id].quantity for plant_id in plant_ids.tolist()), dtype=numpy.int64, count=len(plant_ids))
+
+    plant_ids = plant_ids.tolist()
+    forecast.rates = dict(zip(plant_ids, rates.tolist()))
+    forecast.days_left = dict(zip(plant_ids, (quantities / rates).tolist()))
+
+# Method that works out the same forecast with plain Python, for when NumPy is not installed
+def _python_forecast(forecast, inventory, stock_log, position):
+    used = {}
+    for plant_id, change, undone in zip(stock_log.read("ids", position), stock_log.read("changes", position),
+                                        stock_log.read("undone", position)):
+        if (change < 0) != bool(undone) and change:
+            used[plant_id] = used.get(plant_id, 0) - change
+    plants = inventory.plants
+    forecast.rates = {plant_id: amount / forecast.days for plant_id, amount in used.items()
+                      if amount > 0 and plant_id in plants}
+    forecast.days_left = {plant_id: plants[plant_id].quantity / rate for plant_id, rate in forecast.rates.items()}
+
+# Method that writes a report to a file: the low stock list for .csv, or the whole report for .json
+def export_report(report, path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=LOW_STOCK_FIELDS)
+            writer.writeheader()
+            writer.writerows(report.low_stock)
+    elif extension == ".json":
+        atomic_write_json(path, report.to_dict(), indent=4)
+    else:
+        raise ValueError(f"Unsupported file type '{extension}'. Use .csv or .json.")
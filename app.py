@@ -0,0 +1,1424 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, simpledialog, filedialog
+import datetime
+import queue
+import threading
+import time
+import bulk
+import instrument
+from config import data_file, supplier_file, journal_file, database_file, storage_backend, instrumentation_file, reorder_file, service_url
+from config import greenhouse_season, unique_plant_names, event_file, event_host, event_port, event_sequence_file
+from config import stock_history_folder, forecast_window_days, forecast_alert_days
+from model import Plant, Supplier, Inventory, NO_SUPPLIER
+from autosave import SaveScheduler
+from history import History
+from stocklog import StockLog
+from analytics import ReorderPoints, stock_report, export_report, forecast_stockouts
+from events import open_event_bus
+from alerts import AlertRegistry, WARNING, INFO, SEVERITIES, STOCK, NO_SUPPLIER_ALERT, GREENHOUSE, FORECAST, stock_alert
+from alerts import forecast_alert
+from alerts import in_greenhouse_season, next_season_change
+from search import SearchIndex, search_plants
+from instrument import timed
+from storage import atomic_write_json, open_store
+from virtual_tree import VirtualTreeview
+
+# Text shown on the greenhouse alert for the whole inventory
+GREENHOUSE_ALERT_TEXT = "GREENHOUSE ALERT: Some plants require greenhouse. Consider moving them in."
+
+# Plants handed from the loading thread to the window at a time
+LOAD_BATCH = 2000
+# Milliseconds between checks for loaded plants, and the time allowed for adding them
+LOAD_POLL_MS = 15
+LOAD_BUDGET_SECONDS = 0.04
+# Plants whose alerts are checked between checks of the time allowed, once loading is done
+ALERT_BATCH = 500
+# Milliseconds between updates of the save status in the status bar
+SAVE_STATUS_MS = 500
+# Milliseconds to wait after typing in the search box before searching
+SEARCH_DELAY_MS = 150
+# Longest wait between greenhouse season checks, so a clock changed or a computer woken from
+# sleep is noticed within this many milliseconds
+SEASON_CHECK_MAX_MS = 3600000
+# Milliseconds between stock forecasts, which pick up the rates plants have been selling at since
+FORECAST_REFRESH_MS = 900000
+# Milliseconds between refreshes of the diagnostics tab while it is shown
+DIAGNOSTICS_REFRESH_MS = 1000
+# Kinds of stock adjustment -> sign given to every quantity change, None to use the signs as typed
+ADJUSTMENT_KINDS = {"Receive shipment": 1, "Sell-through": -1, "Signed changes": None}
+# Seconds between checks for changes made on other terminals, when working through the inventory service
+SERVICE_POLL_SECONDS = 1.0
+
+# This class initializes the GUI, manages plant and supplier data, and handles alerts
+# started is the time.perf_counter() the program started at, for the startup time in the diagnostics
+class InventoryApp(tk.Tk):
+    def __init__(self, started=None):
+        super().__init__()
+        self.started = time.perf_counter() if started is None else started
+
+        # Set the application title
+        self.title("Root 31 Inventory System")
+    
+        # Set default window size
+        self.geometry("1000x600") 
+
+        # In-memory plants and suppliers; the tables below are rendered from it
+        # With INVENTORY_SERVICE set, the inventory is shared with other terminals through the service
+        self.service_error = None
+        if service_url:
+            # Imported here as the http client is only needed when working through the service
+            from remote import ServiceClient, RemoteInventory, RemoteStore
+            self.service = ServiceClient(service_url)
+            self.inventory = RemoteInventory(self.service)
+            self.store = RemoteStore(self.service)
+        else:
+            self.service = None
+            self.inventory = Inventory()
+            self.store = open_store(storage_backend, data_file, supplier_file, journal_file, database_file)
+        # Writes changes to the store on a background thread shortly after editing stops
+        self.saver = SaveScheduler(self.store)
+        # Sends every change to other programs, once loading is done; when working through the
+        # inventory service, the service sends them instead
+        self.events = None
+        if not self.service:
+            try:
+                self.events = open_event_bus(event_file, event_host, event_port, event_sequence_file)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Error", f"Failed to start the change events, they will not be sent: {e}")
+        # Log of the quantity changes and the forecast worked out from it, once loading is done;
+        # when working through the inventory service, the service keeps the log
+        self.stock_log = None
+        self.forecast = None
+        if not self.service:
+            try:
+                self.stock_log = StockLog(stock_history_folder)
+            except OSError as e:
+                messagebox.showerror("Error", f"Failed to open the stock history, there will be no stock forecasts: {e}")
+        # Current alerts; the alerts list is drawn from it
+        self.alerts = AlertRegistry()
+        self.alerts.on_change = self.schedule_alert_render
+        self.alert_render_pending = False
+        # Quantity below which each plant is low on stock
+        try:
+            self.reorder_points = ReorderPoints.from_file(reorder_file)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Failed to load reorder points, using the default of 5: {e}")
+            self.reorder_points = ReorderPoints()
+        # Operations that can be undone, once loading is done; not kept when working through the
+        # inventory service, where other terminals may have changed the same records since
+        self.history = None
+        # Words of every plant, for the search box on the inventory tab
+        self.search_index = SearchIndex()
+        self.search_job = None
+
+        # ---------- Menu ----------
+        self.menu_bar = tk.Menu(self)
+        self.file_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.file_menu.add_command(label="Import Plants...", command=self.import_plants)
+        self.file_menu.add_command(label="Export Plants...", command=self.export_plants)
+        self.menu_bar.add_cascade(label="File", menu=self.file_menu)
+        self.edit_menu = tk.Menu(self.menu_bar, tearoff=0)
+        self.edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo, state="disabled")
+        self.edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo, state="disabled")
+        self.menu_bar.add_cascade(label="Edit", menu=self.edit_menu)
+        self.config(menu=self.menu_bar)
+        self.bind("<Control-z>", lambda event: self.undo())
+        self.bind("<Control-y>", lambda event: self.redo())
+
+        self.tabs = ttk.Notebook(self)
+
+        # Inventory tab
+        self.inventory_tab = ttk.Frame(self.tabs)
+        self.tabs.add(self.inventory_tab, text="Inventory")
+
+        # Supplier tab; its table is filled the first time the tab is shown
+        self.suppliers_tab = ttk.Frame(self.tabs)
+        self.tabs.add(self.suppliers_tab, text="Suppliers")
+        self.supplier_tree_filled = False
+
+        # Reports tab with the low stock list and totals by supplier
+        self.create_reports_tab()
+
+        # Diagnostics tab, only when the program was started with INVENTORY_INSTRUMENT=1
+        if instrument.ENABLED:
+            self.create_diagnostics_tab()
+
+        # Expand the tabs to fit the window
+        self.tabs.pack(expand=1, fill="both")
+        self.tabs.bind("<<NotebookTabChanged>>", lambda event: self.tab_changed())
+
+        # ---------- Plant Inventory Tab Search ----------
+        # Search box that filters the table by name, description and supplier as the user types,
+        # for example "rose quantity < 5" or "fern greenhouse = yes"
+        self.search_frame = ttk.Frame(self.inventory_tab)
+        self.search_frame.pack(side=tk.TOP, fill=tk.X)
+        ttk.Label(self.search_frame, text="Search:").pack(side='left', padx=5, pady=5)
+        self.search_text = tk.StringVar()
+        self.search_text.trace_add("write", lambda *args: self.schedule_search())
+        ttk.Entry(self.search_frame, textvariable=self.search_text, width=40).pack(side='left', pady=5)
+        ttk.Button(self.search_frame, text="Clear", command=lambda: self.search_text.set("")).pack(side='left', padx=5, pady=5)
+        self.search_label = ttk.Label(self.search_frame, text="")
+        self.search_label.pack(side='left', padx=5)
+
+        # ---------- Plant Inventory Tab with scrollbars ----------
+        # Frame the inventory tab and its scroll bars
+        inventory_frame = ttk.Frame(self.inventory_tab)
+        inventory_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Build the table to display the plants
+        # Only the rows in view are created; their values are read from the inventory by plant id
+        self.inventory_tree = VirtualTreeview(inventory_frame, lambda plant_id: self.inventory.get_plant(plant_id).values(),
+                                              columns=("ID", "Name", "Description", "Quantity", "Greenhouse Required", "Supplier"), show="headings")
+
+        # Place the table in frame and add scroll bars for vertical and horizontal scroll
+        self.inventory_tree.grid(row=0, column=0, sticky="nsew")
+        inv_scrollbar_y = ttk.Scrollbar(inventory_frame, orient="vertical", command=self.inventory_tree.yview)
+        inv_scrollbar_y.grid(row=0, column=1, sticky="ns")
+        inv_scrollbar_x = ttk.Scrollbar(inventory_frame, orient="horizontal", command=self.inventory_tree.xview)
+        inv_scrollbar_x.grid(row=1, column=0, sticky="ew")
+
+        # Ensure the scroll bars remain visible when resizing the window
+        inventory_frame.grid_rowconfigure(0, weight=1)
+        inventory_frame.grid_columnconfigure(0, weight=1)
+        self.inventory_tree.set_yscrollcommand(inv_scrollbar_y.set)
+        self.inventory_tree.config(xscrollcommand=inv_scrollbar_x.set)
+
+        # ---------- Plant Inventory Tab Buttons ----------
+        self.inventory_buttons = ttk.Frame(self.inventory_tab)
+        self.inventory_buttons.pack(side=tk.TOP, fill=tk.X)
+
+        # Buttons to add, update, and delete plants
+        ttk.Button(self.inventory_buttons, text="Add Plant", command=self.add_plant).pack(side='left')
+        ttk.Button(self.inventory_buttons, text="Update Plant", command=self.update_plant).pack(side='left')
+        ttk.Button(self.inventory_buttons, text="Delete Plant", command=self.delete_plant).pack(side='left')
+        ttk.Button(self.inventory_buttons, text="Adjust Stock", command=self.adjust_stock).pack(side='left')
+
+        # ---------- Supplier Tab with scrollbars ----------
+        # Frame the supplier tab and its scroll bars
+        supplier_frame = ttk.Frame(self.suppliers_tab)
+        supplier_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Build the table to display the suppliers
+        self.supplier_tree = ttk.Treeview(supplier_frame, columns=("Name", "Phone Number", "Address"), show="headings")
+        
+        # Set the column names
+        for col in self.supplier_tree["columns"]:
+            self.supplier_tree.heading(col, text=col)
+        
+        # Place the table in frame and add scroll bars for vertical and horizontal scroll
+        self.supplier_tree.grid(row=0, column=0, sticky="nsew")
+        sup_scrollbar_y = ttk.Scrollbar(supplier_frame, orient="vertical", command=self.supplier_tree.yview)
+        sup_scrollbar_y.grid(row=0, column=1, sticky="ns")
+        sup_scrollbar_x = ttk.Scrollbar(supplier_frame, orient="horizontal", command=self.supplier_tree.xview)
+        sup_scrollbar_x.grid(row=1, column=0, sticky="ew")
+
+        # Ensure the scroll bars remain visible when resizing the window
+        supplier_frame.grid_rowconfigure(0, weight=1)
+        supplier_frame.grid_columnconfigure(0, weight=1)
+        self.supplier_tree.config(yscrollcommand=sup_scrollbar_y.set, xscrollcommand=sup_scrollbar_x.set)
+
+        # ---------- Supplier Tab Buttons ----------
+        self.supplier_buttons = ttk.Frame(self.suppliers_tab)
+        self.supplier_buttons.pack()
+
+        # Buttons to add, update, and remove suppliers
+        ttk.Button(self.supplier_buttons, text="Add Supplier", command=self.add_supplier).pack(side='left', padx=5, pady=5)
+        ttk.Button(self.supplier_buttons, text="Remove Supplier", command=self.remove_supplier).pack(side='left', padx=5, pady=5)
+        ttk.Button(self.supplier_buttons, text="Update Supplier", command=self.update_supplier).pack(side='left', padx=5, pady=5)
+
+        # ---------- Alerts Frame ----------
+        # Frame that contains the alerts listbox and scrollbars
+        self.alerts_frame = ttk.Frame(self)
+        self.alerts_frame.pack(side=tk.RIGHT, fill=tk.BOTH)
+ 
+        # Listbox to display system alerts (low stock, greenhouse needs, etc.)
+        self.alerts_listbox = tk.Listbox(self.alerts_frame, height=20, width=50)
+        self.alerts_listbox.grid(row=0, column=0, sticky="nsew")
+ 
+        # Vertical scrollbar for the alerts listbox
+        self.alerts_scrollbar = ttk.Scrollbar(self.alerts_frame, orient="vertical", command=self.alerts_listbox.yview)
+        self.alerts_scrollbar.grid(row=0, column=1, sticky="ns")
+ 
+        # Horizontal scrollbar for the alerts listbox
+        self.alerts_h_scrollbar = ttk.Scrollbar(self.alerts_frame, orient="horizontal", command=self.alerts_listbox.xview)
+        self.alerts_h_scrollbar.grid(row=1, column=0, sticky="ew")
+ 
+        # Link the scrollbars to the listbox for proper scrolling 
+        self.alerts_listbox.config(yscrollcommand=self.alerts_scrollbar.set, xscrollcommand=self.alerts_h_scrollbar.set)
+ 
+        # Configure the alert frame to resize properly with the main window
+        self.alerts_frame.grid_rowconfigure(0, weight=1)
+        self.alerts_frame.grid_columnconfigure(0, weight=1)
+
+        # Dropdown that limits the alerts list to a minimum severity
+        self.alert_severity = ttk.Combobox(self.alerts_frame, values=[severity.capitalize() for severity in SEVERITIES], state="readonly")
+        self.alert_severity.set(INFO.capitalize())
+        self.alert_severity.grid(row=2, column=0, sticky="w")
+        self.alert_severity.bind("<<ComboboxSelected>>", lambda event: self.render_alerts())
+
+        # ---------- Status Bar ----------
+        self.status_frame = ttk.Frame(self)
+        self.status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # Display the current date in the bottom left corner of the window
+        current_date = datetime.datetime.now().strftime("%B %d, %Y")
+        self.date_label = tk.Label(self.status_frame, text=current_date)
+        self.date_label.pack(side=tk.LEFT, anchor="w")
+
+        # Progress of loading the data at startup, hidden once loading is done
+        self.load_progress = ttk.Progressbar(self.status_frame, length=150, maximum=1.0)
+        self.load_progress.pack(side=tk.LEFT, padx=5)
+        self.load_label = tk.Label(self.status_frame, text="Loading...")
+        self.load_label.pack(side=tk.LEFT)
+
+        # Whether there are changes waiting to be saved, or when they were last saved
+        self.save_label = tk.Label(self.status_frame, text="")
+        self.save_label.pack(side=tk.RIGHT, anchor="e")
+        self.update_save_status()
+
+        # Load data from JSON files into the program on startup
+        self.load_data()
+        
+        # Ensure data is saved properly when the window is closed
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+
+    # Method for loading the program data
+    # The files are read on a separate thread and the rows are added to the window in batches,
+    # so the window can be shown and used for scrolling while a large inventory is loading
+    @timed
+    def load_data(self):
+        self.loading = True
+        self.load_started = time.perf_counter()
+        self.first_rows_shown = False
+        self.load_errors = []
+        self.set_editing_enabled(False)
+        self.load_queue = queue.Queue()
+        threading.Thread(target=self.read_data, daemon=True).start()
+        self.after(LOAD_POLL_MS, self.add_loaded_data)
+
+    # Method run on the loading thread that reads the stored rows and queues them in batches
+    # It only builds Plant and Supplier objects; the window and inventory are changed by add_loaded_data
+    @timed
+    def read_data(self):
+        try:
+            suppliers = [Supplier.from_dict(row) for row in self.store.iter_suppliers()]
+            self.load_queue.put(("suppliers", suppliers))
+            batch = []
+            for row in self.store.iter_plants():
+                batch.append(Plant.from_dict(row))
+                if len(batch) >= LOAD_BATCH:
+                    self.load_queue.put(("plants", batch, self.store.progress))
+                    batch = []
+            self.load_queue.put(("plants", batch, 1.0))
+            self.load_queue.put(("done",))
+        except Exception as e:
+            self.load_queue.put(("error", e))
+
+    # Method run on the window thread that adds queued batches for a short time and then yields to the window
+    @timed
+    def add_loaded_data(self):
+        deadline = time.perf_counter() + LOAD_BUDGET_SECONDS
+        while time.perf_counter() < deadline:
+            try:
+                message = self.load_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if message[0] == "suppliers":
+                for supplier in message[1]:
+                    try:
+                        self.inventory.add_stored_supplier(supplier)
+                    except ValueError as e:
+                        self.load_errors.append(f"Failed to load supplier: {e}")
+                        continue
+                # The supplier table may have been shown before the suppliers were read
+                if self.supplier_tree_filled:
+                    self.supplier_tree_filled = False
+                    self.fill_supplier_tree()
+
+            elif message[0] == "plants":
+                loaded = []
+                for plant in message[1]:
+                    try:
+                        self.inventory.add_stored_plant(plant)
+                    except ValueError as e:
+                        self.load_errors.append(f"Failed to load plant: {e}")
+                        continue
+                    loaded.append(plant.plant_id)
+                self.search_index.add_plants(self.inventory.get_plant(plant_id) for plant_id in loaded)
+                # While a search is shown, only the matching plants are added to the table
+                if self.searching():
+                    self.schedule_search()
+                else:
+                    self.inventory_tree.extend_keys(loaded)
+                self.load_progress["value"] = message[2]
+                if instrument.ENABLED and loaded and not self.first_rows_shown:
+                    self.first_rows_shown = True
+                    instrument.metrics.record_call("startup until first rows", time.perf_counter() - self.started)
+                self.load_label.config(text=f"Loading... {len(self.inventory.plants)} plants")
+
+            elif message[0] == "error":
+                self.load_errors.append(f"Failed to load data: {message[1]}")
+                self.finish_loading()
+                return
+
+            else:
+                self.finish_loading()
+                return
+
+        self.after(LOAD_POLL_MS, self.add_loaded_data)
+
+    # Method that runs once every row has been added to the window
+    @timed
+    def finish_loading(self):
+        # Save every change made from now on, and send it to the programs following the changes
+        self.saver.attach(self.inventory)
+        if self.events:
+            self.events.attach(self.inventory)
+        # Log every quantity change for the stock forecasts, written along with the saves
+        if self.stock_log:
+            self.stock_log.attach(self.inventory)
+            self.saver.add_log(self.stock_log)
+        # Names are only checked for new changes; the dedupe command reports the ones already stored
+        self.inventory.unique_names = unique_plant_names
+        # Keep the search index and the search results up to date with every change
+        self.inventory.listeners.append(self.search_index.record)
+        self.inventory.listeners.append(lambda changes: self.schedule_search() if self.searching() else None)
+        # Let every change made from now on be undone
+        if not self.service:
+            self.history = History(self.inventory)
+            self.inventory.listeners.append(lambda changes: self.update_edit_menu())
+
+        # Run the greenhouse alert check after loading plants, and again when the season starts or ends
+        self.check_greenhouse_alert()
+        self.schedule_season_check()
+        # Check if any plants need a low stock or missing supplier alert; this is done once the
+        # table is shown, a batch at a time, so a large inventory can be used while it runs
+        self.after_idle(self.check_loaded_alerts, list(self.inventory.plants))
+        # Alert on plants forecast to run out soon, and keep the forecast up to date
+        if self.stock_log:
+            self.after_idle(self.update_forecast)
+
+        # Pick up the changes made on other terminals
+        if self.service:
+            self.service_queue = queue.Queue()
+            threading.Thread(target=self.watch_service, daemon=True).start()
+            self.after(LOAD_POLL_MS, self.add_service_changes)
+
+        self.load_progress.pack_forget()
+        self.load_label.pack_forget()
+        self.loading = False
+        self.set_editing_enabled(True)
+        # load_data only starts the loading, so the time until every row is shown is recorded here
+        if instrument.ENABLED:
+            instrument.metrics.record_call("loading until done", time.perf_counter() - self.load_started)
+
+        # Display an error message if any records failed to load
+        journal = getattr(self.store, "journal", None)
+        if journal is not None and journal.bad_lines:
+            self.load_errors.append(f"Skipped {journal.bad_lines} unreadable lines of {journal.path}; "
+                                    "the changes in them were not loaded.")
+        if self.load_errors:
+            messagebox.showerror("Error", "\n".join(self.load_errors[:10]) +
+                                 (f"\n...and {len(self.load_errors) - 10} more" if len(self.load_errors) > 10 else ""))
+
+    # Method that checks the alerts of the given plants for a short time and then yields to the window,
+    # continuing from position the next time
+    @timed
+    def check_loaded_alerts(self, plant_ids, position=0):
+        deadline = time.perf_counter() + LOAD_BUDGET_SECONDS
+        while position < len(plant_ids) and time.perf_counter() < deadline:
+            for plant_id in plant_ids[position:position + ALERT_BATCH]:
+                # Plants deleted or given a new ID since loading already had their alerts checked
+                # Stock already low when loaded is not a change, so it is not published
+                plant = self.inventory.plants.get(plant_id)
+                if plant is not None:
+                    self.check_plant_alerts(plant, publish=False)
+            position += ALERT_BATCH
+        if position < len(plant_ids):
+            self.after(LOAD_POLL_MS, self.check_loaded_alerts, plant_ids, position)
+
+    # Method that draws a tab's contents when it is shown
+    def tab_changed(self):
+        selected = self.tabs.select()
+        if selected == str(self.suppliers_tab):
+            self.fill_supplier_tree()
+        elif selected == str(self.reports_tab):
+            self.render_report()
+
+    # Method that adds every supplier to the supplier table the first time it is shown
+    # Later changes are made to the table row by row
+    @timed
+    def fill_supplier_tree(self):
+        if self.supplier_tree_filled:
+            return
+        self.supplier_tree_filled = True
+        self.supplier_tree.delete(*self.supplier_tree.get_children())
+        for supplier in self.inventory.suppliers.values():
+            self.supplier_tree.insert('', tk.END, iid=supplier.name, values=supplier.values())
+
+    # Method that enables or disables the buttons that change plants and suppliers
+    def set_editing_enabled(self, enabled):
+        for button in self.inventory_buttons.winfo_children() + self.supplier_buttons.winfo_children():
+            button.state(["!disabled"] if enabled else ["disabled"])
+
+    # Method that returns the id of the plant selected in the inventory table, or None
+    def selected_plant_id(self):
+        return self.inventory_tree.selected()
+
+    # Method that redraws a plant's row in the inventory table after it was changed
+    def refresh_plant_row(self, old_id, plant):
+        self.inventory_tree.refresh_key(old_id, plant.plant_id)
+
+    # Method that checks the quantity of a plant and generates an alert
+    # Out of stock plants get a critical alert and low stock plants a warning
+    # With publish, a plant moving into, out of or between them is sent as a stock event
+    @timed
+    def check_low_stock_alert(self, plant, publish=True):
+        reorder_point = self.reorder_points.for_plant(plant)
+        alert = stock_alert(plant, reorder_point)
+        if publish and self.events:
+            previous = self.alerts.get(plant.plant_id, STOCK)
+            severity = alert[0] if alert else None
+            if (previous.severity if previous else None) != severity:
+                self.events.stock_changed(plant, severity, reorder_point)
+        if alert:
+            self.alerts.add(plant.plant_id, STOCK, *alert)
+
+        # If the plant stock is sufficient, remove any previous low stock alerts
+        else:
+            self.remove_alert(plant.plant_id, STOCK)
+        self.check_forecast_alert(plant)
+
+    # Method that alerts on a plant being used fast enough to run out soon, from the last forecast
+    # A plant already low on stock has its stock alert instead
+    def check_forecast_alert(self, plant):
+        alert = None
+        if self.forecast and not self.alerts.get(plant.plant_id, STOCK):
+            alert = forecast_alert(plant, self.forecast.days_until_stockout(plant), forecast_alert_days)
+        if alert:
+            self.alerts.add(plant.plant_id, FORECAST, *alert)
+        else:
+            self.remove_alert(plant.plant_id, FORECAST)
+
+    # Method that works out how fast every plant is selling from the stock log, brings the forecast
+    # alerts up to date and does it again after FORECAST_REFRESH_MS
+    @timed
+    def update_forecast(self):
+        try:
+            self.forecast = forecast_stockouts(self.inventory, self.stock_log, forecast_window_days)
+        except OSError:
+            # The last forecast is kept until the log can be read again at the next refresh
+            pass
+        # Plants running out soon, and those alerted on last time that may no longer be
+        plant_ids = {plant_id for plant_id, alert_type in self.alerts.alerts if alert_type == FORECAST}
+        if self.forecast:
+            plant_ids.update(plant_id for plant_id, days in self.forecast.days_left.items() if days <= forecast_alert_days)
+        for plant_id in plant_ids:
+            plant = self.inventory.plants.get(plant_id)
+            if plant is not None:
+                self.check_forecast_alert(plant)
+        self.after(FORECAST_REFRESH_MS, self.update_forecast)
+
+    # Method that brings all of a plant's alerts up to date after it was added or changed
+    @timed
+    def check_plant_alerts(self, plant, publish=True):
+        self.check_low_stock_alert(plant, publish)
+
+        # Alert when the plant is not linked to a supplier
+        if plant.supplier == NO_SUPPLIER:
+            self.alerts.add(plant.plant_id, NO_SUPPLIER_ALERT, WARNING, f"Alert: Plant '{plant.name}' has no supplier assigned.")
+        else:
+            self.remove_alert(plant.plant_id, NO_SUPPLIER_ALERT)
+
+        # Keep the plant's greenhouse alert, if it has one, showing its current name
+        if self.alerts.get(plant.plant_id, GREENHOUSE):
+            self.alerts.add(plant.plant_id, GREENHOUSE, INFO, f"GREENHOUSE ALERT: Plant '{plant.name}' now requires a greenhouse. Consider moving it in.")
+
+    # Method that removes a plant's alerts when conditions are resolved
+    # Only the given type of alert is removed, or every alert for the plant when no type is given
+    @timed
+    def remove_alert(self, plant_id, alert_type=None):
+        self.alerts.clear(plant_id, alert_type)
+
+    # Method that redraws the alerts list once the current changes are done
+    def schedule_alert_render(self):
+        if not self.alert_render_pending:
+            self.alert_render_pending = True
+            self.after_idle(self.render_alerts)
+
+    # Method that draws the alerts list from the alert registry, showing only the selected severities
+    @timed
+    def render_alerts(self):
+        self.alert_render_pending = False
+        self.alerts_listbox.delete(0, tk.END)
+        alerts = self.alerts.filtered(self.alert_severity.get().lower())
+        if alerts:
+            self.alerts_listbox.insert(tk.END, *[alert.message for alert in alerts])
+
+    # Method that returns whether the inventory table is showing search results
+    def searching(self):
+        return bool(self.search_text.get().strip())
+
+    # Method that runs the search shortly after the user stops typing or the plants change
+    def schedule_search(self):
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(SEARCH_DELAY_MS, self.apply_search)
+
+    # Method that shows the plants matching the search box in the inventory table, or every plant when it is empty
+    @timed
+    def apply_search(self):
+        self.search_job = None
+        text = self.search_text.get()
+        if text.strip():
+            matches = search_plants(self.inventory, self.search_index, text)
+            self.search_label.config(text=f"{len(matches)} of {len(self.inventory.plants)} plants")
+        else:
+            matches = list(self.inventory.plants)
+            self.search_label.config(text="")
+        self.inventory_tree.set_keys(matches)
+
+    # Method run on a separate thread that reads the changes made on the inventory service and queues them
+    # The changes are made to the inventory by add_service_changes on the window thread
+    def watch_service(self):
+        while True:
+            time.sleep(SERVICE_POLL_SECONDS)
+            try:
+                changes = self.service.changes()
+            except Exception as e:
+                self.service_queue.put(("error", e))
+                continue
+            self.service_queue.put(("changes", changes))
+
+    # Method run on the window thread that shows the changes made on other terminals
+    def add_service_changes(self):
+        while True:
+            try:
+                message = self.service_queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "error":
+                self.service_error = str(message[1])
+            else:
+                self.service_error = None
+                self.show_record_changes(self.inventory.apply_remote(message[1]))
+        self.after(LOAD_POLL_MS * 10, self.add_service_changes)
+
+    # Method that undoes the last change to the plants or suppliers
+    @timed
+    def undo(self):
+        if self.loading or self.history is None:
+            return
+        changes = self.history.undo()
+        if changes is None:
+            self.bell()
+            return
+        self.show_record_changes(changes)
+        self.update_edit_menu()
+
+    # Method that redoes the last change that was undone
+    @timed
+    def redo(self):
+        if self.loading or self.history is None:
+            return
+        changes = self.history.redo()
+        if changes is None:
+            self.bell()
+            return
+        self.show_record_changes(changes)
+        self.update_edit_menu()
+
+    # Method that enables Undo and Redo in the Edit menu when there is something to undo or redo
+    def update_edit_menu(self):
+        self.edit_menu.entryconfig("Undo", state="normal" if self.history.can_undo() else "disabled")
+        self.edit_menu.entryconfig("Redo", state="normal" if self.history.can_redo() else "disabled")
+
+    # Method that redraws the rows and alerts of records changed on another terminal or by undo and redo
+    # changes is a list of (kind, key, row, added) like RemoteInventory.apply_remote and History.undo return
+    def show_record_changes(self, changes):
+        for kind, key, row, added in changes:
+            if kind == "plant":
+                if row is None:
+                    self.inventory_tree.remove_key(key)
+                    self.remove_alert(key)
+                    continue
+                if added:
+                    self.inventory_tree.append_key(key)
+                else:
+                    self.inventory_tree.refresh_key(key)
+                self.check_plant_alerts(self.inventory.get_plant(key))
+            elif not self.supplier_tree_filled:
+                # The table is filled from the inventory when it is first shown
+                continue
+            elif row is None:
+                if self.supplier_tree.exists(key):
+                    self.supplier_tree.delete(key)
+            else:
+                supplier = self.inventory.get_supplier(key)
+                if self.supplier_tree.exists(key):
+                    self.supplier_tree.item(key, values=supplier.values())
+                else:
+                    self.supplier_tree.insert('', tk.END, iid=key, values=supplier.values())
+        if changes:
+            self.check_greenhouse_alert()
+
+    # Method that builds the reports tab, which shows the plants below their reorder point
+    # and the stock held for each supplier
+    def create_reports_tab(self):
+        self.reports_tab = ttk.Frame(self.tabs)
+        self.tabs.add(self.reports_tab, text="Reports")
+        self.report = None
+        self.report_rows = {}  # plant id -> row of the low stock table
+
+        self.report_summary = ttk.Label(self.reports_tab, text="")
+        self.report_summary.pack(side=tk.TOP, anchor="w", padx=5, pady=5)
+
+        # Stock held for each supplier
+        self.report_supplier_tree = ttk.Treeview(self.reports_tab, columns=("Supplier", "Plants", "Quantity", "Low Stock", "Reorder Point"),
+                                                 show="headings", height=6)
+        for col in self.report_supplier_tree["columns"]:
+            self.report_supplier_tree.heading(col, text=col)
+        self.report_supplier_tree.pack(side=tk.TOP, fill=tk.X)
+
+        # Plants below their reorder point, most urgent first; only the rows in view are created
+        low_stock_frame = ttk.Frame(self.reports_tab)
+        low_stock_frame.pack(fill=tk.BOTH, expand=True)
+        self.low_stock_tree = VirtualTreeview(low_stock_frame, self.report_rows.get,
+                                              columns=("ID", "Name", "Supplier", "Quantity", "Reorder Point", "Status"), show="headings")
+        self.low_stock_tree.grid(row=0, column=0, sticky="nsew")
+        low_stock_scrollbar = ttk.Scrollbar(low_stock_frame, orient="vertical", command=self.low_stock_tree.yview)
+        low_stock_scrollbar.grid(row=0, column=1, sticky="ns")
+        low_stock_frame.grid_rowconfigure(0, weight=1)
+        low_stock_frame.grid_columnconfigure(0, weight=1)
+        self.low_stock_tree.set_yscrollcommand(low_stock_scrollbar.set)
+
+        report_buttons = ttk.Frame(self.reports_tab)
+        report_buttons.pack()
+        ttk.Button(report_buttons, text="Refresh", command=self.render_report).pack(side='left', padx=5, pady=5)
+        ttk.Button(report_buttons, text="Default Reorder Point", command=self.set_default_reorder_point).pack(side='left', padx=5, pady=5)
+        ttk.Button(report_buttons, text="Supplier Reorder Point", command=self.set_supplier_reorder_point).pack(side='left', padx=5, pady=5)
+        ttk.Button(report_buttons, text="Plant Reorder Point", command=self.set_plant_reorder_point).pack(side='left', padx=5, pady=5)
+        ttk.Button(report_buttons, text="Export Report...", command=self.export_stock_report).pack(side='left', padx=5, pady=5)
+
+        # The report is worked out when the tab is opened rather than after every edit
+
+    # Method that works out the stock report and draws it on the reports tab
+    @timed
+    def render_report(self):
+        if self.loading:
+            self.report_summary.config(text="Loading...")
+            return
+        self.report = stock_report(self.inventory, self.reorder_points)
+        self.report_summary.config(text=f"{self.report.plant_count} plants, {self.report.total_quantity} in stock, "
+                                        f"{self.report.greenhouse_share:.1%} require a greenhouse, "
+                                        f"{len(self.report.low_stock)} below their reorder point")
+
+        self.report_supplier_tree.delete(*self.report_supplier_tree.get_children())
+        for name, totals in self.report.totals_by_supplier.items():
+            self.report_supplier_tree.insert('', tk.END, iid=name, values=(
+                name, totals["plants"], totals["quantity"], totals["low_stock"], totals["reorder_point"]))
+
+        self.report_rows.clear()
+        for row in self.report.low_stock:
+            self.report_rows[row["id"]] = (row["id"], row["name"], row["supplier"], row["quantity"], row["reorder_point"],
+                                           "Out of stock" if row["out_of_stock"] else "Low stock")
+        self.low_stock_tree.set_keys(self.report_rows)
+
+    # Method that saves the reorder points and brings the stock alerts of the given plants up to date
+    def reorder_points_changed(self, plants):
+        try:
+            self.reorder_points.save(reorder_file)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save reorder points: {e}")
+        for plant in plants:
+            self.check_low_stock_alert(plant)
+        self.render_report()
+
+    # Method that sets the reorder point used for plants without their own or their supplier's
+    def set_default_reorder_point(self):
+        if self.loading:
+            return
+        point = simpledialog.askinteger("Default Reorder Point", "Plants are low on stock below:",
+                                        initialvalue=self.reorder_points.default, minvalue=0)
+        if point is not None:
+            self.reorder_points.default = point
+            self.reorder_points_changed(self.inventory.plants.values())
+
+    # Method that sets the reorder point of the supplier selected in the report
+    def set_supplier_reorder_point(self):
+        if self.loading:
+            return
+        selected_item = self.report_supplier_tree.selection()
+        if not selected_item:
+            messagebox.showerror("Error", "No supplier selected.")
+            return
+        name = selected_item[0]
+        point = simpledialog.askinteger("Supplier Reorder Point", f"Plants from '{name}' are low on stock below\n(leave empty to use the default):",
+                                        initialvalue=self.reorder_points.suppliers.get(name), minvalue=0)
+        if point is None:
+            self.reorder_points.suppliers.pop(name, None)
+        else:
+            self.reorder_points.suppliers[name] = point
+        self.reorder_points_changed(self.inventory.plants_for_supplier(name))
+
+    # Method that sets the reorder point of one plant, the one selected in the report if any
+    def set_plant_reorder_point(self):
+        if self.loading:
+            return
+        plant_id = simpledialog.askinteger("Plant Reorder Point", "Enter plant ID:", initialvalue=self.low_stock_tree.selected())
+        if plant_id is None:
+            return
+        plant = self.inventory.get_plant(plant_id)
+        if plant is None:
+            messagebox.showerror("Error", f"Plant ID {plant_id} does not exist.")
+            return
+        point = simpledialog.askinteger("Plant Reorder Point", f"Plant '{plant.name}' is low on stock below\n(leave empty to use its supplier's):",
+                                        initialvalue=self.reorder_points.plants.get(plant_id), minvalue=0)
+        if point is None:
+            self.reorder_points.plants.pop(plant_id, None)
+        else:
+            self.reorder_points.plants[plant_id] = point
+        self.reorder_points_changed([plant])
+
+    # Method that writes the report to a .csv (low stock list) or .json (whole report) file chosen by the user
+    def export_stock_report(self):
+        if self.report is None:
+            self.render_report()
+            if self.report is None:
+                return
+        path = filedialog.asksaveasfilename(title="Export Report", defaultextension=".csv",
+                                            filetypes=[("CSV (low stock list)", "*.csv"), ("JSON (whole report)", "*.json")])
+        if not path:
+            return
+        try:
+            export_report(self.report, path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export report: {e}")
+
+    # Method that builds the diagnostics tab, which shows how often the main operations ran,
+    # how long they took and how many bytes were read and written
+    def create_diagnostics_tab(self):
+        self.diagnostics_tab = ttk.Frame(self.tabs)
+        self.tabs.add(self.diagnostics_tab, text="Diagnostics")
+
+        # One row per operation; the histogram column counts the calls in each latency range
+        histogram_heading = "  ".join(f"<={bound * 1000:g}ms" for bound in instrument.BUCKETS) + f"  >{instrument.BUCKETS[-1] * 1000:g}ms"
+        columns = ("Operation", "Calls", "Mean ms", "Max ms", "Total ms", histogram_heading)
+        self.calls_tree = ttk.Treeview(self.diagnostics_tab, columns=columns, show="headings", height=15)
+        for col in columns:
+            self.calls_tree.heading(col, text=col)
+            self.calls_tree.column(col, width=70 if col in columns[1:5] else 260, stretch=col == columns[-1])
+        self.calls_tree.pack(fill=tk.BOTH, expand=True)
+
+        self.bytes_tree = ttk.Treeview(self.diagnostics_tab, columns=("File", "Read", "Written"), show="headings", height=5)
+        for col in ("File", "Read", "Written"):
+            self.bytes_tree.heading(col, text=col)
+        self.bytes_tree.pack(fill=tk.X)
+
+        diagnostics_buttons = ttk.Frame(self.diagnostics_tab)
+        diagnostics_buttons.pack()
+        ttk.Button(diagnostics_buttons, text="Refresh", command=self.render_diagnostics).pack(side='left', padx=5, pady=5)
+        ttk.Button(diagnostics_buttons, text="Reset", command=lambda: (instrument.metrics.reset(), self.render_diagnostics())).pack(side='left', padx=5, pady=5)
+        ttk.Button(diagnostics_buttons, text="Save to File...", command=self.save_diagnostics).pack(side='left', padx=5, pady=5)
+        self.refresh_diagnostics()
+
+    # Method that redraws the diagnostics tab every second while it is the tab being shown
+    def refresh_diagnostics(self):
+        if self.tabs.select() == str(self.diagnostics_tab):
+            self.render_diagnostics()
+        self.after(DIAGNOSTICS_REFRESH_MS, self.refresh_diagnostics)
+
+    # Method that draws the current measurements on the diagnostics tab
+    def render_diagnostics(self):
+        snapshot = instrument.metrics.snapshot()
+        self.calls_tree.delete(*self.calls_tree.get_children())
+        for call in snapshot["calls"]:
+            self.calls_tree.insert('', tk.END, values=(
+                call["name"], call["calls"], f"{call['mean_seconds'] * 1000:.2f}", f"{call['max_seconds'] * 1000:.2f}",
+                f"{call['total_seconds'] * 1000:.1f}", "  ".join(str(count) for count in call["histogram"])))
+
+        file_bytes = {}
+        for entry in snapshot["bytes"]:
+            file_bytes.setdefault(entry["file"], {})[entry["direction"]] = entry["bytes"]
+        self.bytes_tree.delete(*self.bytes_tree.get_children())
+        for file_name, counts in file_bytes.items():
+            self.bytes_tree.insert('', tk.END, values=(file_name, counts.get("read", 0), counts.get("written", 0)))
+
+    # Method that writes the measurements to a json file chosen by the user
+    def save_diagnostics(self):
+        path = filedialog.asksaveasfilename(title="Save Diagnostics", defaultextension=".json", filetypes=[("JSON", "*.json")])
+        if path:
+            self.dump_diagnostics(path)
+
+    # Method that writes the measurements to a json file, reporting any error
+    def dump_diagnostics(self, path):
+        try:
+            atomic_write_json(path, instrument.metrics.snapshot(), indent=4)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save diagnostics: {e}")
+
+    # Method that saves every change: edits are saved in the background shortly after they are made,
+    # so this writes any still waiting and then compacts the store, which for the json backends folds
+    # the journal into the data files. Returns the error if saving failed, otherwise None.
+    @timed
+    def save_data(self):
+        error = self.saver.flush()
+        if error is None:
+            try:
+                self.store.compact()
+            except Exception as e:
+                error = e
+        return error
+
+    # Method that shows whether every change has been saved in the status bar
+    def update_save_status(self):
+        status = self.saver.status()
+        if self.service_error:
+            text = f"Inventory service: {self.service_error}"
+        elif status == "saving":
+            text = "Saving..."
+        elif status == "pending":
+            text = "Unsaved changes"
+        elif status == "error":
+            text = f"Save failed: {self.saver.error}"
+        elif self.saver.last_saved:
+            text = f"All changes saved at {self.saver.last_saved.strftime('%I:%M:%S %p')}"
+        else:
+            text = ""
+        # Events a sink failed to take are not sent again, so the failure stays shown
+        if self.events and self.events.error:
+            text = f"{text}   Change events failed: {self.events.error}".strip()
+        self.save_label.config(text=text)
+        self.after(SAVE_STATUS_MS, self.update_save_status)
+
+    # Method that handles window closing and ensures that data is saved before the program exits
+    def on_closing(self):
+        # Save data before exiting, waiting for any save already running
+        error = self.save_data()
+        if error is not None and not messagebox.askyesno("Error", f"Failed to save changes: {error}\n\nClose anyway and lose them?"):
+            return
+        self.saver.close()
+        if self.events:
+            self.events.close()
+        if instrument.ENABLED:
+            self.dump_diagnostics(instrumentation_file)
+        # Close the application
+        self.destroy() 
+
+
+    # Method that adds a plant to the json db
+    # method includes functionality to check that there are suppliers 
+    # avaliable to add to the plant, to create a new supplier if none are 
+    # avaliable and also to ensure that the correct data types are entered for the different plant values
+    def add_plant(self):
+        while True:
+            # Dialog box for plant id that expects an integer
+            plant_id = simpledialog.askinteger("Plant ID", "Enter plant ID:")
+            # if the user doesnt enter a value, display error
+            if plant_id is None:
+                messagebox.showerror("Error", "Plant ID is required.")
+            # if the plant id is not greater than 0, display error
+            elif plant_id <= 0:
+                messagebox.showerror("Error", "Plant ID must be a positive integer.")
+            # if the plant id is already used, ask again before the other fields are entered
+            elif self.inventory.get_plant(plant_id) is not None:
+                messagebox.showerror("Error", f"Plant ID {plant_id} is already used by '{self.inventory.get_plant(plant_id).name}'.")
+            else:
+                break
+        # Dialog box for plant name that expects a string
+        name = simpledialog.askstring("Plant Name", "Enter plant name:")
+        # Dialog box for plant description that expects a string
+        description = simpledialog.askstring("Description", "Enter description:")
+        while True:
+            # Dialog box for plant inventory quantity that expects a string
+            quantity = simpledialog.askinteger("Quantity", "Enter quantity:")
+            # If user doenst enter a value, display error
+            if quantity is None:
+                messagebox.showerror("Error", "Quantity is required.")
+            # If the user enters a negative quantity, display error
+            elif quantity < 0:
+                messagebox.showerror("Error", "Quantity cannot be negative. Please enter a non-negative integer.")
+            else:
+                break
+        # Initialize empty string for greenhouse required dialog
+        greenhouse_required = ""
+        while greenhouse_required not in ("yes", "no"):
+            # Dialog box for plant green house needs that expects a string of 'yes' or 'no'
+            greenhouse_required = simpledialog.askstring("Greenhouse Required", "Is greenhouse required? (yes/no):")
+            # If the user enters something else other than 'yes' or 'no', display error
+            if greenhouse_required not in ("yes", "no"):
+                messagebox.showerror("Error", "Please enter 'yes' or 'no'.")
+
+        # Get the list of suppliers
+        suppliers = self.inventory.supplier_names()
+        
+        # If there are no suppliers to get, prompt user to create a new supplier
+        if not suppliers:
+            # Display message box with a yes or no response option
+            response = messagebox.askyesno("No Suppliers", "No suppliers available. Would you like to create a new supplier now?")
+            if response:
+                # Open the dialogbox to add a supplier 
+                self.add_supplier()
+                # Re-read the suppliers list after adding a new supplier
+                suppliers = self.inventory.supplier_names()
+                # If a supplier was added, allow the user to select from a drop down
+                if suppliers:
+                    supplier_selection_window = tk.Toplevel(self)
+                    supplier_selection_window.title("Select Supplier")
+                    supplier_selection_window.geometry("300x100")
+                    
+                    # Create the dropdown box for supplier choices
+                    supplier_selection = ttk.Combobox(supplier_selection_window, values=suppliers)
+                    supplier_selection.set(suppliers[0])
+                    supplier_selection.pack(pady=10)
+
+                    supplier = NO_SUPPLIER
+
+                    # Function that confirmss the supplier selection and closes window
+                    def confirm_selection():
+                        nonlocal supplier
+                        supplier = supplier_selection.get()
+                        supplier_selection_window.destroy()
+
+                    ttk.Button(supplier_selection_window, text="OK", command=confirm_selection).pack(pady=10)
+                    self.wait_window(supplier_selection_window)
+                    
+                else:
+                    # If no supplier was created, assign "No Supplier Assigned"; check_plant_alerts alerts the user
+                    supplier = NO_SUPPLIER
+            else:
+                # If the user chose not to add a supplier at all, check_plant_alerts alerts them that the plant is missing one
+                supplier = NO_SUPPLIER
+        else:
+            # ---------- Supplier Selectoin Window ----------
+            # If there are suppliers avaliable, allow the user to select one
+            supplier_selection_window = tk.Toplevel(self)
+            supplier_selection_window.title("Select Supplier")
+            supplier_selection_window.geometry("300x100")
+            
+            # Display dropdown menu with the avaliable suppliers
+            supplier_selection = ttk.Combobox(supplier_selection_window, values=suppliers)
+            supplier_selection.set(suppliers[0])
+            supplier_selection.pack(pady=10)
+
+            supplier = ""
+
+            # Function confirming supplier selection and closing window
+            def confirm_selection():
+                nonlocal supplier
+                supplier = supplier_selection.get()
+                supplier_selection_window.destroy()
+
+            ttk.Button(supplier_selection_window, text="OK", command=confirm_selection).pack(pady=10)
+            self.wait_window(supplier_selection_window)
+
+        # If one of the plant fields is left empty display a message box with an error and stop the execution
+        if None in (plant_id, name, description, quantity, greenhouse_required, supplier):
+            messagebox.showerror("Error", "All fields are required.")
+            return
+        try:
+            self.insert_plant(Plant(plant_id, name, description, quantity, greenhouse_required, supplier))
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+
+    # Method that adds a new plant to the inventory and shows it with its alerts
+    # It is timed rather than add_plant, whose dialogs wait on the user; raises ValueError if the plant is refused
+    @timed
+    def insert_plant(self, plant):
+        plant = self.inventory.add_plant(plant)
+        self.inventory_tree.append_key(plant.plant_id)
+        # Create low stock and missing supplier alerts for the new plant
+        self.check_plant_alerts(plant)
+        self.check_greenhouse_alert()
+
+    # Method that updates plant details
+    def update_plant(self):
+        # Get the selected plant from the inventory
+        plant_id = self.selected_plant_id()
+        if plant_id is None:
+            messagebox.showerror("Error", "No plant selected.")
+            return
+        
+        # Retrieve current values of the selected plant
+        current_values = list(self.inventory.get_plant(plant_id).values())
+        fields = ["ID", "Name", "Description", "Quantity", "Greenhouse Required", "Supplier"]
+        # Plant attribute changed by each field
+        attributes = ["plant_id", "name", "description", "quantity", "greenhouse_required", "supplier"]
+        
+        # Create a new window for selecting which field to update
+        field_selection_window = tk.Toplevel(self)
+        field_selection_window.title("Select Field to Update")
+        field_selection_window.geometry("300x200")
+        
+        # Dropdown to select which field to update
+        field_selection = ttk.Combobox(field_selection_window, values=fields)
+        field_selection.pack(pady=20)
+
+        def confirm_field_selection():
+            selected_field = field_selection.get()
+            new_value = None
+            
+            # Updating the ID field (must be a positive integer)
+            if selected_field == "ID":
+                while True:
+                    try:
+                        initial_val = int(current_values[0])
+                    except (ValueError, TypeError):
+                        initial_val = None
+                    new_value = simpledialog.askinteger("Plant ID", "Enter new plant ID:", initialvalue=initial_val)
+                    if new_value is None:
+                        messagebox.showerror("Error", "Plant ID is required.")
+                    elif new_value <= 0:
+                        messagebox.showerror("Error", "Plant ID must be a positive integer.")
+                    elif new_value != plant_id and self.inventory.get_plant(new_value) is not None:
+                        messagebox.showerror("Error", f"Plant ID {new_value} is already used by '{self.inventory.get_plant(new_value).name}'.")
+                    else:
+                        break
+            
+            # Updating Name, Description fields
+            elif selected_field == "Name":
+                new_value = simpledialog.askstring("Plant Name", "Enter new plant name:", initialvalue=current_values[1])
+            elif selected_field == "Description":
+                new_value = simpledialog.askstring("Description", "Enter new description:", initialvalue=current_values[2])
+            
+            # Updating Quantity (must be non-negative)
+            elif selected_field == "Quantity":
+                while True:
+                    new_value = simpledialog.askinteger("Quantity", "Enter new quantity:", initialvalue=current_values[3])
+                    if new_value is None:
+                        messagebox.showerror("Error", "Quantity is required.")
+                    elif new_value < 0:
+                        messagebox.showerror("Error", "Quantity cannot be negative. Please enter a non-negative integer.")
+                    else:
+                        break
+            
+            # Updating Greenhouse Required field (must be 'yes' or 'no')
+            elif selected_field == "Greenhouse Required":
+                new_value = ""
+                while new_value not in ("yes", "no"):
+                    new_value = simpledialog.askstring("Greenhouse Required", "Is greenhouse required? (yes/no):", initialvalue=current_values[4])
+                    if new_value not in ("yes", "no"):
+                        messagebox.showerror("Error", "Please enter 'yes' or 'no'.")
+
+                # If the greenhouse requirement was changed from "yes" to "no", remove greenhouse alert
+                if current_values[4].lower() == "yes" and new_value.lower() == "no":
+                    # Remove existing greenhouse alert
+                    self.remove_alert(plant_id, GREENHOUSE)
+
+                # If the greenhouse requirement was changed from "no" to "yes", check if we need to add an alert
+                elif current_values[4].lower() == "no" and new_value.lower() == "yes":
+                    if in_greenhouse_season(datetime.datetime.now().month, greenhouse_season):
+                        self.alerts.add(plant_id, GREENHOUSE, INFO, f"GREENHOUSE ALERT: Plant '{current_values[1]}' now requires a greenhouse. Consider moving it in.")
+                        
+            # Updating Supplier field (User must select from dropdown)
+            elif selected_field == "Supplier":
+                suppliers = self.inventory.supplier_names()
+                supplier_selection_window = tk.Toplevel(self)
+                supplier_selection_window.title("Select Supplier")
+                supplier_selection_window.geometry("300x100")
+                
+                supplier_selection = ttk.Combobox(supplier_selection_window, values=suppliers)
+                supplier_selection.set(current_values[5])
+                supplier_selection.pack(pady=10)
+
+                def confirm_supplier_selection():
+                    nonlocal new_value
+                    new_value = supplier_selection.get()
+                    supplier_selection_window.destroy()
+                    field_selection_window.destroy()
+                    try:
+                        self.change_plant(plant_id, "supplier", new_value)
+                    except ValueError as e:
+                        messagebox.showerror("Error", str(e))
+
+                ttk.Button(supplier_selection_window, text="OK", command=confirm_supplier_selection).pack(pady=10)
+                self.wait_window(supplier_selection_window)
+                return
+            
+            # Apply updates to the plant entry
+            if new_value is not None:
+                index = fields.index(selected_field)
+                try:
+                    self.change_plant(plant_id, attributes[index], new_value)
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e))
+                    return
+                current_values[index] = new_value
+
+            field_selection_window.destroy()
+
+        ttk.Button(field_selection_window, text="OK", command=confirm_field_selection).pack(pady=10)
+
+        ttk.Button(field_selection_window, text="OK", command=confirm_field_selection).pack(pady=10)
+
+    # Method that changes one field of a plant, given as its Plant attribute, and redraws its row and alerts
+    # It is timed rather than update_plant, whose dialogs wait on the user; raises ValueError if the change is refused
+    @timed
+    def change_plant(self, plant_id, attribute, value):
+        plant = self.inventory.update_plant(plant_id, **{attribute: value})
+        self.refresh_plant_row(plant_id, plant)
+
+        # Keep the plant's alerts and reorder point under its new id
+        if plant.plant_id != plant_id:
+            self.alerts.move(plant_id, plant.plant_id)
+            if self.reorder_points.rename_plant(plant_id, plant.plant_id):
+                self.reorder_points_changed([])
+
+        # Update alerts for the new quantity, name or supplier
+        self.check_plant_alerts(plant)
+        if attribute == "greenhouse_required":
+            self.check_greenhouse_alert()
+
+    # Method that changes the quantities of many plants at once, for example for a delivery or a day's sales
+    # The changes are checked together and either all of them are made or, if any plant would go
+    # below zero, none of them
+    def adjust_stock(self):
+        if self.loading:
+            return
+        adjust_window = tk.Toplevel(self)
+        adjust_window.title("Adjust Stock")
+        adjust_window.geometry("360x400")
+
+        kind_selection = ttk.Combobox(adjust_window, values=list(ADJUSTMENT_KINDS), state="readonly")
+        kind_selection.set("Receive shipment")
+        kind_selection.pack(pady=5)
+        ttk.Label(adjust_window, text="One plant per line: plant ID and quantity, e.g. 12 5").pack()
+
+        # Start with the selected plant filled in
+        changes_text = tk.Text(adjust_window, height=15, width=40)
+        changes_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        plant_id = self.selected_plant_id()
+        if plant_id is not None:
+            changes_text.insert("1.0", f"{plant_id} ")
+
+        def confirm_adjustment():
+            deltas, errors = bulk.parse_adjustments(changes_text.get("1.0", tk.END), ADJUSTMENT_KINDS[kind_selection.get()])
+            if errors:
+                messagebox.showerror("Error", "\n".join(f"Line {line_number}: {error}" for line_number, error in errors[:10]), parent=adjust_window)
+                return
+            if not deltas:
+                messagebox.showerror("Error", "Enter at least one plant ID and quantity.", parent=adjust_window)
+                return
+            try:
+                plants = self.apply_adjustment(deltas)
+            except ValueError as e:
+                messagebox.showerror("Error", f"No quantities were changed:\n{e}", parent=adjust_window)
+                return
+            adjust_window.destroy()
+            messagebox.showinfo("Adjust Stock", f"Changed the quantity of {len(plants)} plants.")
+
+        ttk.Button(adjust_window, text="Apply", command=confirm_adjustment).pack(pady=5)
+
+    # Method that adds (plant id, change) quantity changes and returns the plants changed
+    # Raises ValueError, changing nothing, if any plant would go below zero
+    @timed
+    def apply_adjustment(self, deltas):
+        plants = self.inventory.adjust_quantities(deltas)
+        # Redraw the table once and bring only the changed plants' stock alerts up to date
+        self.inventory_tree.render()
+        for plant in plants:
+            self.check_low_stock_alert(plant)
+        return plants
+
+    @timed
+    def delete_plant(self):
+        plant_id = self.selected_plant_id()
+        if plant_id is None:
+            messagebox.showerror("Error", "No plant selected.")
+            return
+        try:
+            self.inventory.delete_plant(plant_id)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.inventory_tree.remove_key(plant_id)
+        # A deleted plant has nothing left to alert about
+        self.remove_alert(plant_id)
+        self.check_greenhouse_alert()
+
+    def add_supplier(self):
+        name = simpledialog.askstring("Supplier Name", "Enter supplier name:")
+        phone_number = simpledialog.askstring("Supplier Phone Number", "Enter phone number:")
+        address = simpledialog.askstring("Supplier Address", "Enter address:")
+        try:
+            self.insert_supplier(Supplier(name, phone_number, address))
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+
+    # Method that adds a new supplier to the inventory and the supplier table
+    # It is timed rather than add_supplier, whose dialogs wait on the user; raises ValueError if the supplier is refused
+    @timed
+    def insert_supplier(self, supplier):
+        supplier = self.inventory.add_supplier(supplier)
+        self.supplier_tree.insert('', tk.END, iid=supplier.name, values=supplier.values())
+
+    @timed
+    def check_greenhouse_alert(self):
+        current_month = datetime.datetime.now().month
+        greenhouse_plants_exist = False  # Track if any greenhouse-required plants exist
+
+        # Check if any plants require a greenhouse
+        if in_greenhouse_season(current_month, greenhouse_season):
+            # The inventory is checked rather than the store, which may not have the latest edits yet
+            # It counts the greenhouse plants as they change, so this does not look at every plant
+            greenhouse_plants_exist = self.inventory.greenhouse_plants_exist()
+
+        # Add the alert if there are greenhouse plants and it is the right season
+        # The inventory-wide alert is stored without a plant id
+        if greenhouse_plants_exist:
+            self.alerts.add(None, GREENHOUSE, INFO, GREENHOUSE_ALERT_TEXT)
+
+        # Remove the alert if it exists and there are no greenhouse plants
+        else:
+            self.remove_alert(None, GREENHOUSE)
+
+    # Method that checks the greenhouse alert again when the greenhouse season next starts or ends,
+    # so a window left open over the 1st of the month is brought up to date
+    def schedule_season_check(self):
+        now = datetime.datetime.now()
+        delay = (next_season_change(now, greenhouse_season) - now).total_seconds() * 1000
+        # Checked a second late so the new month has certainly begun
+        self.after(min(int(delay) + 1000, SEASON_CHECK_MAX_MS), self.season_check)
+
+    # Method run by schedule_season_check
+    def season_check(self):
+        self.check_greenhouse_alert()
+        self.schedule_season_check()
+
+    # Method that removes a supplier from the supplier table and updates the data file
+    @timed
+    def remove_supplier(self):
+        selected_item = self.supplier_tree.selection()
+        if selected_item:
+            try:
+                orphaned_plants = self.inventory.remove_supplier(selected_item[0])
+            except KeyError:
+                messagebox.showerror("Error", f"Supplier '{selected_item[0]}' was not found.")
+                return
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            self.supplier_tree.delete(selected_item[0])  # Remove the selected supplier
+
+            # The supplier's plants now have no supplier; redraw them and alert the user
+            for plant in orphaned_plants:
+                self.inventory_tree.refresh_key(plant.plant_id)
+                self.check_plant_alerts(plant)
+
+    # Method that allows users to update suppluer information
+    def update_supplier(self):
+        selected_item = self.supplier_tree.selection()
+        if not selected_item:
+            messagebox.showerror("Error", "No supplier selected.")
+            return
+
+        # Retrieve the current details of the selected supplier
+        supplier = self.inventory.get_supplier(selected_item[0])
+        if supplier is None:
+            messagebox.showerror("Error", f"Supplier '{selected_item[0]}' was not found.")
+            return
+        current_values = list(supplier.values())
+        # current_values: [name, phone_number, address]
+
+        # Prompt user for updated supplier details
+        new_name = simpledialog.askstring("Update Supplier", "Enter new supplier name:", initialvalue=current_values[0])
+        if new_name is None or new_name.strip() == "":
+            messagebox.showerror("Error", "Supplier name is required.")
+            return
+
+        new_phone = simpledialog.askstring("Update Supplier", "Enter new phone number:", initialvalue=current_values[1])
+        if new_phone is None or new_phone.strip() == "":
+            messagebox.showerror("Error", "Phone number is required.")
+            return
+
+        new_address = simpledialog.askstring("Update Supplier", "Enter new address:", initialvalue=current_values[2])
+        if new_address is None or new_address.strip() == "":
+            messagebox.showerror("Error", "Address is required.")
+            return
+
+        # Store the old supplier name for updating associated plants
+        old_supplier_name = current_values[0]
+
+        # Update the supplier record; plants linked to the old supplier name are renamed too
+        try:
+            self.change_supplier(old_supplier_name, new_name, new_phone, new_address)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+
+    # Method that changes a supplier's details and name and redraws its row and renamed plants
+    # It is timed rather than update_supplier, whose dialogs wait on the user; raises ValueError if the change is refused
+    @timed
+    def change_supplier(self, old_name, new_name, phone_number, address):
+        renamed_plants = self.inventory.update_supplier(old_name, new_name, phone_number, address)
+
+        # Redraw the supplier row, recreating it if the name (its row id) changed
+        supplier = self.inventory.get_supplier(new_name)
+        index = self.supplier_tree.index(old_name)
+        self.supplier_tree.delete(old_name)
+        self.supplier_tree.insert('', index, iid=supplier.name, values=supplier.values())
+
+        # Keep the supplier's reorder point under its new name
+        if self.reorder_points.rename_supplier(old_name, new_name):
+            self.reorder_points_changed([])
+
+        # Redraw the plants whose supplier name changed if they are in view
+        for plant in renamed_plants:
+            self.inventory_tree.refresh_key(plant.plant_id)
+
+    # Method that imports plants from a .csv, .jsonl or .json file chosen by the user
+    def import_plants(self):
+        if self.loading:
+            return
+        path = filedialog.askopenfilename(title="Import Plants", filetypes=[("Plant files", "*.csv *.jsonl *.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            result = self.import_plants_from(path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to import plants: {e}")
+            return
+
+        # Report the rows that were skipped
+        message = f"Imported {len(result.plants)} plants."
+        if result.errors:
+            message += f"\n\nSkipped {len(result.errors)} rows:\n" + "\n".join(
+                f"Line {line_number}: {error}" for line_number, error in result.errors[:10])
+            if len(result.errors) > 10:
+                message += f"\n...and {len(result.errors) - 10} more"
+        messagebox.showinfo("Import Plants", message)
+
+    # Method that imports the plants in a file and shows them with their alerts, returning the bulk.ImportResult
+    # It is timed rather than import_plants, whose file dialog and report wait on the user
+    @timed
+    def import_plants_from(self, path):
+        result = bulk.import_plants(self.inventory, path)
+        # Show the new plants and work out their alerts once for the whole import
+        self.inventory_tree.extend_keys([plant.plant_id for plant in result.plants])
+        for plant in result.plants:
+            self.check_plant_alerts(plant)
+        self.check_greenhouse_alert()
+        return result
+
+    # Method that exports every plant to a .csv, .jsonl or .json file chosen by the user
+    def export_plants(self):
+        if self.loading:
+            return
+        path = filedialog.asksaveasfilename(title="Export Plants", defaultextension=".csv",
+                                            filetypes=[("CSV", "*.csv"), ("JSON lines", "*.jsonl"), ("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            count = self.export_plants_to(path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export plants: {e}")
+            return
+        messagebox.showinfo("Export Plants", f"Exported {count} plants.")
+
+    # Method that writes every plant to a file and returns how many were written
+    # It is timed rather than export_plants, whose file dialog and report wait on the user
+    @timed
+    def export_plants_to(self, path):
+        return bulk.export_plants(self.inventory, path)
+
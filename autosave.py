@@ -0,0 +1,123 @@
+import datetime
+import threading
+import time
+
+# Seconds without edits before the pending changes are written
+SAVE_DELAY = 1.0
+
+# This class saves inventory changes on a background thread
+# Changes are collected as they happen, several edits of the same record are merged
+# into its latest row, and once no edits have been made for SAVE_DELAY seconds the
+# collected rows are written to the store in one go. The rows are copies made when
+# the change happened, so the window can keep editing while the write runs.
+class SaveScheduler:
+    def __init__(self, store, delay=SAVE_DELAY):
+        self.store = store
+        self.delay = delay
+        self.lock = threading.Condition()
+        self.pending = {}  # (kind, key) -> latest row, or None when the record was removed
+        self.last_change = 0.0
+        self.saving = False
+        self.flushing = False
+        self.closed = False
+        self.last_saved = None  # time of the last finished write
+        self.error = None  # exception from the last write, if it failed
+        self.logs = []  # logs flushed with every write, see add_log
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    # Method that starts saving every change made to the inventory
+    def attach(self, inventory):
+        self.store.attach(inventory, listen=False)
+        inventory.listeners.append(self.record)
+
+    # Method that writes a log kept in memory, such as the StockLog, on the saving thread after
+    # each write of the store, so its files are written in batches and not while editing
+    def add_log(self, log):
+        self.logs.append(log)
+
+    # Method used as an inventory listener; marks the changed records as waiting to be saved
+    def record(self, changes):
+        with self.lock:
+            for kind, key, row in changes:
+                self.pending[(kind, key)] = row
+            self.last_change = time.monotonic()
+            self.lock.notify_all()
+
+    # Method that writes any waiting changes now and waits until they are saved
+    # Returns the exception if the write failed, otherwise None
+    def flush(self):
+        with self.lock:
+            self.flushing = True
+            self.error = None
+            self.lock.notify_all()
+            while self.saving or (self.pending and self.error is None):
+                self.lock.wait()
+            self.flushing = False
+            return self.error
+
+    # Method that saves any waiting changes and stops the background thread
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.closed = True
+            self.lock.notify_all()
+        self.thread.join()
+
+    # Method that returns "saving", "pending", "error" or "saved" for the status bar
+    def status(self):
+        with self.lock:
+            if self.saving:
+                return "saving"
+            if self.error is not None:
+                return "error"
+            if self.pending:
+                return "pending"
+            return "saved"
+
+    # Method run on the background thread that waits for a quiet moment and writes the waiting changes
+    def _run(self):
+        while True:
+            with self.lock:
+                while not self.pending and not self.closed:
+                    self.lock.wait()
+                if not self.pending:
+                    return
+                # Wait until no edits have been made for the delay, unless someone is waiting
+                # for the save; after a failed write always wait before trying again
+                while True:
+                    if self.closed and self.error is not None:
+                        return
+                    if (self.flushing or self.closed) and self.error is None:
+                        break
+                    remaining = self.last_change + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.lock.wait(remaining)
+                changes = self.pending
+                self.pending = {}
+                self.saving = True
+
+            error = None
+            try:
+                self.store.record([(kind, key, row) for (kind, key), row in changes.items()])
+            except Exception as e:
+                error = e
+            # A log keeps what it failed to write for the next try; the store's rows are written again with it
+            for log in self.logs:
+                try:
+                    log.flush()
+                except Exception as e:
+                    error = error or e
+
+            with self.lock:
+                self.saving = False
+                self.error = error
+                if error is None:
+                    self.last_saved = datetime.datetime.now()
+                else:
+                    # Keep the rows for the next try unless they were edited again meanwhile
+                    for record_key, row in changes.items():
+                        self.pending.setdefault(record_key, row)
+                    self.last_change = time.monotonic()
+                self.lock.notify_all()
@@ -0,0 +1,261 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from analytics import ReorderPoints, stock_report
+from alerts import AlertRegistry, INFO, STOCK, GREENHOUSE, stock_alert
+from model import Plant, Supplier, Inventory, NO_SUPPLIER
+from storage import atomic_write_json, open_store
+
+# Number of plants in each generated inventory
+SIZES = (1000, 100000, 1000000)
+# Plants per supplier in the generated inventories
+PLANTS_PER_SUPPLIER = 1000
+# Times each case is timed; the fastest run is reported
+REPEAT = 3
+# Seed for the generated data so every run measures the same inventory
+SEED = 31
+# Folder of the program, for the startup cases that start it in a new process
+PROGRAM_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+WORDS = ("rose", "fern", "orchid", "tulip", "lily", "ivy", "basil", "mint", "cactus", "palm",
+         "red", "white", "dwarf", "giant", "climbing", "hardy", "winter", "summer", "wild", "blue")
+
+# Method that writes synthetic plants.json and suppliers.json files with the given number of plants
+# The plants are written one at a time so generating a million of them does not need them all in memory
+def generate_data(folder, plant_count, seed=SEED):
+    rng = random.Random(seed)
+    supplier_names = [f"Supplier {number}" for number in range(max(1, plant_count // PLANTS_PER_SUPPLIER))]
+    plants_served = {name: [] for name in supplier_names}
+
+    with open(os.path.join(folder, "plants.json"), 'w') as f:
+        f.write("[")
+        for plant_id in range(1, plant_count + 1):
+            # A few plants have no supplier so the missing supplier alerts are exercised too
+            supplier = rng.choice(supplier_names) if rng.random() > 0.02 else NO_SUPPLIER
+            if supplier != NO_SUPPLIER:
+                plants_served[supplier].append(plant_id)
+            row = {
+                "id": plant_id,
+                "name": " ".join(rng.sample(WORDS, 2)).title(),
+                "description": " ".join(rng.choices(WORDS, k=6)),
+                "quantity": rng.randint(0, 100),
+                "greenhouse_required": "yes" if rng.random() < 0.2 else "no",
+                "supplier": supplier
+            }
+            f.write(("," if plant_id > 1 else "") + json.dumps(row))
+        f.write("]")
+
+    atomic_write_json(os.path.join(folder, "suppliers.json"), [
+        {"name": name, "phone_number": f"555-{number:04d}", "address": f"{number} Greenhouse Road",
+         "plants_served": plants_served[name]}
+        for number, name in enumerate(supplier_names)
+    ])
+
+# Method that opens a store over the generated files in folder
+def open_bench_store(backend, folder):
+    return open_store(backend, os.path.join(folder, "plants.json"), os.path.join(folder, "suppliers.json"),
+                      os.path.join(folder, "journal.jsonl"), os.path.join(folder, "inventory.db"))
+
+# Method that loads an inventory the way InventoryApp.load_data does, one row at a time from the store
+def load_inventory(store):
+    inventory = Inventory()
+    for row in store.iter_suppliers():
+        inventory.add_supplier(Supplier.from_dict(row))
+    for row in store.iter_plants():
+        inventory.add_plant(Plant.from_dict(row))
+    return inventory
+
+# ---------- Cases ----------
+# Each case is a function taking the benchmark state; the state holds the loaded
+# inventory and its store so the cases after loading do not load it again
+
+# Case for InventoryApp.load_data: read every supplier and plant into a new inventory
+# The json store reads the json files, as on the first start before anything was saved;
+# stores without a snapshot, such as SQLite, are read as they are
+def case_load(state):
+    store = state["store"]
+    use_snapshot = getattr(store, "use_snapshot", None)
+    if use_snapshot is not None:
+        store.use_snapshot = False
+    try:
+        load_inventory(store)
+    finally:
+        if use_snapshot is not None:
+            store.use_snapshot = use_snapshot
+
+# Case for InventoryApp.load_data after a save, which reads the binary snapshot written with the
+# json files instead of them
+def case_load_snapshot(state):
+    load_inventory(state["store"])
+
+# Case for InventoryApp.save_data: save an edit and rewrite the json files from the store
+def case_save(state):
+    plant = next(iter(state["inventory"].plants.values()))
+    state["inventory"].update_plant(plant.plant_id, quantity=plant.quantity + 1)
+    state["store"].record([("plant", plant.plant_id, plant.to_dict())])
+    state["store"].compact()
+
+# Case for InventoryApp.check_greenhouse_alert in the greenhouse season
+def case_greenhouse_alert(state):
+    alerts = state["alerts"]
+    if state["inventory"].greenhouse_plants_exist():
+        alerts.add(None, GREENHOUSE, INFO, "GREENHOUSE ALERT")
+    else:
+        alerts.clear(None, GREENHOUSE)
+
+# Case for InventoryApp.check_low_stock_alert over every plant, as done while loading
+def case_stock_alerts(state):
+    alerts = state["alerts"]
+    for plant in state["inventory"].plants.values():
+        alert = stock_alert(plant)
+        if alert:
+            alerts.add(plant.plant_id, STOCK, *alert)
+        else:
+            alerts.clear(plant.plant_id, STOCK)
+
+# Case for InventoryApp.remove_alert over every plant, as when all plants are restocked or deleted
+def case_remove_alerts(state):
+    alerts = state["alerts"]
+    for plant_id in list(alerts.types_by_plant):
+        alerts.clear(plant_id)
+    # Raise the alerts again so the next run has something to remove
+    case_stock_alerts(state)
+
+# Case for InventoryApp.change_supplier: rename the supplier with the most plants, which renames each of them
+def case_update_supplier(state):
+    inventory = state["inventory"]
+    old_name = max(inventory.suppliers, key=lambda name: len(inventory.plants_by_supplier.get(name, ())))
+    supplier = inventory.get_supplier(old_name)
+    new_name = old_name[:-len(" (renamed)")] if old_name.endswith(" (renamed)") else old_name + " (renamed)"
+    inventory.update_supplier(old_name, new_name, supplier.phone_number, supplier.address)
+
+# Case for the stock report: the low stock list and totals by supplier for every plant
+def case_stock_report(state):
+    stock_report(state["inventory"], state["reorder_points"])
+
+# Case for starting a command such as "python final.py import FILE", up to parsing its arguments
+# It runs in a new process so every import is timed, as on a server starting a batch job
+def case_command_startup(state):
+    subprocess.run([sys.executable, os.path.join(PROGRAM_FOLDER, "final.py"), "--help"],
+                   cwd=PROGRAM_FOLDER, stdout=subprocess.DEVNULL, check=True)
+
+# Case for importing the window's modules in a new process, the part of opening the window that
+# does not need a display
+def case_window_startup(state):
+    subprocess.run([sys.executable, "-c", "import app"], cwd=PROGRAM_FOLDER, check=True)
+
+CASES = {
+    "load": case_load,
+    "load_snapshot": case_load_snapshot,
+    "save": case_save,
+    "greenhouse_alert": case_greenhouse_alert,
+    "stock_alerts": case_stock_alerts,
+    "remove_alerts": case_remove_alerts,
+    "update_supplier": case_update_supplier,
+    "stock_report": case_stock_report,
+    "command_startup": case_command_startup,
+    "window_startup": case_window_startup,
+}
+
+# Method that times a case repeat times and then runs it once more under tracemalloc for its peak memory
+def measure(case, state, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case(state)
+        runs.append(time.perf_counter() - start)
+
+    # tracemalloc slows Python down, so memory is measured on a separate run from the timings
+    tracemalloc.start()
+    try:
+        case(state)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(runs), "runs": runs, "peak_memory_bytes": peak}
+
+# Method that generates an inventory of each size, runs the chosen cases and returns the results
+def run(sizes, cases, backend, repeat, folder=None):
+    results = []
+    for size in sizes:
+        data_folder = folder or tempfile.mkdtemp(prefix="inventory-bench-")
+        try:
+            # A journal, database or shards left from an earlier size would be read instead of the new files
+            for name in ("journal.jsonl", "inventory.db", "plants.snapshot"):
+                if os.path.exists(os.path.join(data_folder, name)):
+                    os.remove(os.path.join(data_folder, name))
+            shutil.rmtree(os.path.join(data_folder, "plants"), ignore_errors=True)
+            start = time.perf_counter()
+            generate_data(data_folder, size)
+            print(f"{size} plants: generated in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+            store = open_bench_store(backend, data_folder)
+            inventory = load_inventory(store)
+            # Saving writes the snapshot the load_snapshot case reads
+            store.compact()
+            # The window saves edits on a background thread, so the cases after loading
+            # time the work done on the window thread and only the save case writes
+            store.attach(inventory, listen=False)
+            alerts = AlertRegistry()
+            # Some suppliers get their own reorder point so both kinds of lookup are timed
+            reorder_points = ReorderPoints(suppliers={name: 10 for name in list(inventory.suppliers)[::2]})
+            state = {"store": store, "inventory": inventory, "alerts": alerts, "reorder_points": reorder_points}
+            case_stock_alerts(state)
+
+            for name in cases:
+                result = measure(CASES[name], state, repeat)
+                print(f"{size} plants: {name} {result['seconds']:.4f}s, peak {result['peak_memory_bytes'] / 1e6:.1f} MB", file=sys.stderr)
+                results.append({"case": name, "plants": size, **result})
+            if hasattr(store, "close"):
+                store.close()
+        finally:
+            if folder is None:
+                shutil.rmtree(data_folder, ignore_errors=True)
+    return results
+
+# Method that parses the command line, runs the benchmarks and writes the results as json
+def main(argv):
+    parser = argparse.ArgumentParser(description="Time the inventory's load, save, alert and supplier rename paths on generated data.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in SIZES),
+                        help="comma separated numbers of plants (default: %(default)s)")
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help="comma separated cases to run (default: %(default)s)")
+    parser.add_argument("--backend", default="json", choices=("json", "sharded", "sqlite"))
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timed runs of each case (default: %(default)s)")
+    parser.add_argument("--data-dir", help="folder to generate the data in and keep afterwards (default: a temporary folder)")
+    parser.add_argument("--output", help="file to write the json results to (default: standard output)")
+    args = parser.parse_args(argv)
+
+    cases = args.cases.split(",")
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": args.backend,
+        "repeat": args.repeat,
+        "results": run([int(size) for size in args.sizes.split(",")], cases, args.backend, args.repeat, args.data_dir),
+    }
+    if args.output:
+        atomic_write_json(args.output, report, indent=4)
+    else:
+        json.dump(report, sys.stdout, indent=4)
+        print()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,229 @@
+import csv
+import json
+import os
+from model import Plant, NO_SUPPLIER
+from storage import atomic_write_json_rows, iter_json_array
+
+# Columns of an import or export file, the same keys as plants.json
+FIELDS = ("id", "name", "description", "quantity", "greenhouse_required", "supplier")
+# Rows validated together while importing
+IMPORT_BATCH = 1000
+# Range of the row hashes kept by find_duplicates, which are packed into one number with a line number
+HASH_RANGE = 1 << 64
+
+# This class holds the outcome of an import
+class ImportResult:
+    def __init__(self):
+        self.plants = []  # plants that were added
+        self.errors = []  # (line number, message) for each row that was skipped
+
+# This class holds the outcome of a duplicate scan of a plants.json file
+class DedupeResult:
+    def __init__(self):
+        self.rows = 0  # rows read
+        self.duplicate_ids = []  # (line number, plant id, line number of the first row with the id)
+        self.duplicate_names = []  # (line number, name, supplier, line number of the first plant with both)
+        self.invalid = []  # (line number, message) for rows without a usable id, which are left as they are
+        self.dropped = []  # line numbers of rows left out of the repaired file as copies of an earlier row
+        self.renumbered = []  # (line number, old id, new id) for rows given a free id in the repaired file
+
+# Method that reads a plants.json file in one pass and reports plants that share an id, or a name
+# and supplier (plants without a supplier are not compared by name)
+# With output, a repaired copy is written there as well: rows that are exact copies of an earlier
+# row with the same id are left out, and other rows reusing an id get a new id after the largest
+# one. Rows are only remembered by their id and a 64-bit hash, so files of millions of rows can be
+# scanned; plants with the same name and supplier are reported but kept, as they may differ.
+def find_duplicates(path, output=None):
+    result = DedupeResult()
+    seen_ids = {}  # plant id -> line number * HASH_RANGE + hash of the first row with the id
+    seen_names = {}  # hash of (name, supplier) -> line number of the first plant with them
+    renumber = []  # (line number, row) for the rows that need a new id, written last
+    largest_id = 0
+
+    # Function that yields the rows to keep while noting the duplicates
+    def kept_rows():
+        nonlocal largest_id
+        with open(path, 'r') as f:
+            for line_number, row in enumerate(iter_json_array(f), 1):
+                result.rows = line_number
+                try:
+                    plant_id = int(row["id"])
+                except (TypeError, KeyError, ValueError):
+                    result.invalid.append((line_number, "Row has no plant ID."))
+                    yield row
+                    continue
+                largest_id = max(largest_id, plant_id)
+                row_hash = hash(json.dumps(row, sort_keys=True)) % HASH_RANGE
+                first = seen_ids.get(plant_id)
+                if first is not None:
+                    first_line, first_hash = divmod(first, HASH_RANGE)
+                    result.duplicate_ids.append((line_number, plant_id, first_line))
+                    if first_hash == row_hash:
+                        result.dropped.append(line_number)
+                    else:
+                        renumber.append((line_number, row))
+                    continue
+                seen_ids[plant_id] = line_number * HASH_RANGE + row_hash
+
+                supplier = row.get("supplier") or NO_SUPPLIER
+                if supplier != NO_SUPPLIER:
+                    name_hash = hash((row.get("name"), supplier))
+                    first_line = seen_names.setdefault(name_hash, line_number)
+                    if first_line != line_number:
+                        result.duplicate_names.append((line_number, row.get("name"), supplier, first_line))
+                yield row
+        for line_number, row in renumber:
+            largest_id += 1
+            result.renumbered.append((line_number, row["id"], largest_id))
+            yield dict(row, id=largest_id)
+
+    if output:
+        atomic_write_json_rows(output, kept_rows())
+    else:
+        for _ in kept_rows():
+            pass
+    return result
+
+# Method that yields (line number, row) for each record of a .csv, .jsonl or .json file
+# The file is read one record at a time; a .jsonl line that is not valid json gives a row of None
+def iter_rows(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, 'r', newline='') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+    elif extension in (".jsonl", ".ndjson"):
+        with open(path, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError:
+                    yield line_number, None
+    elif extension == ".json":
+        with open(path, 'r') as f:
+            for position, row in enumerate(iter_json_array(f), 1):
+                yield position, row
+    else:
+        raise ValueError(f"Unsupported file type '{extension}'. Use .csv, .jsonl or .json.")
+
+# Method that checks one imported row with the same rules as adding a plant in the window
+# Returns (plant, None) for a good row or (None, error message) for a bad one
+def validate_row(row, supplier_names, taken_ids):
+    if not isinstance(row, dict):
+        return None, "Row could not be read."
+    if any(row.get(field) is None for field in ("id", "name", "description", "quantity", "greenhouse_required")):
+        return None, "All fields are required."
+    for field in ("name", "description", "supplier"):
+        if row.get(field) is not None and not isinstance(row[field], str):
+            return None, f"{field.capitalize()} must be text."
+
+    try:
+        plant_id = int(str(row["id"]).strip())
+    except ValueError:
+        plant_id = 0
+    if plant_id <= 0:
+        return None, "Plant ID must be a positive integer."
+    if plant_id in taken_ids:
+        return None, f"Plant ID {plant_id} already exists."
+
+    try:
+        quantity = int(str(row["quantity"]).strip())
+    except ValueError:
+        return None, "Quantity must be a whole number."
+    if quantity < 0:
+        return None, "Quantity cannot be negative."
+
+    greenhouse_required = str(row["greenhouse_required"]).strip().lower()
+    if greenhouse_required not in ("yes", "no"):
+        return None, "Greenhouse required must be 'yes' or 'no'."
+
+    supplier = (row.get("supplier") or "").strip() or NO_SUPPLIER
+    if supplier != NO_SUPPLIER and supplier not in supplier_names:
+        return None, f"Unknown supplier '{supplier}'."
+
+    return Plant(plant_id, row["name"], row["description"], quantity, greenhouse_required, supplier), None
+
+# Method that validates a batch of (line number, row) pairs in one pass
+# Ids of the good rows are added to taken_ids so later rows cannot reuse them. When the inventory
+# keeps names unique per supplier, the (name, supplier) of the good rows are added to taken_names
+# and rows repeating one of them, or the name of a plant of the same supplier in the inventory,
+# are reported too, so add_plants is never given a plant it would refuse.
+def validate_batch(batch, supplier_names, taken_ids, result, inventory, taken_names):
+    plants = []
+    for line_number, row in batch:
+        plant, error = validate_row(row, supplier_names, taken_ids)
+        if not error and inventory.unique_names and plant.supplier != NO_SUPPLIER:
+            try:
+                inventory.check_unique_name(plant.name, plant.supplier)
+                if (plant.name, plant.supplier) in taken_names:
+                    raise ValueError(f"Plant '{plant.name}' of supplier '{plant.supplier}' is imported more than once.")
+            except ValueError as e:
+                error = str(e)
+            else:
+                taken_names.add((plant.name, plant.supplier))
+        if error:
+            result.errors.append((line_number, error))
+        else:
+            taken_ids.add(plant.plant_id)
+            plants.append(plant)
+    return plants
+
+# Method that imports plants from a .csv, .jsonl or .json file into the inventory
+# Bad rows are reported in the result instead of stopping the import, and the good
+# rows are added as one operation so the store saves them in a single write
+def import_plants(inventory, path, batch_size=IMPORT_BATCH):
+    result = ImportResult()
+    supplier_names = set(inventory.suppliers)
+    taken_ids = set(inventory.plants)
+    taken_names = set()
+    batch = []
+    for line_number, row in iter_rows(path):
+        batch.append((line_number, row))
+        if len(batch) >= batch_size:
+            result.plants.extend(validate_batch(batch, supplier_names, taken_ids, result, inventory, taken_names))
+            batch = []
+    result.plants.extend(validate_batch(batch, supplier_names, taken_ids, result, inventory, taken_names))
+    inventory.add_plants(result.plants)
+    return result
+
+# Method that reads quantity changes typed as one "plant_id change" pair per line, such as "12 +5" or "13, -2"
+# sign is None to use the changes as typed, or 1 or -1 to give every change that sign, e.g. -1 for a sell-through
+# Returns the (plant_id, change) pairs and (line number, message) for each line that could not be read
+def parse_adjustments(text, sign=None):
+    deltas = []
+    errors = []
+    for line_number, line in enumerate(text.splitlines(), 1):
+        fields = line.replace(",", " ").replace("\t", " ").split()
+        if not fields:
+            continue
+        try:
+            if len(fields) != 2:
+                raise ValueError
+            plant_id, delta = int(fields[0]), int(fields[1])
+        except ValueError:
+            errors.append((line_number, f"Expected a plant ID and a quantity change, found '{line.strip()}'."))
+            continue
+        deltas.append((plant_id, delta if sign is None else sign * abs(delta)))
+    return deltas, errors
+
+# Method that writes every plant to a .csv, .jsonl or .json file and returns how many were written
+def export_plants(inventory, path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            for plant in inventory.plants.values():
+                writer.writerow(plant.to_dict())
+    elif extension in (".jsonl", ".ndjson"):
+        with open(path, 'w') as f:
+            for plant in inventory.plants.values():
+                f.write(json.dumps(plant.to_dict()) + "\n")
+    elif extension == ".json":
+        atomic_write_json_rows(path, (plant.to_dict() for plant in inventory.plants.values()))
+    else:
+        raise ValueError(f"Unsupported file type '{extension}'. Use .csv, .jsonl or .json.")
+    return len(inventory.plants)
@@ -0,0 +1,163 @@
+import argparse
+import json
+import sys
+import analytics
+import bulk
+from config import data_file, supplier_file, journal_file, database_file, storage_backend, reorder_file
+from config import service_url, service_host, service_port, service_workers, unique_plant_names, event_file
+from config import stock_history_folder, forecast_window_days, forecast_alert_days
+from alerts import stock_alert
+from events import open_event_bus, read_events
+from stocklog import StockLog
+from model import Inventory
+from storage import open_store
+
+# Errors printed after an import before the rest are summarised
+MAX_ERRORS_SHOWN = 20
+
+# Method that opens the configured store and loads the inventory from it
+# When INVENTORY_SERVICE is set the inventory is read from the service and changes are sent to it
+def open_inventory():
+    if service_url:
+        # Imported here as the http client is only needed when working through the service
+        from remote import ServiceClient, RemoteInventory, RemoteStore
+        client = ServiceClient(service_url)
+        store = RemoteStore(client)
+        inventory = RemoteInventory(client)
+    else:
+        store = open_store(storage_backend, data_file, supplier_file, journal_file, database_file)
+        inventory = Inventory()
+    # The rows are added as they are read rather than all read first
+    # Rows that cannot be loaded are reported and left in the data files for "dedupe" to repair
+    errors = inventory.load(store.iter_plants(), store.iter_suppliers())
+    for error in errors[:MAX_ERRORS_SHOWN]:
+        print(error, file=sys.stderr)
+    if len(errors) > MAX_ERRORS_SHOWN:
+        print(f"...and {len(errors) - MAX_ERRORS_SHOWN} more", file=sys.stderr)
+    inventory.unique_names = unique_plant_names
+    store.attach(inventory)
+    return inventory, store
+
+# Method that runs "import FILE": adds the plants in FILE and reports the rows that were skipped
+def run_import(args):
+    inventory, store = open_inventory()
+    # The imported plants are added to the event file; through the service, the service sends them.
+    # The socket is left to the window or service that may be running.
+    events = None if service_url else open_event_bus(event_file, None, 0)
+    if events:
+        events.attach(inventory)
+    result = bulk.import_plants(inventory, args.file)
+    store.compact()
+    if events:
+        events.close()
+        if events.error:
+            print(f"Failed to write change events to {event_file}: {events.error}", file=sys.stderr)
+
+    for line_number, error in result.errors[:MAX_ERRORS_SHOWN]:
+        print(f"{args.file}:{line_number}: {error}", file=sys.stderr)
+    if len(result.errors) > MAX_ERRORS_SHOWN:
+        print(f"...and {len(result.errors) - MAX_ERRORS_SHOWN} more errors", file=sys.stderr)
+
+    # Alerts are worked out once for the whole import
+    reorder_points = analytics.ReorderPoints.from_file(reorder_file)
+    low_stock = sum(1 for plant in result.plants if stock_alert(plant, reorder_points.for_plant(plant)))
+    print(f"Imported {len(result.plants)} plants, skipped {len(result.errors)} rows, {low_stock} imported plants are low on stock.")
+    return 1 if result.errors else 0
+
+# Method that runs "export FILE": writes every plant to FILE
+def run_export(args):
+    inventory, store = open_inventory()
+    count = bulk.export_plants(inventory, args.file)
+    print(f"Exported {count} plants to {args.file}")
+    return 0
+
+# Method that runs "report [FILE]": works out the stock report and prints a summary,
+# writing the low stock list (.csv) or the whole report (.json) to FILE if given
+def run_report(args):
+    inventory, store = open_inventory()
+    report = analytics.stock_report(inventory, analytics.ReorderPoints.from_file(reorder_file))
+    if args.file:
+        analytics.export_report(report, args.file)
+    out_of_stock = sum(1 for row in report.low_stock if row["out_of_stock"])
+    print(f"{report.plant_count} plants, {report.total_quantity} in stock, "
+          f"{report.greenhouse_share:.1%} require a greenhouse.")
+    print(f"{len(report.low_stock)} plants are below their reorder point, {out_of_stock} of them out of stock.")
+    forecast = analytics.forecast_stockouts(inventory, StockLog(stock_history_folder), forecast_window_days)
+    running_out = sum(1 for days in forecast.days_left.values() if 0 < days <= forecast_alert_days)
+    print(f"{running_out} plants are forecast to run out within {forecast_alert_days} days, "
+          f"from {len(forecast.rates)} plants sold over the last {forecast.days:.0f} days.")
+    return 0
+
+# Method that runs "dedupe [FILE]": reports plants sharing an id, or a name and supplier, and
+# with --output writes a repaired copy of the file
+def run_dedupe(args):
+    path = args.file or data_file
+    result = bulk.find_duplicates(path, args.output)
+    problems = ([(line, f"plant ID {plant_id} is also used on line {first}") for line, plant_id, first in result.duplicate_ids] +
+                [(line, f"plant '{name}' of '{supplier}' is also on line {first}") for line, name, supplier, first in result.duplicate_names] +
+                result.invalid)
+    problems.sort()
+    for line_number, problem in problems[:MAX_ERRORS_SHOWN]:
+        print(f"{path}:{line_number}: {problem}", file=sys.stderr)
+    if len(problems) > MAX_ERRORS_SHOWN:
+        print(f"...and {len(problems) - MAX_ERRORS_SHOWN} more", file=sys.stderr)
+
+    print(f"Read {result.rows} plants: {len(result.duplicate_ids)} reuse an ID, "
+          f"{len(result.duplicate_names)} share a name and supplier, {len(result.invalid)} have no ID.")
+    if args.output:
+        print(f"Wrote {args.output} without {len(result.dropped)} copied rows and with {len(result.renumbered)} plants given new IDs.")
+    return 1 if problems else 0
+
+# Method that runs "events": prints the change events after --since from the event file, one per line
+def run_events(args):
+    if not event_file:
+        print("No event file is set; set INVENTORY_EVENT_FILE to record change events.", file=sys.stderr)
+        return 1
+    for event in read_events(event_file, args.since):
+        print(json.dumps(event))
+    return 0
+
+# Method that runs "serve": shares the inventory with several windows until interrupted
+def run_serve(args):
+    # Imported here so the other commands do not load the http server
+    import service
+    service.serve(args.host, args.port, storage_backend, data_file, supplier_file, journal_file, database_file, args.workers)
+    return 0
+
+# Method that parses the command line and runs the chosen command, returning the exit code
+def main(argv):
+    parser = argparse.ArgumentParser(prog="final.py", description="Root 31 Inventory System without the window.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="import plants from a .csv, .jsonl or .json file")
+    import_parser.add_argument("file")
+    import_parser.set_defaults(run=run_import)
+
+    export_parser = commands.add_parser("export", help="export plants to a .csv, .jsonl or .json file")
+    export_parser.add_argument("file")
+    export_parser.set_defaults(run=run_export)
+
+    report_parser = commands.add_parser("report", help="report low stock and totals by supplier, optionally to a .csv or .json file")
+    report_parser.add_argument("file", nargs="?")
+    report_parser.set_defaults(run=run_report)
+
+    dedupe_parser = commands.add_parser("dedupe", help="find plants sharing an ID, or a name and supplier, in plants.json")
+    dedupe_parser.add_argument("file", nargs="?", help=f"plants file to check (default: {data_file})")
+    dedupe_parser.add_argument("--output", help="write a repaired copy here; may be the same file")
+    dedupe_parser.set_defaults(run=run_dedupe)
+
+    events_parser = commands.add_parser("events", help="print the change events recorded in the event file")
+    events_parser.add_argument("--since", type=int, default=0, help="only print the events after this sequence number")
+    events_parser.set_defaults(run=run_events)
+
+    serve_parser = commands.add_parser("serve", help="share the inventory with windows started with INVENTORY_SERVICE=http://HOST:PORT")
+    serve_parser.add_argument("--host", default=service_host)
+    serve_parser.add_argument("--port", type=int, default=service_port)
+    serve_parser.add_argument("--workers", type=int, default=service_workers, help="requests handled at the same time (default: %(default)s)")
+    serve_parser.set_defaults(run=run_serve)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
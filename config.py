@@ -0,0 +1,44 @@
+import os
+
+# ---------- Paths to the plant data and supplier data jsons. ----------
+data_file = 'data/plants.json'
+supplier_file = 'data/suppliers.json'
+# Journal of changes that have not been compacted into the json files yet
+journal_file = 'data/journal.jsonl'
+# SQLite database used by the "sqlite" storage backend
+database_file = 'data/inventory.db'
+# Reorder points used for low stock alerts and reports
+reorder_file = 'data/reorder_points.json'
+# Address of the inventory service to work through, for example http://127.0.0.1:8731
+# When it is not set the window reads and writes the data files itself
+service_url = os.environ.get('INVENTORY_SERVICE', '')
+# Address the service listens on when started with "python final.py serve"
+service_host = '127.0.0.1'
+service_port = 8731
+# Requests the service answers at the same time
+service_workers = 8
+# First and last month of the greenhouse season, when plants that require a greenhouse are alerted on
+# The season may run past the end of the year, like October to May below
+greenhouse_season = (10, 5)
+# Change events for the point of sale and reorder tools (see events.py): appended as json lines
+# to event_file, and sent to programs connected to event_host:event_port; '' and 0 turn them off
+event_file = os.environ.get('INVENTORY_EVENT_FILE', '')
+event_host = '127.0.0.1'
+event_port = int(os.environ.get('INVENTORY_EVENT_PORT', '0'))
+# Number of the last event sent on the socket, so the numbering carries on when the program is started again
+event_sequence_file = 'data/event_sequence.txt'
+# Log of every quantity change, which the stock forecasts are worked out from (see stocklog.py)
+stock_history_folder = 'data/stock_history'
+# Days of the log the rates plants sell at are worked out from, and the days ahead within which
+# a plant forecast to run out at that rate gets an alert
+forecast_window_days = 28
+forecast_alert_days = 7
+# Set to True so no two plants of the same supplier can have the same name
+unique_plant_names = False
+# Storage backend: "json" (the files above), "sharded" (the plants split by id range into
+# data/plants/plants-NNNNN.json, made from plants.json the first time) or "sqlite"
+storage_backend = os.environ.get('INVENTORY_BACKEND', 'json')
+# Set INVENTORY_INSTRUMENT=1 to time the main operations and count the bytes read and written;
+# the numbers are shown on a Diagnostics tab and written to instrumentation_file on exit
+instrumentation = os.environ.get('INVENTORY_INSTRUMENT', '') not in ('', '0')
+instrumentation_file = 'data/instrumentation.json'
@@ -0,0 +1,2 @@
+# The modules are at the top of the repository and imported by name, so the tests under
+# tests/ can import them the way the program does
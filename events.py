@@ -0,0 +1,338 @@
+import collections
+import datetime
+import json
+import os
+import socket
+import threading
+import time
+from alerts import CRITICAL, WARNING, stock_alert
+from instrument import count_bytes
+
+# Events sent to the sinks at a time
+EVENT_BATCH = 500
+# Seconds events are collected for before they are sent, so a burst of edits goes out as one batch
+EVENT_DELAY = 0.1
+# Events a socket sink keeps for clients that reconnect and ask for the ones they missed
+SOCKET_BACKLOG = 10000
+# Seconds a socket client may take to send its first line or accept a batch before it is dropped
+SOCKET_TIMEOUT = 5.0
+# Bytes read from the end of an event file to find the number of its last event
+TAIL_CHUNK = 1 << 16
+# State published in a stock event for each stock alert severity, None meaning no alert
+STOCK_STATES = {CRITICAL: "out", WARNING: "low", None: "ok"}
+
+# This class sends the changes made to an inventory to other programs, such as the point of sale
+# and reorder tools, so they do not have to poll and re-read the data files
+# Every change becomes an event numbered one after the other:
+#   {"sequence": 12, "time": "2026-10-17T09:30:00", "kind": "plant", "key": 4, "row": {...}}
+# kind is "plant" or "supplier" with the new row, or None when the record was removed, or "stock"
+# when a plant's stock state changes, with a row like {"state": "low", "quantity": 3, ...}. The
+# events are collected and handed to each sink in batches on a background thread, so editing never
+# waits for a consumer. A consumer that keeps the sequence of the last event it handled can ask
+# a sink for the events after it instead of reading everything again.
+class EventBus:
+    def __init__(self, sinks, delay=EVENT_DELAY, batch_size=EVENT_BATCH):
+        self.sinks = list(sinks)
+        self.delay = delay
+        self.batch_size = batch_size
+        self.lock = threading.Condition()
+        self.pending = []  # events not sent yet, oldest first
+        self.first_pending = 0.0  # time the oldest pending event was published
+        # Numbering carries on from the events sent before the program was last closed
+        self.sequence = max((sink.last_sequence() for sink in self.sinks), default=0)
+        for sink in self.sinks:
+            sink.start(self.sequence)
+        self.sending = False
+        self.flushing = False
+        self.closed = False
+        self.error = None  # exception from the last sink that failed, if any
+        # Function called as on_error(exception) on the bus's thread each time a sink fails
+        self.on_error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    # Method that starts publishing every change made to the inventory
+    def attach(self, inventory):
+        inventory.listeners.append(self.publish)
+
+    # Method used as an inventory listener; numbers the (kind, key, row) changes and queues them
+    def publish(self, changes):
+        with self.lock:
+            now = datetime.datetime.now().isoformat(timespec="seconds")
+            if not self.pending:
+                self.first_pending = time.monotonic()
+            for kind, key, row in changes:
+                self.sequence += 1
+                self.pending.append({"sequence": self.sequence, "time": now, "kind": kind, "key": key, "row": row})
+            self.lock.notify_all()
+
+    # Method that publishes a plant moving into or out of low stock
+    # severity is that of the plant's new stock alert, or None when it has enough stock
+    def stock_changed(self, plant, severity, reorder_point):
+        self.publish([("stock", plant.plant_id, {"state": STOCK_STATES[severity], "name": plant.name,
+                                                 "quantity": plant.quantity, "reorder_point": reorder_point})])
+
+    # Method that sends any waiting events now and waits until every sink has them
+    def flush(self):
+        with self.lock:
+            self.flushing = True
+            self.lock.notify_all()
+            while self.sending or self.pending:
+                self.lock.wait()
+            self.flushing = False
+
+    # Method that sends any waiting events, stops the background thread and closes the sinks
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.closed = True
+            self.lock.notify_all()
+        self.thread.join()
+        for sink in self.sinks:
+            sink.close()
+
+    # Method run on the background thread that waits for a batch to fill up or for the delay
+    # to pass, and sends it to every sink
+    def _run(self):
+        while True:
+            with self.lock:
+                while not self.pending and not self.closed:
+                    self.lock.wait()
+                if not self.pending:
+                    return
+                while len(self.pending) < self.batch_size and not (self.flushing or self.closed):
+                    remaining = self.first_pending + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.lock.wait(remaining)
+                batch = self.pending[:self.batch_size]
+                del self.pending[:self.batch_size]
+                self.first_pending = time.monotonic()
+                self.sending = True
+
+            # A sink that fails misses the batch but does not keep it from the others
+            for sink in self.sinks:
+                try:
+                    sink.send(batch)
+                except Exception as e:
+                    self.error = e
+                    if self.on_error:
+                        self.on_error(e)
+
+            with self.lock:
+                self.sending = False
+                self.lock.notify_all()
+
+# This class is the base of the places events are sent to; each sink gets every batch in order
+class EventSink:
+    # Method that returns the sequence of the last event this sink kept from an earlier run, or 0
+    def last_sequence(self):
+        return 0
+
+    # Method called once with the sequence of the last event published before this run
+    def start(self, sequence):
+        pass
+
+    # Method that sends a batch of events, oldest first
+    def send(self, events):
+        raise NotImplementedError
+
+    # Method that releases whatever the sink holds open
+    def close(self):
+        pass
+
+# This class hands each batch of events to a function in this program, on the bus's thread
+class CallbackSink(EventSink):
+    def __init__(self, callback):
+        self.callback = callback
+
+    def send(self, events):
+        self.callback(events)
+
+# This class appends the events to a json lines file, one event per line, which consumers can tail
+# The file keeps every event, so a consumer can always resume with read_events after the last
+# sequence it handled, and the numbering carries on from its last line when the program starts
+class JsonLinesSink(EventSink):
+    def __init__(self, path):
+        self.path = path
+        self.sequence = 0
+        if os.path.exists(path):
+            self._repair()
+
+    # Method that reads the sequence of the last event and cuts off a line torn by a crash mid-write
+    def _repair(self):
+        with open(self.path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - TAIL_CHUNK))
+            tail = f.read()
+            end = tail.rfind(b"\n") + 1
+            if end < len(tail):
+                f.truncate(size - len(tail) + end)
+            lines = tail[:end].splitlines()
+        if lines:
+            try:
+                self.sequence = json.loads(lines[-1])["sequence"]
+            except (ValueError, KeyError, TypeError):
+                raise ValueError(f"The last line of {self.path} is not an event.")
+
+    def last_sequence(self):
+        return self.sequence
+
+    def send(self, events):
+        lines = "".join(json.dumps(event) + "\n" for event in events)
+        with open(self.path, 'a') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        count_bytes(self.path, "written", len(lines))
+        self.sequence = events[-1]["sequence"]
+
+# This class sends the events to programs connected to a local socket, as json lines
+# A client first sends one line: the sequence of the last event it handled, to get the events
+# after it that are still in the backlog, or an empty line for new events only. If events it
+# asked for are no longer kept, or it names an event this sink never published, it is sent
+# {"gone": true, "sequence": N} instead, with N the last event published, and should read
+# everything again. A client too slow to keep up is dropped. The sequence of the last event sent
+# is kept in sequence_file, if given, so the numbering carries on when the program is started
+# again rather than reusing numbers a client may already have handled.
+class SocketSink(EventSink):
+    def __init__(self, host, port, backlog=SOCKET_BACKLOG, sequence_file=None):
+        self.server = socket.create_server((host, port))
+        self.port = self.server.getsockname()[1]
+        self.lock = threading.Lock()
+        self.clients = []
+        self.recent = collections.deque(maxlen=backlog)  # the latest events, oldest first
+        self.sequence = 0  # sequence of the last event published
+        self.sequence_file = sequence_file
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def last_sequence(self):
+        if not self.sequence_file:
+            return 0
+        try:
+            with open(self.sequence_file, 'r') as f:
+                return int(f.read())
+        except (OSError, ValueError):
+            return 0
+
+    def start(self, sequence):
+        self.sequence = sequence
+
+    # Method run on a background thread that takes new connections until the sink is closed
+    def _accept(self):
+        while True:
+            try:
+                connection, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._add_client, args=(connection,), daemon=True).start()
+
+    # Method that reads where a new client wants to start and sends it the events it missed
+    def _add_client(self, connection):
+        connection.settimeout(SOCKET_TIMEOUT)
+        try:
+            with connection.makefile('rb') as f:
+                line = f.readline().strip()
+            since = int(line) if line else None
+        except (OSError, ValueError):
+            connection.close()
+            return
+        with self.lock:
+            if since is None or since == self.sequence:
+                missed = []
+            elif since < self.sequence and self.recent and self.recent[0]["sequence"] <= since + 1:
+                missed = [event for event in self.recent if event["sequence"] > since]
+            else:
+                missed = [{"gone": True, "sequence": self.sequence}]
+            if self._write(connection, missed):
+                self.clients.append(connection)
+
+    # Method that writes events to a client, closing it and returning False if it cannot take them
+    def _write(self, connection, events):
+        try:
+            connection.sendall("".join(json.dumps(event) + "\n" for event in events).encode("utf-8"))
+        except OSError:
+            connection.close()
+            return False
+        return True
+
+    def send(self, events):
+        with self.lock:
+            self.recent.extend(events)
+            self.sequence = events[-1]["sequence"]
+            self.clients = [connection for connection in self.clients if self._write(connection, events)]
+        if self.sequence_file:
+            with open(self.sequence_file, 'w') as f:
+                f.write(str(self.sequence))
+
+    def close(self):
+        self.server.close()
+        with self.lock:
+            for connection in self.clients:
+                connection.close()
+            self.clients = []
+
+# Method that yields the events in a json lines event file after the one numbered since
+# Consumers keep the sequence of the last event they handled and pass it here next time
+def read_events(path, since=0):
+    if not os.path.exists(path):
+        return
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                break
+            if event["sequence"] > since:
+                yield event
+
+# This class publishes a stock event each time a plant moves into or out of low stock, for a
+# program that keeps no stock alerts of its own to compare with, such as the inventory service
+# Plants already low when it starts are not a change, so they are not published.
+class StockWatcher:
+    def __init__(self, bus, reorder_points):
+        self.bus = bus
+        self.reorder_points = reorder_points
+        self.inventory = None
+        self.severities = {}  # plant id -> severity of its stock alert, for the plants that have one
+
+    # Method that notes the stock state of every plant and starts watching the changes made to the inventory
+    def attach(self, inventory):
+        self.inventory = inventory
+        for plant in inventory.plants.values():
+            severity = self._severity(plant)
+            if severity:
+                self.severities[plant.plant_id] = severity
+        inventory.listeners.append(self.record)
+
+    # Method that returns the severity of the stock alert a plant needs, or None
+    def _severity(self, plant):
+        alert = stock_alert(plant, self.reorder_points.for_plant(plant))
+        return alert[0] if alert else None
+
+    # Method used as an inventory listener; publishes the plants whose stock state changed
+    def record(self, changes):
+        for kind, key, row in changes:
+            if kind != "plant":
+                continue
+            plant = self.inventory.get_plant(key) if row is not None else None
+            if plant is None:
+                self.severities.pop(key, None)
+                continue
+            severity = self._severity(plant)
+            if self.severities.get(key) != severity:
+                self.bus.stock_changed(plant, severity, self.reorder_points.for_plant(plant))
+            if severity:
+                self.severities[key] = severity
+            else:
+                self.severities.pop(key, None)
+
+# Method that opens an event bus with a sink for each configured place, or returns None when
+# there is none; event_port 0 means no socket, and sequence_file is where the socket keeps its numbering
+def open_event_bus(event_file, event_host, event_port, sequence_file=None):
+    sinks = []
+    if event_file:
+        sinks.append(JsonLinesSink(event_file))
+    if event_port:
+        sinks.append(SocketSink(event_host, event_port, sequence_file=sequence_file))
+    return EventBus(sinks) if sinks else None
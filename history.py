@@ -0,0 +1,53 @@
+import collections
+
+# Operations that can be undone; older ones are forgotten
+HISTORY_DEPTH = 100
+
+# This class lets the operations made on an inventory be undone and redone
+# Each step keeps only the rows an operation changed, as they were before it, rather than a copy
+# of the inventory, so a deep history of small edits takes little memory. Undoing a step
+# restores those rows as one operation, so a supplier rename is undone in one step that only
+# touches the supplier and its plants. Every change must go through the inventory, and steps
+# are undone newest first, so each step is restored onto the state it was taken from.
+class History:
+    def __init__(self, inventory, depth=HISTORY_DEPTH):
+        self.inventory = inventory
+        self.undo_steps = collections.deque(maxlen=depth)  # previous rows of each operation, newest last
+        self.redo_steps = []  # rows to restore to redo each undone operation, most recently undone last
+        inventory.history = self
+
+    # Method called by the inventory with the rows an operation changed, as they were before it
+    # A new operation cannot be redone past, so the redo steps are dropped
+    def record(self, previous):
+        self.undo_steps.append(previous)
+        self.redo_steps.clear()
+
+    # Method that returns whether there is an operation to undo
+    def can_undo(self):
+        return bool(self.undo_steps)
+
+    # Method that returns whether there is an undone operation to redo
+    def can_redo(self):
+        return bool(self.redo_steps)
+
+    # Method that undoes the newest operation
+    # Returns the changes made as (kind, key, row, added), where added is true for a record that
+    # came back, or None when there is nothing to undo
+    def undo(self):
+        if not self.undo_steps:
+            return None
+        return self._restore(self.undo_steps.pop(), self.redo_steps, undo=True)
+
+    # Method that redoes the operation undone last, returning the changes made like undo
+    def redo(self):
+        if not self.redo_steps:
+            return None
+        return self._restore(self.redo_steps.pop(), self.undo_steps, undo=False)
+
+    # Method that restores the rows of a step and adds the rows it replaced to steps
+    # undo is true when the step is being undone rather than redone
+    def _restore(self, rows, steps, undo):
+        previous = self.inventory.restore(rows, undo)
+        steps.append(previous)
+        return [(kind, key, row, old_row is None and row is not None)
+                for (kind, key, row), (_, _, old_row) in zip(rows, previous)]
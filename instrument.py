@@ -0,0 +1,85 @@
+import functools
+import os
+import threading
+import time
+from config import instrumentation
+
+# Whether operations are being measured; when false timed returns functions unchanged,
+# so the program runs exactly as it would without this module
+ENABLED = instrumentation
+
+# Upper bounds in seconds of the latency histogram buckets; slower calls go in one more bucket
+BUCKETS = (0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+# This class collects call counts, latencies and bytes read or written
+# Calls can be recorded from the loading and saving threads as well as the window thread.
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}  # operation name -> [calls, total seconds, slowest seconds, count in each bucket]
+        self.bytes = {}  # (file name, "read" or "written") -> bytes
+
+    # Method that records one call of an operation that took the given number of seconds
+    def record_call(self, name, seconds):
+        bucket = 0
+        while bucket < len(BUCKETS) and seconds > BUCKETS[bucket]:
+            bucket += 1
+        with self.lock:
+            stats = self.calls.get(name)
+            if stats is None:
+                stats = self.calls[name] = [0, 0.0, 0.0, [0] * (len(BUCKETS) + 1)]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            stats[3][bucket] += 1
+
+    # Method that records bytes read from or written to a file
+    def record_bytes(self, path, direction, count):
+        key = (os.path.basename(path), direction)
+        with self.lock:
+            self.bytes[key] = self.bytes.get(key, 0) + count
+
+    # Method that returns the measurements as json-ready data
+    def snapshot(self):
+        with self.lock:
+            return {
+                "buckets": list(BUCKETS),
+                "calls": [
+                    {"name": name, "calls": calls, "total_seconds": total, "max_seconds": slowest,
+                     "mean_seconds": total / calls, "histogram": list(histogram)}
+                    for name, (calls, total, slowest, histogram) in sorted(self.calls.items())
+                ],
+                "bytes": [
+                    {"file": file_name, "direction": direction, "bytes": count}
+                    for (file_name, direction), count in sorted(self.bytes.items())
+                ]
+            }
+
+    # Method that forgets every measurement
+    def reset(self):
+        with self.lock:
+            self.calls = {}
+            self.bytes = {}
+
+# Measurements of this run of the program
+metrics = Metrics()
+
+# Decorator that records the calls and latency of a function under its qualified name, such as "InventoryApp.save_data"
+def timed(function):
+    if not ENABLED:
+        return function
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            metrics.record_call(name, time.perf_counter() - start)
+    return wrapper
+
+# Method that records bytes read from or written to a file, when measuring
+def count_bytes(path, direction, count):
+    if ENABLED:
+        metrics.record_bytes(path, direction, count)
@@ -0,0 +1,478 @@
+import json
+import sys
+
+# Supplier name used for plants that are not linked to any supplier
+NO_SUPPLIER = "No Supplier Assigned"
+
+# Method that raises ValueError unless each of the given plant fields is text
+# The indexes intern names and suppliers, which only works on text
+def check_text_fields(**fields):
+    for field, value in fields.items():
+        if not isinstance(value, str):
+            raise ValueError(f"Plant {field} must be text, not {value!r}.")
+
+# Method that raises ValueError unless a supplier name is text that is not blank
+# The name is the supplier's key, so a missing one could not be looked up again
+def check_supplier_name(name):
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("Supplier name is required.")
+
+# ---------- Classes ----------
+# This class represents a plant in the inventory system
+# Plants use __slots__ instead of a dict per plant, and the greenhouse requirement is kept
+# as a bool, so a large inventory takes much less memory. Inventory interns the name and
+# supplier of every plant it holds, so plants with the same supplier share one string.
+class Plant:
+    __slots__ = ("plant_id", "name", "description", "quantity", "greenhouse", "supplier")
+
+    def __init__(self, plant_id, name, description, quantity, greenhouse_required, supplier):
+        self.plant_id = plant_id
+        self.name = name
+        self.description = description
+        self.quantity = quantity
+        self.greenhouse_required = greenhouse_required
+        self.supplier = supplier
+
+    # "yes" or "no", as shown in the table and written to plants.json
+    @property
+    def greenhouse_required(self):
+        return "yes" if self.greenhouse else "no"
+
+    @greenhouse_required.setter
+    def greenhouse_required(self, value):
+        self.greenhouse = str(value).strip().lower() == "yes"
+
+    # Method that builds a plant from a row of plants.json
+    # ids and quantities are stored as integers even if the file has them as text
+    @classmethod
+    def from_dict(cls, data):
+        return cls(int(data["id"]), data["name"], data["description"],
+                   int(data["quantity"]), data["greenhouse_required"], data["supplier"])
+
+    # Method that converts the plant into a row of plants.json
+    def to_dict(self):
+        return {
+            "id": self.plant_id,
+            "name": self.name,
+            "description": self.description,
+            "quantity": self.quantity,
+            "greenhouse_required": self.greenhouse_required,
+            "supplier": self.supplier
+        }
+
+    # Method that returns the plant as a row of the inventory table
+    def values(self):
+        return (self.plant_id, self.name, self.description,
+                self.quantity, self.greenhouse_required, self.supplier)
+
+# This class represents a supplier in the inventory system
+class Supplier:
+    __slots__ = ("name", "phone_number", "address", "plants_served")
+
+    def __init__(self, name, phone_number, address):
+        self.name = name
+        self.phone_number = phone_number
+        self.address = address
+        # Ids of the plants linked to this supplier; kept up to date by Inventory
+        self.plants_served = set()
+
+    # Method that builds a supplier from a row of suppliers.json
+    # plants_served is not read back because Inventory rebuilds it from the plants
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], data["phone_number"], data["address"])
+
+    # Method that converts the supplier into a row of suppliers.json
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "phone_number": self.phone_number,
+            "address": self.address,
+            "plants_served": sorted(self.plants_served)
+        }
+
+    # Method that returns the supplier as a row of the supplier table
+    def values(self):
+        return (self.name, self.phone_number, self.address)
+
+# This class holds the plants and suppliers in memory so the program does not
+# have to read them back out of the tables. It does not use tkinter, so it can
+# be used from scripts and batch jobs as well as from InventoryApp.
+class Inventory:
+    def __init__(self):
+        self.plants = {}  # plant_id -> Plant
+        self.plants_by_name = {}  # plant name -> plant id, or a set of plant ids when several plants share the name
+        self.suppliers = {}  # supplier name -> Supplier
+        self.plants_by_supplier = {}  # supplier name -> set of plant ids, shared with Supplier.plants_served
+        self.greenhouse_count = 0  # number of plants that require a greenhouse
+        # Functions called as listener(changes) after every operation. changes is a list of
+        # (kind, key, row) tuples, where kind is "plant" or "supplier", key is the plant id
+        # or supplier name and row is the new json row, or None when the record was removed.
+        # All the records changed by one operation are reported together.
+        self.listeners = []
+        # History told how to undo each operation, if any (see history.py)
+        self.history = None
+        # Log told of every quantity change, if any (see stocklog.py)
+        self.stock_log = None
+        # When true, no two plants of the same supplier may have the same name. It is checked on
+        # every add and update, but not while loading, so set it once the stored rows are in;
+        # plants without a supplier are not checked
+        self.unique_names = False
+
+    # Method that tells the listeners which records changed
+    # previous lists the same records as they were before the operation, in the same (kind, key, row)
+    # form with a row of None for records that did not exist; it is kept by the history to undo it,
+    # and the stock log compares it with changes to log quantity changes
+    # restoring is "undo" or "redo" for the operations of the history itself, which keeps those steps
+    def _notify(self, changes, previous=None, restoring=None):
+        if not changes:
+            return
+        if previous is not None and restoring is None and self.history is not None:
+            self.history.record(previous)
+        if previous is not None and self.stock_log is not None:
+            self.stock_log.record(changes, previous, undone=restoring == "undo")
+        for listener in self.listeners:
+            listener(changes)
+
+    # ---------- Plants ----------
+    # Method that adds a plant and indexes it by id and name
+    def add_plant(self, plant):
+        if plant.plant_id in self.plants:
+            raise ValueError(f"Plant ID {plant.plant_id} already exists.")
+        check_text_fields(name=plant.name, description=plant.description, supplier=plant.supplier)
+        self.check_unique_name(plant.name, plant.supplier)
+        self._index_plant(plant)
+        self._notify([("plant", plant.plant_id, plant.to_dict())], [("plant", plant.plant_id, None)])
+        return plant
+
+    # Method that adds many plants as one operation, reported to the listeners together
+    # Every plant is checked before any is added, so nothing is added if any of them is refused
+    def add_plants(self, plants):
+        ids = set()
+        names = set()
+        for plant in plants:
+            if plant.plant_id in self.plants or plant.plant_id in ids:
+                raise ValueError(f"Plant ID {plant.plant_id} already exists.")
+            ids.add(plant.plant_id)
+            check_text_fields(name=plant.name, description=plant.description, supplier=plant.supplier)
+            if self.unique_names and plant.supplier != NO_SUPPLIER:
+                self.check_unique_name(plant.name, plant.supplier)
+                if (plant.name, plant.supplier) in names:
+                    raise ValueError(f"Plant '{plant.name}' of supplier '{plant.supplier}' is added more than once.")
+                names.add((plant.name, plant.supplier))
+        indexed = []
+        try:
+            for plant in plants:
+                self._index_plant(plant)
+                indexed.append(plant)
+        except BaseException:
+            # Take out the plants added so far, which the listeners were never told about
+            for plant in indexed:
+                self._unindex_plant(plant)
+            raise
+        self._notify([("plant", plant.plant_id, plant.to_dict()) for plant in plants],
+                     [("plant", plant.plant_id, None) for plant in plants])
+        return plants
+
+    # Method that returns the plant with the given id, or None
+    def get_plant(self, plant_id):
+        return self.plants.get(plant_id)
+
+    # Method that returns every plant with the given name
+    def find_plants_by_name(self, name):
+        ids = self.plants_by_name.get(name)
+        if ids is None:
+            return []
+        if not isinstance(ids, set):
+            ids = (ids,)
+        return [self.plants[plant_id] for plant_id in ids]
+
+    # Method that raises ValueError if names must be unique and a plant other than plant_id
+    # already has this name and supplier
+    # The plants are found through the name index, so only the plants sharing the name are compared
+    def check_unique_name(self, name, supplier, plant_id=None):
+        if not self.unique_names or supplier == NO_SUPPLIER:
+            return
+        ids = self.plants_by_name.get(name)
+        if ids is None:
+            return
+        for other_id in ids if isinstance(ids, set) else (ids,):
+            if other_id != plant_id and self.plants[other_id].supplier == supplier:
+                raise ValueError(f"Supplier '{supplier}' already has a plant named '{name}' (ID {other_id}).")
+
+    # Method that returns every plant linked to the given supplier name
+    def plants_for_supplier(self, supplier_name):
+        return [self.plants[plant_id] for plant_id in self.plants_by_supplier.get(supplier_name, ())]
+
+    # Method that changes one or more fields of a plant and keeps the indexes up to date
+    # changes uses the Plant attribute names, for example quantity=3 or plant_id=12
+    def update_plant(self, plant_id, /, **changes):
+        previous = [("plant", plant_id, self.plants[plant_id].to_dict())]
+        plant = self._change_plant(plant_id, changes)
+        if plant.plant_id != plant_id:
+            previous.append(("plant", plant.plant_id, None))
+        self._notify(self._plant_changes(plant_id, plant), previous)
+        return plant
+
+    # Method that applies changes to a plant without telling the listeners
+    def _change_plant(self, plant_id, changes):
+        plant = self.plants[plant_id]
+        new_id = changes.get("plant_id", plant_id)
+        if new_id != plant_id and new_id in self.plants:
+            raise ValueError(f"Plant ID {new_id} already exists.")
+        check_text_fields(**{field: changes[field] for field in ("name", "description", "supplier") if field in changes})
+        if "name" in changes or "supplier" in changes:
+            self.check_unique_name(changes.get("name", plant.name), changes.get("supplier", plant.supplier), plant_id)
+
+        self._unindex_plant(plant)
+        for field, value in changes.items():
+            setattr(plant, field, value)
+        self._index_plant(plant)
+        return plant
+
+    # Method that returns the listener changes for a plant that was stored under old_id
+    def _plant_changes(self, old_id, plant):
+        changes = []
+        if plant.plant_id != old_id:
+            changes.append(("plant", old_id, None))
+        changes.append(("plant", plant.plant_id, plant.to_dict()))
+        return changes
+
+    # Method that adds signed quantity changes to many plants as one operation, for example a delivery
+    # deltas is a list of (plant_id, change) pairs; changes to the same plant are added together.
+    # Every change is checked first and nothing is changed if any plant does not exist or would
+    # go below zero, with a ValueError listing every problem. Returns the changed plants.
+    def adjust_quantities(self, deltas):
+        totals = {}
+        for plant_id, delta in deltas:
+            totals[plant_id] = totals.get(plant_id, 0) + delta
+        problems = []
+        quantities = {}
+        for plant_id, delta in totals.items():
+            plant = self.plants.get(plant_id)
+            if plant is None:
+                problems.append(f"Plant ID {plant_id} does not exist.")
+            elif plant.quantity + delta < 0:
+                problems.append(f"Plant '{plant.name}' (ID {plant_id}) has {plant.quantity} in stock, cannot take away {-delta}.")
+            else:
+                quantities[plant_id] = plant.quantity + delta
+        if problems:
+            raise ValueError("\n".join(problems))
+        return self._set_quantities(quantities)
+
+    # Method that sets the quantities of several plants and reports them to the listeners together
+    # Quantities are not indexed, so the plants do not have to be reindexed
+    def _set_quantities(self, quantities):
+        plants = []
+        previous = []
+        for plant_id, quantity in quantities.items():
+            plant = self.plants[plant_id]
+            previous.append(("plant", plant_id, plant.to_dict()))
+            plant.quantity = quantity
+            plants.append(plant)
+        self._notify([("plant", plant.plant_id, plant.to_dict()) for plant in plants], previous)
+        return plants
+
+    # Method that removes a plant from the inventory and returns it
+    def delete_plant(self, plant_id):
+        plant = self.plants[plant_id]
+        self._unindex_plant(plant)
+        self._notify([("plant", plant_id, None)], [("plant", plant_id, plant.to_dict())])
+        return plant
+
+    # Method that adds a plant to every index
+    def _index_plant(self, plant):
+        plant.name = sys.intern(plant.name)
+        plant.supplier = sys.intern(plant.supplier)
+        self.plants[plant.plant_id] = plant
+        # Most names belong to one plant, so a set is only made for names that are shared
+        ids = self.plants_by_name.get(plant.name)
+        if ids is None:
+            self.plants_by_name[plant.name] = plant.plant_id
+        elif isinstance(ids, set):
+            ids.add(plant.plant_id)
+        else:
+            self.plants_by_name[plant.name] = {ids, plant.plant_id}
+        self._supplier_plant_ids(plant.supplier).add(plant.plant_id)
+        self.greenhouse_count += plant.greenhouse
+
+    # Method that removes a plant from every index
+    def _unindex_plant(self, plant):
+        del self.plants[plant.plant_id]
+        ids = self.plants_by_name[plant.name]
+        if isinstance(ids, set):
+            ids.discard(plant.plant_id)
+            if len(ids) == 1:
+                self.plants_by_name[plant.name] = ids.pop()
+        else:
+            del self.plants_by_name[plant.name]
+        self.plants_by_supplier[plant.supplier].discard(plant.plant_id)
+        self.greenhouse_count -= plant.greenhouse
+
+    # Method that returns the set of plant ids for a supplier name, creating it if needed
+    def _supplier_plant_ids(self, supplier_name):
+        ids = self.plants_by_supplier.get(supplier_name)
+        if ids is None:
+            ids = self.plants_by_supplier[supplier_name] = set()
+        return ids
+
+    # ---------- Suppliers ----------
+    # Method that adds a supplier and indexes it by name
+    def add_supplier(self, supplier):
+        check_supplier_name(supplier.name)
+        if supplier.name in self.suppliers:
+            raise ValueError(f"Supplier '{supplier.name}' already exists.")
+        self.suppliers[supplier.name] = supplier
+        # Plants may already refer to this supplier name
+        supplier.plants_served = self._supplier_plant_ids(supplier.name)
+        self._notify([("supplier", supplier.name, supplier.to_dict())], [("supplier", supplier.name, None)])
+        return supplier
+
+    # Method that returns the supplier with the given name, or None
+    def get_supplier(self, name):
+        return self.suppliers.get(name)
+
+    # Method that returns the names of all suppliers in the order they were added
+    def supplier_names(self):
+        return list(self.suppliers)
+
+    # Method that changes a supplier's details and renames it on linked plants
+    # Returns the plants that were renamed
+    def update_supplier(self, old_name, name, phone_number, address):
+        supplier = self.suppliers[old_name]
+        check_supplier_name(name)
+        if name != old_name and name in self.suppliers:
+            raise ValueError(f"Supplier '{name}' already exists.")
+        # Plants may already name the new supplier, so the renamed plants are checked against them
+        if self.unique_names and name != old_name:
+            for plant_id in self.plants_by_supplier.get(old_name, ()):
+                self.check_unique_name(self.plants[plant_id].name, name, plant_id)
+        previous = [("supplier", old_name, supplier.to_dict())]
+
+        supplier.phone_number = phone_number
+        supplier.address = address
+        renamed = []
+        changes = []
+        if name != old_name:
+            # Rebuild the dict so the supplier keeps its position
+            self.suppliers = {(name if key == old_name else key): value for key, value in self.suppliers.items()}
+            supplier.name = name
+            # Only the plants linked to the old name are visited
+            ids = self.plants_by_supplier.pop(old_name, set())
+            for plant_id in ids:
+                plant = self.plants[plant_id]
+                plant.supplier = name
+                renamed.append(plant)
+            self.plants_by_supplier[name] = ids
+            supplier.plants_served = ids
+            changes.append(("supplier", old_name, None))
+            previous.append(("supplier", name, None))
+        changes.append(("supplier", name, supplier.to_dict()))
+        changes.extend(("plant", plant.plant_id, plant.to_dict()) for plant in renamed)
+        # Only the renamed plants are kept to undo a rename, with the supplier name they had
+        previous.extend((kind, key, dict(row, supplier=old_name)) for kind, key, row in changes if kind == "plant")
+        self._notify(changes, previous)
+        return renamed
+
+    # Method that removes a supplier and marks its plants as having no supplier
+    # Returns the plants that were left without a supplier
+    def remove_supplier(self, name):
+        previous = [("supplier", name, self.suppliers.pop(name).to_dict())]
+        changes = [("supplier", name, None)]
+        orphaned = []
+        for plant_id in list(self.plants_by_supplier.get(name, ())):
+            plant = self._change_plant(plant_id, {"supplier": NO_SUPPLIER})
+            changes.append(("plant", plant_id, plant.to_dict()))
+            previous.append(("plant", plant_id, dict(changes[-1][2], supplier=name)))
+            orphaned.append(plant)
+        self.plants_by_supplier.pop(name, None)
+        self._notify(changes, previous)
+        return orphaned
+
+    # ---------- Undo ----------
+    # Method that puts records back the way they were, as one operation; used to undo and redo
+    # rows is a list of (kind, key, row) where a row of None removes the record and any other row
+    # replaces or adds it. Returns the rows the records had before, in the same form, so the
+    # restore can itself be undone. undo is true when the rows take back an earlier operation.
+    def restore(self, rows, undo=False):
+        previous = [(kind, key, self._row(kind, key)) for kind, key, row in rows]
+        for kind, key, row in rows:
+            if kind == "plant":
+                plant = self.plants.get(key)
+                if plant is not None:
+                    self._unindex_plant(plant)
+                if row is not None:
+                    self._index_plant(Plant.from_dict(row))
+            elif row is None:
+                # Plants left with this supplier name keep it, as when the supplier was added later
+                self.suppliers.pop(key, None)
+            elif key in self.suppliers:
+                self.suppliers[key].phone_number = row["phone_number"]
+                self.suppliers[key].address = row["address"]
+            else:
+                supplier = self.suppliers[key] = Supplier.from_dict(row)
+                supplier.plants_served = self._supplier_plant_ids(key)
+        self._notify([(kind, key, self._row(kind, key)) for kind, key, row in rows], previous,
+                     "undo" if undo else "redo")
+        return previous
+
+    # Method that returns the current json row of a record, or None if there is none
+    def _row(self, kind, key):
+        record = self.plants.get(key) if kind == "plant" else self.suppliers.get(key)
+        return record.to_dict() if record is not None else None
+
+    # ---------- Queries ----------
+    # Method that checks whether any plant requires a greenhouse
+    # Plants are counted as they are indexed, so the plants do not have to be searched
+    def greenhouse_plants_exist(self):
+        return self.greenhouse_count > 0
+
+    # ---------- Loading and saving ----------
+    # Method that fills the inventory from the rows of plants.json and suppliers.json
+    # Rows that cannot be added, such as a plant reusing an id, are skipped so the rest can still
+    # be used and repaired; returns a message for each of them
+    def load(self, plant_rows, supplier_rows):
+        errors = []
+        for row in supplier_rows:
+            try:
+                self.add_stored_supplier(Supplier.from_dict(row))
+            except KeyError as e:
+                errors.append(f"Failed to load supplier: missing field {e}.")
+            except (TypeError, ValueError) as e:
+                errors.append(f"Failed to load supplier: {e}")
+        for row in plant_rows:
+            try:
+                self.add_stored_plant(Plant.from_dict(row))
+            except KeyError as e:
+                errors.append(f"Failed to load plant: missing field {e}.")
+            except (TypeError, ValueError) as e:
+                errors.append(f"Failed to load plant: {e}")
+        return errors
+
+    # Methods that add a supplier or plant read from storage rather than a new one
+    # They are the same as add_supplier and add_plant here, but stay local in subclasses
+    # such as RemoteInventory that send new records to a service
+    def add_stored_supplier(self, supplier):
+        return Inventory.add_supplier(self, supplier)
+
+    def add_stored_plant(self, plant):
+        return Inventory.add_plant(self, plant)
+
+    # Method that returns the plants as rows for plants.json
+    def plant_rows(self):
+        return [plant.to_dict() for plant in self.plants.values()]
+
+    # Method that returns the suppliers as rows for suppliers.json
+    def supplier_rows(self):
+        return [supplier.to_dict() for supplier in self.suppliers.values()]
+
+    # Method that reads an inventory from the plant and supplier json files
+    @classmethod
+    def from_files(cls, plant_file, supplier_file):
+        inventory = cls()
+        with open(plant_file, 'r') as f:
+            plant_rows = json.load(f)
+        with open(supplier_file, 'r') as f:
+            supplier_rows = json.load(f)
+        inventory.load(plant_rows, supplier_rows)
+        return inventory
@@ -0,0 +1,209 @@
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+from model import Plant, Supplier, Inventory
+
+# Seconds to wait for the service to answer
+SERVICE_TIMEOUT = 30
+
+# Error raised when the service refused a write because the record was changed by another client
+# It is a ValueError so the window shows it like any other refused change
+class ConflictError(ValueError):
+    pass
+
+# Error raised when the changes a client missed are no longer kept by the service
+class ChangesGoneError(Exception):
+    pass
+
+# This class sends requests to the inventory service and remembers the version of each record
+class ServiceClient:
+    def __init__(self, url, timeout=SERVICE_TIMEOUT):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.versions = {}  # (kind, key) -> version of the copy this client has
+        self.sequence = None  # number of the last change of the service this client has seen, None before loading
+
+    # Method that sends a request and returns the json answer
+    # Raises ConflictError or ValueError when the service refuses it or cannot be reached
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.load(response)
+        except urllib.error.HTTPError as e:
+            try:
+                error = json.load(e).get("error", e.reason)
+            except ValueError:
+                error = e.reason
+            if e.code == 409:
+                raise ConflictError(f"{error} The change was not saved; the latest details will be shown shortly.")
+            if e.code == 410:
+                raise ChangesGoneError(error)
+            raise ValueError(error)
+        except urllib.error.URLError as e:
+            # Reported like a refused change, so the window shows it instead of failing
+            raise ValueError(f"Cannot reach the inventory service at {self.url}: {e.reason}")
+
+    # Method that returns the path of a record, for example /plants/12 or /suppliers/Green%20Co
+    def record_path(self, kind, key):
+        return f"/{kind}s/{urllib.parse.quote(str(key), safe='')}"
+
+    # Method that returns the version of this client's copy of a record
+    def version(self, kind, key):
+        return self.versions.get((kind, key), 0)
+
+    # Method that notes the versions of records changed by a request
+    def note(self, changes):
+        for change in changes:
+            if change["row"] is None:
+                self.versions.pop((change["kind"], change["key"]), None)
+            else:
+                self.versions[(change["kind"], change["key"])] = change["version"]
+
+    # Method that returns the rows of a kind and notes their versions
+    def rows(self, kind):
+        data = self.request("GET", f"/{kind}s")
+        rows = data[f"{kind}s"]
+        for row in rows:
+            self.versions[(kind, row["name"] if kind == "supplier" else row["id"])] = row.pop("version")
+        # Changes made while the rows were being fetched are read again, and skipped by their versions
+        self.sequence = data["sequence"] if self.sequence is None else min(self.sequence, data["sequence"])
+        return rows
+
+    # Method that returns the changes made by any client since the last call, newest last
+    def changes(self):
+        data = self.request("GET", f"/changes?since={self.sequence or 0}")
+        self.sequence = data["sequence"]
+        return data["changes"]
+
+# This class lets a window load from the inventory service the way it loads from a local store
+# Nothing is written through it: RemoteInventory sends each change when it is made, and the
+# service saves them.
+class RemoteStore:
+    def __init__(self, client):
+        self.client = client
+        self.inventory = None
+        self.progress = 0.0
+
+    # Method that returns the plant and supplier rows
+    def load(self):
+        return list(self.iter_plants()), list(self.iter_suppliers())
+
+    # Method that yields the supplier rows
+    def iter_suppliers(self):
+        return iter(self.client.rows("supplier"))
+
+    # Method that yields the plant rows, updating self.progress
+    def iter_plants(self):
+        self.progress = 0.0
+        rows = self.client.rows("plant")
+        for count, row in enumerate(rows, 1):
+            self.progress = count / len(rows)
+            yield row
+        self.progress = 1.0
+
+    # Method kept so the window can attach it like a local store
+    def attach(self, inventory, listen=True):
+        self.inventory = inventory
+
+    # Method kept so changes can be passed here like to a local store; they are already on the service
+    def record(self, changes):
+        pass
+
+    # Method that asks the service to write everything to its data files
+    def compact(self):
+        self.client.request("POST", "/save")
+
+# This class is an inventory whose changes are made on the inventory service
+# It keeps a full copy of the inventory, so everything is read locally. Each change is
+# sent to the service first, naming the version of the record it was made from, and is
+# only made to the copy once the service has accepted it. Changes made by other clients
+# are brought in with apply_remote.
+class RemoteInventory(Inventory):
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+
+    # ---------- Plants ----------
+    def add_plant(self, plant):
+        self.client.note(self.client.request("POST", "/plants", plant.to_dict())["changes"])
+        return super().add_plant(plant)
+
+    def add_plants(self, plants):
+        self.client.note(self.client.request("POST", "/plants", [plant.to_dict() for plant in plants])["changes"])
+        return super().add_plants(plants)
+
+    def update_plant(self, plant_id, /, **changes):
+        self.client.note(self.client.request("PUT", self.client.record_path("plant", plant_id),
+                                             {"version": self.client.version("plant", plant_id), "changes": changes})["changes"])
+        return super().update_plant(plant_id, **changes)
+
+    def adjust_quantities(self, deltas):
+        changes = self.client.request("POST", "/adjustments", {"deltas": [list(pair) for pair in deltas]})["changes"]
+        # Plants added on another terminal since the last poll are left for the next one, which
+        # brings them in with their new quantities; their versions are not noted, so it does not
+        # skip them. Nothing here may fail now that the service has made the changes.
+        changes = [change for change in changes if change["key"] in self.plants]
+        self.client.note(changes)
+        # The service checked the changes against its quantities, which are copied here as they are
+        return self._set_quantities({change["key"]: change["row"]["quantity"] for change in changes})
+
+    def delete_plant(self, plant_id):
+        path = self.client.record_path("plant", plant_id) + f"?version={self.client.version('plant', plant_id)}"
+        self.client.note(self.client.request("DELETE", path)["changes"])
+        return super().delete_plant(plant_id)
+
+    # ---------- Suppliers ----------
+    def add_supplier(self, supplier):
+        self.client.note(self.client.request("POST", "/suppliers", supplier.to_dict())["changes"])
+        return super().add_supplier(supplier)
+
+    def update_supplier(self, old_name, name, phone_number, address):
+        row = {"name": name, "phone_number": phone_number, "address": address}
+        self.client.note(self.client.request("PUT", self.client.record_path("supplier", old_name),
+                                             {"version": self.client.version("supplier", old_name), "row": row})["changes"])
+        return super().update_supplier(old_name, name, phone_number, address)
+
+    def remove_supplier(self, name):
+        path = self.client.record_path("supplier", name) + f"?version={self.client.version('supplier', name)}"
+        self.client.note(self.client.request("DELETE", path)["changes"])
+        return super().remove_supplier(name)
+
+    # ---------- Changes from other clients ----------
+    # Method that makes changes read from the service to the local copy, skipping the ones it already has
+    # Returns (kind, key, row, added) for each change made, where added is true for a new record
+    def apply_remote(self, changes):
+        applied = []
+        for change in changes:
+            kind, key, row, version = change["kind"], change["key"], change["row"], change["version"]
+            if version <= self.client.version(kind, key) and row is not None:
+                continue
+            records = self.plants if kind == "plant" else self.suppliers
+            if row is None:
+                if key not in records:
+                    continue
+                if kind == "plant":
+                    Inventory.delete_plant(self, key)
+                else:
+                    # The service sends the changes to the supplier's plants as well
+                    Inventory.remove_supplier(self, key)
+                applied.append((kind, key, None, False))
+            elif key in records:
+                if kind == "plant":
+                    plant = Plant.from_dict(row)
+                    Inventory.update_plant(self, key, **{field: getattr(plant, field) for field in
+                                                         ("name", "description", "quantity", "greenhouse_required", "supplier")})
+                else:
+                    Inventory.update_supplier(self, key, key, row["phone_number"], row["address"])
+                applied.append((kind, key, row, False))
+            else:
+                if kind == "plant":
+                    self.add_stored_plant(Plant.from_dict(row))
+                else:
+                    self.add_stored_supplier(Supplier.from_dict(row))
+                applied.append((kind, key, row, True))
+            self.client.note([change])
+        return applied
@@ -0,0 +1,153 @@
+import bisect
+import operator
+import re
+
+# Fields whose words can be searched
+SEARCH_FIELDS = ("name", "description", "supplier")
+
+# Words of the searchable fields and of the search text
+TOKEN_PATTERN = re.compile(r"\w+")
+# Filters written in the search text, for example "quantity < 5" or "greenhouse_required = yes"
+FILTER_PATTERN = re.compile(r"\b(quantity|greenhouse_required|greenhouse)\s*(<=|>=|!=|==|=|<|>)\s*(\w+)", re.IGNORECASE)
+COMPARISONS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "=": operator.eq, "==": operator.eq, "!=": operator.ne
+}
+
+# Method that splits text into lower case words
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+# This class is an index of the words in each plant's name, description and supplier
+# Every word points to the ids of the plants that contain it, and the words are also kept
+# sorted so all the words starting with a prefix can be found with a binary search. New words
+# are only sorted in when a prefix is next looked up, so indexing many plants is not slowed
+# down by keeping the list sorted, and words no plant has any more are left in the list, and
+# skipped, until there are more of them than live words.
+# It is kept up to date as an Inventory listener, one plant at a time.
+class SearchIndex:
+    def __init__(self):
+        self.ids_by_token = {}  # word -> set of plant ids
+        self.tokens_by_id = {}  # plant id -> set of words
+        self.sorted_tokens = []  # every word, sorted, with some words no longer indexed
+        self.new_tokens = []  # words indexed since sorted_tokens was last sorted
+        self.removed_tokens = 0  # entries of sorted_tokens that are no longer indexed
+        self.positions = {}  # plant id -> number given when it was first indexed, to order results
+        self.next_position = 0
+
+    # Method that indexes a plant, replacing what was indexed for it before
+    def add(self, plant_id, row):
+        self._unindex(plant_id)
+        if plant_id not in self.positions:
+            self.positions[plant_id] = self.next_position
+            self.next_position += 1
+        tokens = set()
+        for field in SEARCH_FIELDS:
+            tokens.update(tokenize(row[field]))
+        self.tokens_by_id[plant_id] = tokens
+        for token in tokens:
+            ids = self.ids_by_token.get(token)
+            if ids is None:
+                ids = self.ids_by_token[token] = set()
+                self.new_tokens.append(token)
+            ids.add(plant_id)
+
+    # Method that removes a plant from the index
+    def remove(self, plant_id):
+        self._unindex(plant_id)
+        self.positions.pop(plant_id, None)
+
+    # Method that removes the words of a plant from the index
+    def _unindex(self, plant_id):
+        for token in self.tokens_by_id.pop(plant_id, ()):
+            ids = self.ids_by_token[token]
+            ids.discard(plant_id)
+            if not ids:
+                del self.ids_by_token[token]
+                self.removed_tokens += 1
+
+    # Method that indexes a list of plants
+    def add_plants(self, plants):
+        for plant in plants:
+            self.add(plant.plant_id, plant.to_dict())
+
+    # Method used as an Inventory listener to keep the index up to date
+    def record(self, changes):
+        for kind, key, row in changes:
+            if kind != "plant":
+                continue
+            if row is None:
+                self.remove(key)
+            else:
+                self.add(key, row)
+
+    # Method that brings sorted_tokens up to date before a lookup
+    # The new words are sorted and added after the sorted ones, which sort merges in one pass
+    def _sort_tokens(self):
+        if self.removed_tokens > len(self.ids_by_token):
+            self.sorted_tokens = sorted(self.ids_by_token)
+            self.removed_tokens = 0
+        elif self.new_tokens:
+            self.new_tokens.sort()
+            self.sorted_tokens += self.new_tokens
+            self.sorted_tokens.sort()
+        else:
+            return
+        self.new_tokens = []
+
+    # Method that returns the ids of plants with a word starting with prefix
+    def ids_with_prefix(self, prefix):
+        self._sort_tokens()
+        start = bisect.bisect_left(self.sorted_tokens, prefix)
+        # Words that start with the prefix sort between the prefix and the prefix followed by the last character
+        end = bisect.bisect_left(self.sorted_tokens, prefix + "\U0010ffff", start)
+        ids = set()
+        for token in self.sorted_tokens[start:end]:
+            # A word removed and indexed again is in the list twice, which the set makes no difference to
+            ids.update(self.ids_by_token.get(token, ()))
+        return ids
+
+    # Method that returns the ids of the plants matching every word of the text, each word as a prefix
+    # Returns None when the text has no words, meaning every plant matches
+    def search(self, text):
+        result = None
+        # Start with the rarest words so the sets being intersected stay small
+        for ids in sorted((self.ids_with_prefix(token) for token in set(tokenize(text))), key=len):
+            result = set(ids) if result is None else result & ids
+            if not result:
+                break
+        return result
+
+# Method that splits search text into the words to look up and a list of (field, compare, value) filters
+def parse_query(text):
+    filters = []
+    for field, symbol, value in FILTER_PATTERN.findall(text):
+        field = field.lower()
+        if field == "quantity":
+            try:
+                value = int(value)
+            except ValueError:
+                continue
+            filters.append(("quantity", COMPARISONS[symbol], value))
+        else:
+            filters.append(("greenhouse_required", COMPARISONS[symbol], value.lower()))
+    return FILTER_PATTERN.sub(" ", text), filters
+
+# Method that returns the ids of the plants in the inventory matching search text such as
+# "rose quantity < 5 greenhouse = yes", in the order they were first indexed, like the table
+# With words, only the plants having them are looked at and ordered; filters alone go through every plant
+def search_plants(inventory, index, text):
+    words, filters = parse_query(text)
+    ids = index.search(words)
+    plants = inventory.plants
+    if ids is None:
+        candidates = plants.values()
+    else:
+        candidates = [plants[plant_id] for plant_id in ids if plant_id in plants]
+    for field, compare, value in filters:
+        if field == "greenhouse_required":
+            candidates = [plant for plant in candidates if compare(plant.greenhouse_required.lower(), value)]
+        else:
+            candidates = [plant for plant in candidates if compare(plant.quantity, value)]
+    positions, last = index.positions, index.next_position
+    return sorted((plant.plant_id for plant in candidates), key=lambda plant_id: positions.get(plant_id, last))
@@ -0,0 +1,402 @@
+import collections
+import http.server
+import json
+import signal
+import sys
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from analytics import ReorderPoints
+from autosave import SaveScheduler
+from bulk import validate_row
+from config import service_workers, unique_plant_names, event_file, event_host, event_port, stock_history_folder
+from config import event_sequence_file, reorder_file
+from events import StockWatcher, open_event_bus
+from stocklog import StockLog
+from model import Inventory, Supplier, check_supplier_name
+from storage import open_store
+
+# Changes kept for clients catching up; a client further behind has to load everything again
+CHANGE_LOG_SIZE = 100000
+# Rows that failed to load printed when the service starts
+LOAD_ERRORS_SHOWN = 20
+# Plant attribute that can be changed -> key of that field in a plant row
+PLANT_FIELDS = {"plant_id": "id", "name": "name", "description": "description", "quantity": "quantity",
+                "greenhouse_required": "greenhouse_required", "supplier": "supplier"}
+
+# Error raised when a write was based on an old version of a record
+# The record's current row and version are sent back so the client can show what changed
+class Conflict(Exception):
+    def __init__(self, message, kind, key, row, version):
+        super().__init__(message)
+        self.kind = kind
+        self.key = key
+        self.row = row  # None when the record no longer exists
+        self.version = version
+
+# Error raised for a request the service does not have
+class NotFound(Exception):
+    pass
+
+# Error raised when a client asks for changes older than the change log keeps
+class Gone(Exception):
+    pass
+
+# This class owns the inventory for every client of the service
+# Each record has a version that goes up every time it changes, and a write names the
+# version it was based on, so a write made from an out of date copy is refused instead
+# of overwriting someone else's change. Every change is also numbered and kept in a log
+# that clients read to pick up the changes made by the others.
+class InventoryService:
+    def __init__(self, store, change_log_size=CHANGE_LOG_SIZE):
+        self.store = store
+        self.inventory = Inventory()
+        # Rows that cannot be loaded are skipped but kept in the data files; serve reports them
+        self.load_errors = self.inventory.load(store.iter_plants(), store.iter_suppliers())
+        self.inventory.unique_names = unique_plant_names
+        # Changes are saved in the background, the same way the window saves them
+        self.saver = SaveScheduler(store)
+        self.saver.attach(self.inventory)
+        self.lock = threading.RLock()
+        self.versions = {}  # (kind, key) -> version, also of removed records; records loaded from the store are at version 1
+        self.sequence = 0  # number of the last change
+        self.log = collections.deque(maxlen=change_log_size)  # (sequence, kind, key, row, version)
+        self.collected = None  # changes made by the operation running now
+        self.inventory.listeners.append(self._record)
+
+    # Method used as the inventory listener; numbers the changes and bumps the record versions
+    # The version of a removed record is kept, so one added again with the same key carries on
+    # from it and a write based on the removed record is still refused. It is only called from
+    # operations that hold the lock.
+    def _record(self, changes):
+        for kind, key, row in changes:
+            version = self.versions.get((kind, key), 1) + 1
+            self.versions[(kind, key)] = version
+            self.sequence += 1
+            entry = (self.sequence, kind, key, row, version)
+            self.log.append(entry)
+            if self.collected is not None:
+                self.collected.append(entry)
+
+    # Method that runs an inventory operation and returns the changes it made
+    def _apply(self, operation):
+        self.collected = []
+        try:
+            operation()
+            return self.collected
+        finally:
+            self.collected = None
+
+    # Method that returns the current version of a record, 0 if it does not exist
+    def version(self, kind, key):
+        exists = key in (self.inventory.plants if kind == "plant" else self.inventory.suppliers)
+        return self.versions.get((kind, key), 1) if exists else 0
+
+    # Method that raises Conflict unless the record is at the given version
+    def _check(self, kind, key, version):
+        current = self.version(kind, key)
+        if current != version:
+            record = self.inventory.get_plant(key) if kind == "plant" else self.inventory.get_supplier(key)
+            name = f"Plant {key}" if kind == "plant" else f"Supplier '{key}'"
+            message = f"{name} was changed on another terminal." if current else f"{name} was removed on another terminal."
+            raise Conflict(message, kind, key, record.to_dict() if record else None, current)
+
+    # Method that raises Conflict if a record already exists, for adds and renames
+    def _check_new(self, kind, key):
+        version = self.version(kind, key)
+        if version:
+            record = self.inventory.get_plant(key) if kind == "plant" else self.inventory.get_supplier(key)
+            name = f"Plant ID {key}" if kind == "plant" else f"Supplier '{key}'"
+            raise Conflict(f"{name} already exists.", kind, key, record.to_dict(), version)
+
+    # ---------- Reads ----------
+    # Method that returns every row of a kind with its version, and the number of the last change
+    def rows(self, kind):
+        with self.lock:
+            records = self.inventory.plants if kind == "plant" else self.inventory.suppliers
+            return self.sequence, [dict(record.to_dict(), version=self.versions.get((kind, key), 1))
+                                   for key, record in records.items()]
+
+    # Method that returns the changes made after the change numbered since
+    def changes_since(self, since):
+        with self.lock:
+            if since < self.sequence and (not self.log or self.log[0][0] > since + 1):
+                raise Gone(f"Changes after {since} are no longer kept.")
+            # The log is in order, so only the end of it has to be looked at
+            changes = []
+            for entry in reversed(self.log):
+                if entry[0] <= since:
+                    break
+                changes.append(entry)
+            changes.reverse()
+            return self.sequence, changes
+
+    # ---------- Plants ----------
+    # Method that validates rows for new plants, raising ValueError or Conflict
+    def _new_plants(self, rows):
+        plants = []
+        for row in rows:
+            plant, error = validate_row(row, self.inventory.suppliers, ())
+            if error:
+                raise ValueError(error)
+            self._check_new("plant", plant.plant_id)
+            plants.append(plant)
+        return plants
+
+    # Method that adds plants from their rows as one operation
+    def add_plants(self, rows):
+        with self.lock:
+            plants = self._new_plants(rows)
+            return self._apply(lambda: self.inventory.add_plants(plants))
+
+    # Method that changes fields of a plant, given as Plant attribute names, if it is still at version
+    def update_plant(self, plant_id, version, changes):
+        with self.lock:
+            self._check("plant", plant_id, version)
+            unknown = set(changes) - set(PLANT_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown plant field(s): {', '.join(sorted(unknown))}.")
+            # The changed plant is checked with the same rules as a new one
+            row = self.inventory.get_plant(plant_id).to_dict()
+            row.update((PLANT_FIELDS[field], value) for field, value in changes.items())
+            plant, error = validate_row(row, self.inventory.suppliers, ())
+            if error:
+                raise ValueError(error)
+            if plant.plant_id != plant_id:
+                self._check_new("plant", plant.plant_id)
+            values = {field: getattr(plant, field) for field in changes}
+            return self._apply(lambda: self.inventory.update_plant(plant_id, **values))
+
+    # Method that adds signed quantity changes to many plants as one operation, all or nothing
+    # Changes are added to whatever the quantities are now, so they do not need versions
+    def adjust_quantities(self, deltas):
+        with self.lock:
+            return self._apply(lambda: self.inventory.adjust_quantities([(int(plant_id), int(delta)) for plant_id, delta in deltas]))
+
+    # Method that removes a plant if it is still at version
+    def delete_plant(self, plant_id, version):
+        with self.lock:
+            self._check("plant", plant_id, version)
+            return self._apply(lambda: self.inventory.delete_plant(plant_id))
+
+    # ---------- Suppliers ----------
+    # Method that adds a supplier from its row
+    def add_supplier(self, row):
+        with self.lock:
+            supplier = Supplier(row.get("name"), row.get("phone_number"), row.get("address"))
+            check_supplier_name(supplier.name)
+            self._check_new("supplier", supplier.name)
+            return self._apply(lambda: self.inventory.add_supplier(supplier))
+
+    # Method that changes a supplier's details and name if it is still at version
+    def update_supplier(self, name, version, row):
+        with self.lock:
+            self._check("supplier", name, version)
+            new_name = row.get("name", name)
+            check_supplier_name(new_name)
+            if new_name != name:
+                self._check_new("supplier", new_name)
+            supplier = self.inventory.get_supplier(name)
+            return self._apply(lambda: self.inventory.update_supplier(
+                name, new_name, row.get("phone_number", supplier.phone_number), row.get("address", supplier.address)))
+
+    # Method that removes a supplier if it is still at version
+    def remove_supplier(self, name, version):
+        with self.lock:
+            self._check("supplier", name, version)
+            return self._apply(lambda: self.inventory.remove_supplier(name))
+
+    # ---------- Saving ----------
+    # Method that writes every change and folds the journal into the data files
+    def save(self):
+        error = self.saver.flush()
+        if error is not None:
+            raise error
+        self.store.compact()
+
+    # Method that saves everything and stops saving in the background
+    def close(self):
+        self.saver.close()
+        self.store.compact()
+
+# Method that turns a list of log entries into json
+def changes_json(changes):
+    return [{"sequence": sequence, "kind": kind, "key": key, "row": row, "version": version}
+            for sequence, kind, key, row, version in changes]
+
+# This class answers the http requests of the service
+#   GET    /plants, /suppliers            every row with its version
+#   GET    /changes?since=N               the changes made after change N
+#   POST   /plants                        add a plant row, or a list of rows as one operation
+#   PUT    /plants/ID                     {"version": V, "changes": {"quantity": 3, ...}}
+#   DELETE /plants/ID?version=V
+#   POST   /adjustments                   {"deltas": [[ID, change], ...]} added to the quantities as one operation
+#   POST   /suppliers                     add a supplier row
+#   PUT    /suppliers/NAME                {"version": V, "row": {"name": ..., "phone_number": ..., "address": ...}}
+#   DELETE /suppliers/NAME?version=V
+#   POST   /save                          write everything to the data files now
+# Writes answer with the changes they made, and a refused write answers 409 with the current record.
+class ServiceHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Seconds an idle connection may hold a pool thread
+    timeout = 5
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    # Method that keeps the console quiet; the window and CLI report errors themselves
+    def log_message(self, format, *args):
+        pass
+
+    # Method that sends data as a json response
+    def _send(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Method that reads the json body of the request
+    def _body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    # Method that runs the request on the service and answers it
+    def _handle(self, method):
+        service = self.server.service
+        url = urllib.parse.urlsplit(self.path)
+        parts = [urllib.parse.unquote(part) for part in url.path.strip("/").split("/")]
+        query = urllib.parse.parse_qs(url.query)
+        try:
+            data = self._route(service, method, parts, query)
+        except Conflict as e:
+            self._send(409, {"error": str(e), "kind": e.kind, "key": e.key, "row": e.row, "version": e.version})
+        except Gone as e:
+            self._send(410, {"error": str(e)})
+        except NotFound as e:
+            self._send(404, {"error": f"Not found: {e}"})
+        except KeyError as e:
+            self._send(400, {"error": f"Missing field {e}."})
+        except (ValueError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": str(e)})
+        else:
+            self._send(200, data)
+
+    # Method that calls the service method for a request and returns the json to answer with
+    def _route(self, service, method, parts, query):
+        collection = parts[0]
+        key = parts[1] if len(parts) > 1 else None
+        version = int(query["version"][0]) if "version" in query else None
+
+        if method == "GET" and collection in ("plants", "suppliers") and key is None:
+            sequence, rows = service.rows("plant" if collection == "plants" else "supplier")
+            return {"sequence": sequence, collection: rows}
+        if method == "GET" and collection == "changes":
+            sequence, changes = service.changes_since(int(query.get("since", ["0"])[0]))
+            return {"sequence": sequence, "changes": changes_json(changes)}
+        if method == "POST" and collection == "adjustments":
+            return {"changes": changes_json(service.adjust_quantities(self._body()["deltas"]))}
+        if method == "POST" and collection == "save":
+            service.save()
+            return {}
+
+        if collection == "plants":
+            if method == "POST" and key is None:
+                body = self._body()
+                return {"changes": changes_json(service.add_plants(body if isinstance(body, list) else [body]))}
+            if key is not None:
+                plant_id = int(key)
+                if method == "PUT":
+                    body = self._body()
+                    return {"changes": changes_json(service.update_plant(plant_id, body["version"], body["changes"]))}
+                if method == "DELETE" and version is not None:
+                    return {"changes": changes_json(service.delete_plant(plant_id, version))}
+        if collection == "suppliers":
+            if method == "POST" and key is None:
+                return {"changes": changes_json(service.add_supplier(self._body()))}
+            if key is not None:
+                if method == "PUT":
+                    body = self._body()
+                    return {"changes": changes_json(service.update_supplier(key, body["version"], body["row"]))}
+                if method == "DELETE" and version is not None:
+                    return {"changes": changes_json(service.remove_supplier(key, version))}
+        raise NotFound(f"{method} /{'/'.join(parts)}")
+
+# This class is an http server that answers requests on a fixed pool of threads
+class PooledHTTPServer(http.server.HTTPServer):
+    def __init__(self, address, handler, service, workers=service_workers):
+        super().__init__(address, handler)
+        self.service = service
+        self.pool = ThreadPoolExecutor(workers)
+
+    # Method called for each new connection; hands it to the pool instead of answering it here
+    def process_request(self, request, client_address):
+        self.pool.submit(self._process, request, client_address)
+
+    # Method run on a pool thread that answers every request made on a connection
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    # Method that stops the server, waiting for the requests being answered
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+
+# Method that runs the service until it is interrupted, then saves everything
+def serve(host, port, backend, plant_file, supplier_file, journal_file, database_file, workers=service_workers):
+    service = InventoryService(open_store(backend, plant_file, supplier_file, journal_file, database_file))
+    # The service owns the inventory, so it sends the change events of every terminal, and the
+    # stock events the windows would send when working on the data files themselves
+    events = open_event_bus(event_file, event_host, event_port, event_sequence_file)
+    if events:
+        events.on_error = lambda e: print(f"Failed to send change events: {e}", file=sys.stderr)
+        events.attach(service.inventory)
+        # The reorder points are read once; restart the service to pick up changes to them
+        try:
+            reorder_points = ReorderPoints.from_file(reorder_file)
+        except (OSError, ValueError) as e:
+            print(f"Failed to load reorder points, using the default of 5: {e}", file=sys.stderr)
+            reorder_points = ReorderPoints()
+        StockWatcher(events, reorder_points).attach(service.inventory)
+    # and logs the quantity changes of every terminal for the stock forecasts, written along with the saves
+    stock_log = StockLog(stock_history_folder)
+    stock_log.attach(service.inventory)
+    service.saver.add_log(stock_log)
+    server = PooledHTTPServer((host, port), ServiceHandler, service, workers)
+    for error in service.load_errors[:LOAD_ERRORS_SHOWN]:
+        print(error, file=sys.stderr)
+    if len(service.load_errors) > LOAD_ERRORS_SHOWN:
+        print(f"...and {len(service.load_errors) - LOAD_ERRORS_SHOWN} more", file=sys.stderr)
+    print(f"Serving {len(service.inventory.plants)} plants on http://{host}:{server.server_port}")
+
+    # Function that stops the server like Ctrl+C does when the process is asked to end
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if events:
+            events.close()
@@ -0,0 +1,267 @@
+import array
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+
+# Start of every snapshot file; the number is the version of the format
+MAGIC = b"R31SNAP1"
+# Header: magic, checksum of everything after the header, padding, the numbers of plants,
+# suppliers and strings, then the size and modification time of plants.json and suppliers.json
+# when the snapshot was made from them
+HEADER = struct.Struct("<8sII3Q" + "Qq" * 2)
+# String number stored for a missing (None) text field
+NO_STRING = 0xFFFFFFFF
+# Bytes copied at a time when the string table is written
+COPY_CHUNK = 1 << 20
+
+# The columns are read in place as the machine's own integers, so snapshots are only used
+# on little-endian machines; elsewhere the json files are always read
+SUPPORTED = sys.byteorder == "little"
+
+# A snapshot is a binary copy of plants.json and suppliers.json that can be loaded without
+# parsing any json. After the header come, each padded to a multiple of 8 bytes:
+#   plant columns:    ids (int64), quantities (int64), names, descriptions, suppliers (uint32 string
+#                     numbers), greenhouse required (uint8)
+#   supplier columns: names, phone numbers, addresses (uint32 string numbers)
+#   string table:     offsets (uint64, one more than the number of strings), then the utf-8 text
+# Plants with the same name or supplier share one string. The json files stay the files that
+# are edited and exchanged; the snapshot is remade from them on every save and is ignored when
+# they have changed since it was made, or when its checksum does not match.
+
+# Method that returns the (size, modification time) of a file, or (0, 0) if there is none
+def file_signature(path):
+    try:
+        status = os.stat(path)
+    except FileNotFoundError:
+        return 0, 0
+    return status.st_size, status.st_mtime_ns
+
+# Method that returns the number of bytes needed to pad size to a multiple of 8
+def padding(size):
+    return -size % 8
+
+# This class collects plant and supplier rows and writes them as a snapshot
+# The text goes to a temporary file as it is added, so only the columns are kept in memory
+class SnapshotWriter:
+    def __init__(self):
+        self.ids = array.array("q")
+        self.quantities = array.array("q")
+        self.names = array.array("I")
+        self.descriptions = array.array("I")
+        self.suppliers = array.array("I")
+        self.greenhouse = array.array("B")
+        self.supplier_names = array.array("I")
+        self.phone_numbers = array.array("I")
+        self.addresses = array.array("I")
+        self.offsets = array.array("Q", [0])
+        self.text = tempfile.TemporaryFile()
+        self.shared = {}  # name or supplier -> string number, so repeated values are stored once
+
+    # Method that adds a string to the string table and returns its number
+    # Shared strings, such as supplier names, are only stored the first time they are added
+    def add_string(self, value, shared=False):
+        if value is None:
+            return NO_STRING
+        if shared:
+            number = self.shared.get(value)
+            if number is not None:
+                return number
+        if not isinstance(value, str):
+            raise TypeError(f"Expected text, found {value!r}.")
+        data = value.encode("utf-8")
+        self.text.write(data)
+        number = len(self.offsets) - 1
+        self.offsets.append(self.offsets[-1] + len(data))
+        if shared:
+            self.shared[value] = number
+        return number
+
+    # Method that adds a row of plants.json
+    def add_plant(self, row):
+        self.ids.append(int(row["id"]))
+        self.quantities.append(int(row["quantity"]))
+        self.names.append(self.add_string(row["name"], shared=True))
+        self.descriptions.append(self.add_string(row["description"]))
+        self.suppliers.append(self.add_string(row["supplier"], shared=True))
+        self.greenhouse.append(str(row["greenhouse_required"]).strip().lower() == "yes")
+
+    # Method that adds a row of suppliers.json
+    def add_supplier(self, row):
+        self.supplier_names.append(self.add_string(row["name"], shared=True))
+        self.phone_numbers.append(self.add_string(row["phone_number"]))
+        self.addresses.append(self.add_string(row["address"]))
+
+    # Method that writes the snapshot to a binary file opened for writing
+    # signature is the file_signature of plants.json followed by that of suppliers.json
+    def write(self, f, signature):
+        checksum = 0
+        f.write(bytes(HEADER.size))
+
+        # Function that writes data after the header and adds it to the checksum
+        def write_data(data):
+            nonlocal checksum
+            checksum = zlib.crc32(data, checksum)
+            f.write(data)
+
+        for column in (self.ids, self.quantities, self.names, self.descriptions, self.suppliers, self.greenhouse,
+                       self.supplier_names, self.phone_numbers, self.addresses, self.offsets):
+            data = column.tobytes()
+            write_data(data)
+            write_data(bytes(padding(len(data))))
+        self.text.seek(0)
+        while True:
+            chunk = self.text.read(COPY_CHUNK)
+            if not chunk:
+                break
+            write_data(chunk)
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, checksum, 0, len(self.ids), len(self.supplier_names), len(self.offsets) - 1, *signature))
+        f.seek(0, os.SEEK_END)
+
+    # Method that deletes the temporary text file
+    def close(self):
+        self.text.close()
+
+# This class reads a snapshot through a memory map
+# Nothing is decoded when it is opened: a row is built from the columns when it is asked for,
+# and each string is decoded the first time a row uses it
+class Snapshot:
+    def __init__(self, path):
+        self.views = []  # every view of the memory map, released by close
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError("The snapshot is too short.")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self.size = size
+            (magic, self.checksum, _, self.plant_count, self.supplier_count, self.string_count,
+             *signature) = HEADER.unpack_from(self.map)
+            if magic != MAGIC:
+                raise ValueError("The file is not a snapshot, or was made by another version.")
+            self.signature = tuple(signature)
+
+            data = self._view(memoryview(self.map))
+            position = HEADER.size
+
+            # Function that returns the next column of count items of the given type
+            def column(type_code, count):
+                nonlocal position
+                item_size = array.array(type_code).itemsize
+                end = position + count * item_size
+                if end > size:
+                    raise ValueError("The snapshot is shorter than its header says.")
+                view = self._view(self._view(data[position:end]).cast(type_code))
+                position = end + padding(end - position)
+                return view
+
+            self.ids = column("q", self.plant_count)
+            self.quantities = column("q", self.plant_count)
+            self.names = column("I", self.plant_count)
+            self.descriptions = column("I", self.plant_count)
+            self.suppliers = column("I", self.plant_count)
+            self.greenhouse = column("B", self.plant_count)
+            self.supplier_names = column("I", self.supplier_count)
+            self.phone_numbers = column("I", self.supplier_count)
+            self.addresses = column("I", self.supplier_count)
+            self.offsets = column("Q", self.string_count + 1)
+            self.text = self._view(data[position:])
+            if self.offsets[-1] != len(self.text):
+                raise ValueError("The snapshot's string table does not match its size.")
+            self.body = self._view(data[HEADER.size:])
+            self.strings = [None] * self.string_count  # strings decoded so far
+        except BaseException:
+            self.close()
+            raise
+
+    # Method that remembers a view of the memory map so close can release it
+    def _view(self, view):
+        self.views.append(view)
+        return view
+
+    # Method that checks the snapshot was not damaged since it was written
+    def verify(self):
+        if zlib.crc32(self.body) != self.checksum:
+            raise ValueError("The snapshot's checksum does not match.")
+
+    # Method that returns a string from the string table, decoding it the first time
+    def string(self, number):
+        if number == NO_STRING:
+            return None
+        value = self.strings[number]
+        if value is None:
+            value = self.strings[number] = str(self.text[self.offsets[number]:self.offsets[number + 1]], "utf-8")
+        return value
+
+    # Method that returns the plant at a position as a row of plants.json
+    def plant_row(self, position):
+        return {
+            "id": self.ids[position],
+            "name": self.string(self.names[position]),
+            "description": self.string(self.descriptions[position]),
+            "quantity": self.quantities[position],
+            "greenhouse_required": "yes" if self.greenhouse[position] else "no",
+            "supplier": self.string(self.suppliers[position])
+        }
+
+    # Method that yields every plant row in order, the same as plant_row but faster for a whole load
+    # Names and suppliers are mostly shared, so they are looked up among the decoded strings first
+    def plant_rows(self):
+        strings, string = self.strings, self.string
+        ids, quantities, greenhouse = self.ids, self.quantities, self.greenhouse
+        names, descriptions, suppliers = self.names, self.descriptions, self.suppliers
+        for position in range(self.plant_count):
+            name, supplier = names[position], suppliers[position]
+            yield {
+                "id": ids[position],
+                "name": (name != NO_STRING and strings[name]) or string(name),
+                "description": string(descriptions[position]),
+                "quantity": quantities[position],
+                "greenhouse_required": "yes" if greenhouse[position] else "no",
+                "supplier": (supplier != NO_STRING and strings[supplier]) or string(supplier)
+            }
+
+    # Method that yields every supplier row in order
+    def supplier_rows(self):
+        return map(self.supplier_row, range(self.supplier_count))
+
+    # Method that returns the supplier at a position as a row of suppliers.json
+    # plants_served is left empty; it is rebuilt from the plants like when suppliers.json is read
+    def supplier_row(self, position):
+        return {
+            "name": self.string(self.supplier_names[position]),
+            "phone_number": self.string(self.phone_numbers[position]),
+            "address": self.string(self.addresses[position]),
+            "plants_served": []
+        }
+
+    # Method that releases the memory map; the rows already returned stay usable
+    def close(self):
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        if getattr(self, "map", None) is not None:
+            self.map.close()
+            self.map = None
+
+# Method that opens the snapshot at path if it was made from the current plant and supplier
+# files and is undamaged, or returns None so the json files are read instead
+def open_snapshot(path, plant_file, supplier_file):
+    if not SUPPORTED or not os.path.exists(path):
+        return None
+    try:
+        snapshot = Snapshot(path)
+    except (OSError, ValueError, struct.error):
+        return None
+    try:
+        if snapshot.signature != file_signature(plant_file) + file_signature(supplier_file):
+            raise ValueError("The json files changed since the snapshot was made.")
+        snapshot.verify()
+    except ValueError:
+        snapshot.close()
+        return None
+    return snapshot
@@ -0,0 +1,131 @@
+import array
+import os
+import threading
+import time
+from instrument import count_bytes
+
+# Columns of the log, each kept in its own file of 64-bit integers:
+#   times:      when the quantity changed, in seconds since 1970
+#   ids:        plant id
+#   quantities: the plant's quantity after the change
+#   changes:    the quantity after minus the quantity before, negative for stock sold or used
+#   undone:     1 when the change takes back an earlier one through undo, otherwise 0
+COLUMNS = ("times", "ids", "quantities", "changes", "undone")
+# Extension of the column files, e.g. data/stock_history/times.i64
+COLUMN_EXTENSION = ".i64"
+# Bytes in one value of a column
+VALUE_SIZE = array.array("q").itemsize
+
+# This class keeps a log of every change to a plant's quantity, so how fast plants sell can be worked out
+# Each column is a file of its own that a change only appends to, so logging costs a few small
+# writes however long the log gets, and a forecast reads only the columns it needs for the days it
+# looks at: the times are in the order they were logged, so the first change in a time range is
+# found by a binary search of the times file rather than by reading all of it. Changes are kept
+# in memory as they are made and written together by flush, which a SaveScheduler calls on its
+# thread with every save (see SaveScheduler.add_log), so editing never waits on the files.
+# Changes are not synced to disk; a crash loses the ones not flushed yet, and a change only
+# partly written is cut off when the log is next opened. Reads only see the flushed changes.
+class StockLog:
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+        self.paths = {column: os.path.join(folder, column + COLUMN_EXTENSION) for column in COLUMNS}
+        self.count = self._repair()
+        self.lock = threading.Lock()
+        self.pending = {column: array.array("q") for column in COLUMNS}  # changes not flushed yet
+
+    # Method that cuts every column down to the changes written to all of them and returns their number
+    def _repair(self):
+        sizes = [os.path.getsize(path) if os.path.exists(path) else 0 for path in self.paths.values()]
+        count = min(sizes) // VALUE_SIZE
+        for path, size in zip(self.paths.values(), sizes):
+            if size != count * VALUE_SIZE:
+                with open(path, 'ab') as f:
+                    f.truncate(count * VALUE_SIZE)
+        return count
+
+    # Method that starts logging the quantity changes made to the inventory
+    def attach(self, inventory):
+        inventory.stock_log = self
+
+    # Method called by the inventory with the changes of an operation and the rows before it
+    # Plants added or removed are not logged, nor changes that leave the quantity as it was.
+    # undone is true when the operation undoes an earlier one, so a sale made by mistake and
+    # undone can be left out of how fast the plant sells; a redo is logged like the first time.
+    # The changes are only kept in memory until the next flush.
+    def record(self, changes, previous, undone=False, now=None):
+        before = {key: row for kind, key, row in previous if kind == "plant" and row is not None}
+        when = int(time.time() if now is None else now)
+        with self.lock:
+            for kind, key, row in changes:
+                old_row = before.get(key) if kind == "plant" and row is not None else None
+                if old_row is None or old_row["quantity"] == row["quantity"]:
+                    continue
+                self.pending["times"].append(when)
+                self.pending["ids"].append(key)
+                self.pending["quantities"].append(row["quantity"])
+                self.pending["changes"].append(row["quantity"] - old_row["quantity"])
+                self.pending["undone"].append(undone)
+
+    # Method that writes the changes recorded since the last flush to the column files
+    # If a write fails the changes are kept for the next flush
+    def flush(self):
+        with self.lock:
+            columns = self.pending
+            self.pending = {column: array.array("q") for column in COLUMNS}
+        if not columns["times"]:
+            return
+        try:
+            self.append(columns)
+        except OSError:
+            # The changes are kept whole for the next flush, and the columns already written cut back to match
+            with self.lock:
+                for column in COLUMNS:
+                    columns[column].extend(self.pending[column])
+                self.pending = columns
+            self.count = self._repair()
+            raise
+
+    # Method that appends the changes in columns, a dict of column name -> array of values
+    def append(self, columns):
+        for column in COLUMNS:
+            with open(self.paths[column], 'ab') as f:
+                columns[column].tofile(f)
+            count_bytes(self.paths[column], "written", len(columns[column]) * VALUE_SIZE)
+        self.count += len(columns["times"])
+
+    # Method that returns the position of the first change logged at or after a time
+    def position_at(self, when):
+        low, high = 0, self.count
+        if not high:
+            return 0
+        with open(self.paths["times"], 'rb') as f:
+            while low < high:
+                middle = (low + high) // 2
+                f.seek(middle * VALUE_SIZE)
+                if array.array("q", f.read(VALUE_SIZE))[0] < when:
+                    low = middle + 1
+                else:
+                    high = middle
+        return low
+
+    # Method that returns the time of the first change logged, or None when the log is empty
+    def first_time(self):
+        if not self.count:
+            return None
+        with open(self.paths["times"], 'rb') as f:
+            return array.array("q", f.read(VALUE_SIZE))[0]
+
+    # Method that reads a column from a position to the end
+    # Returns a NumPy array when numpy is given, otherwise an array.array
+    def read(self, column, position=0, numpy=None):
+        path = self.paths[column]
+        count = self.count - position
+        count_bytes(path, "read", count * VALUE_SIZE)
+        if numpy is not None:
+            return numpy.fromfile(path, dtype=numpy.int64, count=count, offset=position * VALUE_SIZE)
+        values = array.array("q")
+        with open(path, 'rb') as f:
+            f.seek(position * VALUE_SIZE)
+            values.fromfile(f, count)
+        return values
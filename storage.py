@@ -0,0 +1,675 @@
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from instrument import timed, count_bytes
+from snapshot import SnapshotWriter, file_signature, open_snapshot
+
+# Number of journal entries written before the journal is folded into the json files
+COMPACT_EVERY = 500
+# Characters read at a time when streaming a json file
+READ_CHUNK = 1 << 16
+# Characters that can follow a number in a json list
+NUMBER_ENDS = ",] \t\r\n"
+# Database rows fetched at a time when streaming plants from SQLite
+READ_ROWS = 1000
+# Extension of the snapshot kept next to plants.json, e.g. data/plants.snapshot
+SNAPSHOT_EXTENSION = ".snapshot"
+# Plant ids in each shard file of the "sharded" backend: ids 0-24999 go to plants-00000.json and so on
+SHARD_SIZE = 25000
+# Name of the journal of the "sharded" backend, kept in its shard folder apart from the json backend's
+SHARD_JOURNAL = "journal.jsonl"
+
+# Method that writes a file without ever leaving a half written file behind
+# write(f) writes the contents to a temporary file in the same folder which then replaces the real file
+# The file is opened for text unless binary is true
+def atomic_write(path, write, binary=False):
+    folder = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=".tmp-", suffix=os.path.splitext(path)[1])
+    try:
+        with os.fdopen(fd, 'wb' if binary else 'w') as f:
+            write(f)
+            count_bytes(path, "written", f.tell())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+# Method that writes data to a json file without ever leaving a half written file behind
+def atomic_write_json(path, data, indent=None):
+    atomic_write(path, lambda f: json.dump(data, f, indent=indent))
+
+# Method that writes rows to a json list file one at a time, so the rows do not all have to be in memory
+# The file is the same as json.dump would write for a list of the rows
+def atomic_write_json_rows(path, rows):
+    def write(f):
+        separator = "["
+        for row in rows:
+            f.write(separator)
+            f.write(json.dumps(row))
+            separator = ", "
+        f.write("]" if separator == ", " else "[]")
+    atomic_write(path, write)
+
+# Method that yields the items of a json list one at a time without reading the whole file
+# on_read(characters) is called after each chunk with the number of characters consumed so far
+def iter_json_array(f, on_read=None):
+    decoder = json.JSONDecoder()
+    buffer = f.read(READ_CHUNK)
+    consumed = 0  # characters dropped from the front of the buffer
+    pos = 0
+    at_eof = not buffer
+
+    # Function that reads the next chunk into the buffer; returns False at the end of the file
+    def read_more():
+        nonlocal buffer, consumed, pos, at_eof
+        chunk = f.read(READ_CHUNK)
+        if not chunk:
+            at_eof = True
+            return False
+        consumed += pos
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        if on_read:
+            on_read(consumed)
+        return True
+
+    # Function that skips whitespace and returns the next character, or "" at the end of the file
+    def next_char():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not read_more():
+                return ""
+
+    if next_char() != "[":
+        if at_eof and not buffer.strip():
+            return
+        raise ValueError("Expected a json list.")
+    pos += 1
+    if next_char() == "]":
+        return
+    while True:
+        next_char()
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            # A value that runs to the end of the buffer may continue in the next chunk, and so may
+            # a number not followed by a separator, such as 1.5 cut off after "1."
+            number = isinstance(item, (int, float)) and not isinstance(item, bool)
+            complete = at_eof or (end < len(buffer) and (not number or buffer[end] in NUMBER_ENDS))
+        except ValueError:
+            complete = False
+        if not complete:
+            if not read_more():
+                raise ValueError("Unexpected end of json list.")
+            continue
+        pos = end
+        yield item
+        separator = next_char()
+        pos += 1
+        if separator == "]":
+            if on_read:
+                on_read(consumed + pos)
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in json list, found {separator!r}.")
+
+# This class is an append-only log of record changes, one json object per line
+# Each line looks like {"kind": "plant", "key": 4, "row": {...}} and a row of None
+# means the record was removed
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self.bad_lines = 0  # lines the last replay skipped because they could not be read
+        if os.path.exists(path):
+            self._repair()
+        self.entries = sum(1 for _ in self.replay())
+
+    # Method that cuts off a last line torn by a crash mid-append, so the next append starts on a line of its own
+    def _repair(self):
+        with open(self.path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end > 0:
+                start = max(0, end - READ_CHUNK)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end < size:
+                f.truncate(end)
+
+    # Method that appends (kind, key, row) changes to the journal in one write and makes sure they are on disk
+    def append(self, changes):
+        lines = "".join(json.dumps({"kind": kind, "key": key, "row": row}) + "\n" for kind, key, row in changes)
+        with open(self.path, 'a') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        count_bytes(self.path, "written", len(lines))
+        self.entries += len(changes)
+
+    # Method that yields the (kind, key, row) changes stored in the journal
+    # Lines that cannot be read are skipped and counted in self.bad_lines, so the changes after them are kept
+    def replay(self):
+        self.bad_lines = 0
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    change = entry["kind"], entry["key"], entry["row"]
+                except (ValueError, KeyError, TypeError):
+                    self.bad_lines += 1
+                    continue
+                yield change
+        count_bytes(self.path, "read", os.path.getsize(self.path))
+
+    # Method that empties the journal once its changes are in the json files
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.entries = 0
+
+# This class stores the inventory in plants.json and suppliers.json
+# Changes are appended to a journal as they happen and the json files are only
+# rewritten when the journal is compacted. Each compaction also writes a binary snapshot
+# of the files (see snapshot.py), which is read instead of them while it is up to date.
+class JsonStore:
+    def __init__(self, plant_file, supplier_file, journal_file, compact_every=COMPACT_EVERY, snapshot_file=None):
+        self.plant_file = plant_file
+        self.supplier_file = supplier_file
+        self.snapshot_file = snapshot_file or os.path.splitext(plant_file)[0] + SNAPSHOT_EXTENSION
+        # Set to False to always read the json files, for example to time them
+        self.use_snapshot = True
+        self.journal = Journal(journal_file)
+        self.compact_every = compact_every
+        self.inventory = None
+        self.progress = 0.0  # fraction of plants.json read by iter_plants
+
+    # Method that returns the plant and supplier rows, with the journal replayed on top of the json files
+    @timed
+    def load(self):
+        return list(self.iter_plants()), list(self.iter_suppliers())
+
+    # Method that yields the supplier rows with the journal applied
+    def iter_suppliers(self):
+        return self._iter_rows(self.supplier_file, "supplier", lambda row: row["name"])
+
+    # Method that yields the plant rows one at a time with the journal applied, updating self.progress
+    def iter_plants(self):
+        return self._iter_rows(self.plant_file, "plant", lambda row: int(row["id"]), track_progress=True)
+
+    # Method that streams the rows of a json file and replaces, removes or adds the journaled ones
+    def _iter_rows(self, path, kind, key_of, track_progress=False):
+        changes = {}
+        for entry_kind, key, row in self.journal.replay():
+            if entry_kind == kind:
+                # Keep the position of the first change so added rows come out in order
+                changes[key] = row
+        if track_progress:
+            self.progress = 0.0
+        for row in self._stored_rows(path, kind, track_progress):
+            key = key_of(row)
+            if key in changes:
+                row = changes.pop(key)
+                if row is None:
+                    continue
+            yield row
+        for row in changes.values():
+            if row is not None:
+                yield row
+        if track_progress:
+            self.progress = 1.0
+
+    # Method that yields the rows of a json file as they were last compacted, without the journal
+    # They are read from the snapshot when it was made from the current files, which needs no json parsing
+    def _stored_rows(self, path, kind, track_progress):
+        snapshot = open_snapshot(self.snapshot_file, self.plant_file, self.supplier_file) if self.use_snapshot else None
+        if snapshot is not None:
+            try:
+                count, rows = (snapshot.plant_count, snapshot.plant_rows()) if kind == "plant" else \
+                              (snapshot.supplier_count, snapshot.supplier_rows())
+                for position, row in enumerate(rows, 1):
+                    if track_progress:
+                        self.progress = position / count
+                    yield row
+            finally:
+                snapshot.close()
+            count_bytes(self.snapshot_file, "read", snapshot.size)
+            return
+
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        # Function that records how much of the file has been read
+        def on_read(characters):
+            if track_progress and size:
+                self.progress = min(1.0, characters / size)
+
+        if size:
+            with open(path, 'r') as f:
+                yield from iter_json_array(f, on_read)
+            count_bytes(path, "read", size)
+
+    # Method that connects the store to the inventory and, if listen is true, journals every change made to it
+    # Pass listen=False when the changes reach record some other way, such as through a SaveScheduler
+    def attach(self, inventory, listen=True):
+        self.inventory = inventory
+        if listen:
+            inventory.listeners.append(self.record)
+
+    # Method that writes the changes of one operation to the journal, compacting it when it gets long
+    @timed
+    def record(self, changes):
+        self.journal.append(changes)
+        if self.journal.entries >= self.compact_every:
+            self.compact()
+
+    # Method that folds the journal into the json files and empties it
+    # The rows come from the files themselves, not the inventory, so this is safe to run
+    # on a saving thread while the inventory is being edited
+    @timed
+    # The plants are streamed from the old file into the new one, so only the plant ids of
+    # each supplier and the snapshot's columns are kept in memory
+    def compact(self):
+        plants_served = {}
+        snapshot = SnapshotWriter()
+
+        # Function that yields the plant rows while noting which supplier each belongs to
+        def plant_rows():
+            nonlocal snapshot
+            for row in self.iter_plants():
+                plants_served.setdefault(row["supplier"], []).append(int(row["id"]))
+                snapshot = self._add_to_snapshot(snapshot, SnapshotWriter.add_plant, row)
+                yield row
+
+        try:
+            atomic_write_json_rows(self.plant_file, plant_rows())
+            supplier_rows = list(self.iter_suppliers())
+            for row in supplier_rows:
+                row["plants_served"] = sorted(plants_served.get(row["name"], []))
+                snapshot = self._add_to_snapshot(snapshot, SnapshotWriter.add_supplier, row)
+            atomic_write_json(self.supplier_file, supplier_rows, indent=4)
+            self._write_snapshot(snapshot)
+        finally:
+            if snapshot:
+                snapshot.close()
+        self.journal.clear()
+
+    # Method that adds a row to the snapshot being written with add(snapshot, row), returning the
+    # snapshot, or None once a row could not be added to it; the json files are saved either way
+    def _add_to_snapshot(self, snapshot, add, row):
+        if snapshot is None:
+            return None
+        try:
+            add(snapshot, row)
+        except (TypeError, ValueError, OverflowError):
+            snapshot.close()
+            return None
+        return snapshot
+
+    # Method that writes the snapshot of the json files just written, or removes the old one
+    # when there is none, so the files are read instead of an out of date snapshot
+    def _write_snapshot(self, snapshot):
+        signature = file_signature(self.plant_file) + file_signature(self.supplier_file)
+        try:
+            if snapshot is None:
+                raise ValueError("Some rows cannot be stored in a snapshot.")
+            atomic_write(self.snapshot_file, lambda f: snapshot.write(f, signature), binary=True)
+        except (OSError, ValueError):
+            if os.path.exists(self.snapshot_file):
+                os.remove(self.snapshot_file)
+
+# Method run in a worker process that reads one shard file and returns its rows
+# Ids and quantities are checked and stored as integers, as Plant.from_dict would; rows where they
+# are not numbers are returned as they are and reported when they are added to the inventory
+def read_shard(path):
+    with open(path, 'r') as f:
+        rows = json.load(f)
+    for row in rows:
+        try:
+            row["id"] = int(row["id"])
+            row["quantity"] = int(row["quantity"])
+        except (KeyError, TypeError, ValueError):
+            pass
+    return rows
+
+# Method run in a worker process that rewrites one shard file with changes applied
+# changes maps plant id -> new row, or None to remove the plant. Returns the number of bytes written
+# and (plant id, old supplier, new supplier) for each plant changed, with None for a plant that
+# was not there before or is not there after
+def write_shard(path, changes):
+    rows = []
+    moves = []
+    for row in read_shard(path) if os.path.exists(path) else ():
+        key = row["id"]
+        if key in changes:
+            new_row = changes.pop(key)
+            moves.append((key, row.get("supplier"), new_row and new_row["supplier"]))
+            if new_row is None:
+                continue
+            row = new_row
+        rows.append(row)
+    for key, new_row in changes.items():
+        if new_row is not None:
+            moves.append((key, None, new_row["supplier"]))
+            rows.append(new_row)
+    if rows:
+        atomic_write_json_rows(path, rows)
+    elif os.path.exists(path):
+        os.remove(path)
+    return (os.path.getsize(path) if rows else 0), moves
+
+# Method that runs function(*argument) for each tuple in arguments in a pool of worker processes
+# Yields the results in the order of the arguments. With one argument or one processor the work is
+# done in this process, as starting workers would only add to it
+def map_in_processes(function, arguments):
+    workers = min(len(arguments), os.cpu_count() or 1)
+    if workers < 2:
+        for argument in arguments:
+            yield function(*argument)
+        return
+    # New processes are started rather than forked, as the window and saver threads may be running
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        yield from pool.map(function, *zip(*arguments))
+
+# This class stores the plants in several json files, each holding a range of plant ids, next
+# to suppliers.json; its journal is kept in the shard folder, apart from the one of JsonStore
+# The shards are read in parallel by worker processes, and compacting rewrites only the shards
+# of the plants in the journal. The rows come out the same as from JsonStore, except that the
+# plants are in order of their shard (their id range), each shard keeping its own order.
+# plants.json is not kept up to date while the shard folder exists; open_store moves the plants
+# from one layout to the other when the backend is switched.
+class ShardedStore(JsonStore):
+    def __init__(self, plant_file, supplier_file, shard_folder=None, shard_size=SHARD_SIZE,
+                 compact_every=COMPACT_EVERY):
+        shard_folder = shard_folder or os.path.splitext(plant_file)[0]
+        super().__init__(plant_file, supplier_file, os.path.join(shard_folder, SHARD_JOURNAL), compact_every)
+        # The snapshot is of plants.json, which is not kept up to date in this layout
+        self.use_snapshot = False
+        self.shard_folder = shard_folder
+        self.shard_size = shard_size
+
+    # Method that returns the path of the shard holding a plant id
+    def shard_path(self, plant_id):
+        return os.path.join(self.shard_folder, f"plants-{plant_id // self.shard_size:05d}.json")
+
+    # Method that returns the paths of the shard files, in order of their plant ids
+    def shard_paths(self):
+        if not os.path.isdir(self.shard_folder):
+            return []
+        return [os.path.join(self.shard_folder, name) for name in sorted(os.listdir(self.shard_folder))
+                if name.startswith("plants-") and name.endswith(".json")]
+
+    # Method that yields the stored plant rows from the shards, read by worker processes,
+    # or the supplier rows from suppliers.json like JsonStore
+    def _stored_rows(self, path, kind, track_progress):
+        if kind != "plant":
+            yield from super()._stored_rows(path, kind, track_progress)
+            return
+        paths = self.shard_paths()
+        for done, (shard, rows) in enumerate(zip(paths, map_in_processes(read_shard, [(shard,) for shard in paths])), 1):
+            count_bytes(shard, "read", os.path.getsize(shard))
+            yield from rows
+            if track_progress:
+                self.progress = done / len(paths)
+
+    # Method that folds the journal into the shards it touches and suppliers.json, and empties it
+    # Each dirty shard is rewritten by a worker process; the others are not read at all. The
+    # plants_served lists in suppliers.json are moved along with the plants that changed supplier.
+    @timed
+    def compact(self):
+        changes_by_shard = {}  # shard path -> {plant id: row or None}
+        for kind, key, row in self.journal.replay():
+            if kind == "plant":
+                changes_by_shard.setdefault(self.shard_path(key), {})[key] = row
+        os.makedirs(self.shard_folder, exist_ok=True)
+
+        served = {}
+        if os.path.exists(self.supplier_file):
+            with open(self.supplier_file, 'r') as f:
+                served = {row["name"]: set(row.get("plants_served", ())) for row in json.load(f)}
+        shards = list(changes_by_shard.items())
+        for (shard, _), (size, moves) in zip(shards, map_in_processes(write_shard, shards)):
+            count_bytes(shard, "written", size)
+            for plant_id, old_supplier, new_supplier in moves:
+                served.get(old_supplier, set()).discard(plant_id)
+                served.setdefault(new_supplier, set()).add(plant_id)
+
+        supplier_rows = list(self.iter_suppliers())
+        for row in supplier_rows:
+            row["plants_served"] = sorted(served.get(row["name"], ()))
+        atomic_write_json(self.supplier_file, supplier_rows, indent=4)
+        self.journal.clear()
+
+    # Method that splits the rows of plants.json into shard files and suppliers.json, after folding
+    # the json backend's journal into them so none of its changes are left behind
+    # Used when the sharded layout is opened without a shard folder; plants.json is left in place
+    def import_json(self, journal_file):
+        store = JsonStore(self.plant_file, self.supplier_file, journal_file)
+        store.compact()
+        shards = {}
+        plants_served = {}
+        for row in store.iter_plants():
+            plant_id = int(row["id"])
+            shards.setdefault(self.shard_path(plant_id), []).append(row)
+            plants_served.setdefault(row["supplier"], []).append(plant_id)
+        supplier_rows = list(store.iter_suppliers())
+        os.makedirs(self.shard_folder, exist_ok=True)
+        for shard, rows in shards.items():
+            atomic_write_json_rows(shard, rows)
+        for row in supplier_rows:
+            row["plants_served"] = sorted(plants_served.get(row["name"], []))
+        atomic_write_json(self.supplier_file, supplier_rows, indent=4)
+        self.journal.clear()
+
+    # Method that writes the plants back into plants.json and removes the shard folder, so the
+    # json backend reads them instead of the plants.json left from before the shards were made
+    # suppliers.json is shared by both layouts and brought up to date by compacting first
+    def export_json(self):
+        self.compact()
+        atomic_write_json_rows(self.plant_file, self.iter_plants())
+        shutil.rmtree(self.shard_folder)
+
+# This class stores the inventory in an SQLite database
+# Every change updates only the row it touches. The low stock and greenhouse alerts are
+# worked out from the inventory in memory, which has edits the background saver has not
+# written yet, so the only index besides the id is the one loading uses for plants_served.
+class SqliteStore:
+    def __init__(self, database_file):
+        self.database_file = database_file
+        # The connection is also used by the loading and saving threads, so it is shared under a lock
+        self.connection = sqlite3.connect(database_file, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS plants (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    description TEXT,
+                    quantity INTEGER NOT NULL,
+                    greenhouse_required TEXT NOT NULL COLLATE NOCASE,
+                    supplier TEXT
+                );
+                CREATE INDEX IF NOT EXISTS plants_supplier ON plants (supplier);
+                CREATE TABLE IF NOT EXISTS suppliers (
+                    name TEXT PRIMARY KEY,
+                    phone_number TEXT,
+                    address TEXT
+                );
+            """)
+        self.inventory = None
+        self.progress = 0.0  # fraction of the plants read by iter_plants
+
+    # Method that returns every plant and supplier row in the database
+    @timed
+    def load(self):
+        return list(self.iter_plants()), list(self.iter_suppliers())
+
+    # Method that yields the supplier rows, with plants_served looked up through the supplier index
+    def iter_suppliers(self):
+        with self.lock:
+            suppliers = [self._supplier_row(row) for row in self.connection.execute("SELECT * FROM suppliers ORDER BY rowid")]
+            for supplier in suppliers:
+                supplier["plants_served"] = [plant_id for (plant_id,) in self.connection.execute(
+                    "SELECT id FROM plants WHERE supplier = ? ORDER BY id", (supplier["name"],))]
+        return iter(suppliers)
+
+    # Method that yields the plant rows one at a time, updating self.progress
+    # Rows are fetched in chunks so the lock is not held while the caller works on them
+    def iter_plants(self):
+        with self.lock:
+            total = self.connection.execute("SELECT COUNT(*) FROM plants").fetchone()[0]
+            cursor = self.connection.execute("SELECT * FROM plants ORDER BY id")
+        self.progress = 0.0
+        count = 0
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(READ_ROWS)
+            if not rows:
+                break
+            for row in rows:
+                count += 1
+                self.progress = count / total
+                yield self._plant_row(row)
+        self.progress = 1.0
+
+    # Method that connects the store to the inventory and, if listen is true, writes every change made to it
+    # Pass listen=False when the changes reach record some other way, such as through a SaveScheduler
+    def attach(self, inventory, listen=True):
+        self.inventory = inventory
+        if listen:
+            inventory.listeners.append(self.record)
+
+    # Method that writes the records changed by one operation into the database in one transaction
+    @timed
+    def record(self, changes):
+        with self.lock, self.connection:
+            for kind, key, row in changes:
+                if kind == "plant":
+                    if row is None:
+                        self.connection.execute("DELETE FROM plants WHERE id = ?", (key,))
+                    else:
+                        self._write_plant(row)
+                else:
+                    if row is None:
+                        self.connection.execute("DELETE FROM suppliers WHERE name = ?", (key,))
+                    else:
+                        self._write_supplier(row)
+
+    # Method kept so both stores can be saved the same way; every change is already committed
+    @timed
+    def compact(self):
+        with self.lock:
+            self.connection.execute("PRAGMA optimize")
+
+    # Method that closes the database connection
+    def close(self):
+        self.connection.close()
+
+    # Method that inserts or updates one plant row
+    def _write_plant(self, row):
+        self.connection.execute(
+            "INSERT INTO plants (id, name, description, quantity, greenhouse_required, supplier) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET name = excluded.name, description = excluded.description, "
+            "quantity = excluded.quantity, greenhouse_required = excluded.greenhouse_required, "
+            "supplier = excluded.supplier",
+            (int(row["id"]), row["name"], row["description"], int(row["quantity"]),
+             row["greenhouse_required"], row["supplier"]))
+
+    # Method that inserts or updates one supplier row
+    def _write_supplier(self, row):
+        self.connection.execute(
+            "INSERT INTO suppliers (name, phone_number, address) VALUES (?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET phone_number = excluded.phone_number, address = excluded.address",
+            (row["name"], row["phone_number"], row["address"]))
+
+    # Method that converts a database row into a plants.json row
+    def _plant_row(self, row):
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "description": row["description"],
+            "quantity": row["quantity"],
+            "greenhouse_required": row["greenhouse_required"],
+            "supplier": row["supplier"]
+        }
+
+    # Method that converts a database row into a suppliers.json row
+    def _supplier_row(self, row):
+        return {
+            "name": row["name"],
+            "phone_number": row["phone_number"],
+            "address": row["address"],
+            "plants_served": []
+        }
+
+    # Method that checks whether the database has no plants and no suppliers yet
+    def is_empty(self):
+        with self.lock:
+            for table in ("plants", "suppliers"):
+                if self.connection.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone():
+                    return False
+        return True
+
+    # Method that copies plant and supplier rows into the database in one transaction
+    def import_rows(self, plant_rows, supplier_rows):
+        with self.lock, self.connection:
+            for row in supplier_rows:
+                self._write_supplier(row)
+            for row in plant_rows:
+                self._write_plant(row)
+
+# Method that copies the json files (and any journaled changes) into an SQLite database
+# Returns the number of plants and suppliers copied
+def migrate_json_to_sqlite(plant_file, supplier_file, journal_file, database_file):
+    plant_rows, supplier_rows = JsonStore(plant_file, supplier_file, journal_file).load()
+    store = SqliteStore(database_file)
+    try:
+        store.import_rows(plant_rows, supplier_rows)
+    finally:
+        store.close()
+    return len(plant_rows), len(supplier_rows)
+
+# Method that opens the store for the chosen backend, "json", "sharded" or "sqlite"
+# A new SQLite database or shard folder is filled from the json files the first time it is opened,
+# and a shard folder left by the sharded backend is moved back into plants.json when the json
+# backend is opened again
+def open_store(backend, plant_file, supplier_file, journal_file, database_file):
+    if backend == "json":
+        sharded = ShardedStore(plant_file, supplier_file)
+        if os.path.isdir(sharded.shard_folder):
+            sharded.export_json()
+        return JsonStore(plant_file, supplier_file, journal_file)
+    if backend == "sharded":
+        store = ShardedStore(plant_file, supplier_file)
+        if not os.path.isdir(store.shard_folder):
+            store.import_json(journal_file)
+        return store
+    if backend == "sqlite":
+        store = SqliteStore(database_file)
+        if store.is_empty():
+            plant_rows, supplier_rows = JsonStore(plant_file, supplier_file, journal_file).load()
+            store.import_rows(plant_rows, supplier_rows)
+        return store
+    raise ValueError(f"Unknown storage backend '{backend}'.")
+
+if __name__ == '__main__':
+    # One-shot migration of data/*.json into data/inventory.db
+    plants, suppliers = migrate_json_to_sqlite('data/plants.json', 'data/suppliers.json',
+                                               'data/journal.jsonl', 'data/inventory.db')
+    print(f"Migrated {plants} plants and {suppliers} suppliers to data/inventory.db")
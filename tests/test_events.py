@@ -0,0 +1,52 @@
+import json
+import socket
+from analytics import ReorderPoints
+from events import CallbackSink, EventBus, SocketSink, StockWatcher
+from model import Plant, Inventory, NO_SUPPLIER
+
+# Method that connects to a socket sink, sends since and returns the first event line it answers with
+def first_event(sink, since):
+    with socket.create_connection(("127.0.0.1", sink.port), timeout=5) as connection:
+        connection.sendall(f"{since}\n".encode())
+        with connection.makefile('rb') as f:
+            return json.loads(f.readline())
+
+def test_socket_numbering_carries_on_from_the_last_run(tmp_path):
+    sequence_file = str(tmp_path / "event_sequence.txt")
+    bus = EventBus([SocketSink("127.0.0.1", 0, sequence_file=sequence_file)], delay=0)
+    bus.publish([("plant", 1, None), ("plant", 2, None)])
+    bus.close()
+
+    sink = SocketSink("127.0.0.1", 0, sequence_file=sequence_file)
+    bus = EventBus([sink], delay=0)
+    bus.publish([("plant", 3, None)])
+    bus.flush()
+    try:
+        assert first_event(sink, 2)["sequence"] == 3
+    finally:
+        bus.close()
+
+def test_socket_client_ahead_of_the_sink_is_told_to_reload():
+    sink = SocketSink("127.0.0.1", 0)
+    bus = EventBus([sink], delay=0)
+    bus.publish([("plant", 1, None)])
+    bus.flush()
+    try:
+        assert first_event(sink, 40) == {"gone": True, "sequence": 1}
+    finally:
+        bus.close()
+
+def test_stock_watcher_publishes_transitions_only():
+    events = []
+    bus = EventBus([CallbackSink(events.extend)], delay=0)
+    inventory = Inventory()
+    inventory.add_plant(Plant(1, "Rose", "", 2, "no", NO_SUPPLIER))
+    inventory.add_plant(Plant(2, "Tulip", "", 10, "no", NO_SUPPLIER))
+    StockWatcher(bus, ReorderPoints(default=5)).attach(inventory)
+
+    inventory.update_plant(1, quantity=1)  # still low
+    inventory.update_plant(2, quantity=3)  # now low
+    inventory.update_plant(1, quantity=8)  # enough again
+    bus.close()
+
+    assert [(event["key"], event["row"]["state"]) for event in events] == [(2, "low"), (1, "ok")]
@@ -0,0 +1,62 @@
+from history import History
+from model import Plant, Supplier, Inventory
+
+# Method that returns an inventory with a supplier and two plants, and its history
+def sample_history():
+    inventory = Inventory()
+    inventory.add_supplier(Supplier("Green Co", "555-0100", "1 Main St"))
+    inventory.add_plant(Plant(1, "Rose", "Red", 10, "no", "Green Co"))
+    inventory.add_plant(Plant(2, "Fern", "", 4, "yes", "Green Co"))
+    return inventory, History(inventory)
+
+def test_undo_and_redo_an_update():
+    inventory, history = sample_history()
+    inventory.update_plant(1, quantity=3, name="Red Rose")
+
+    history.undo()
+    assert (inventory.get_plant(1).name, inventory.get_plant(1).quantity) == ("Rose", 10)
+    assert [plant.plant_id for plant in inventory.find_plants_by_name("Rose")] == [1]
+
+    history.redo()
+    assert (inventory.get_plant(1).name, inventory.get_plant(1).quantity) == ("Red Rose", 3)
+    assert not history.can_redo()
+
+def test_undo_a_delete_brings_the_plant_back():
+    inventory, history = sample_history()
+    inventory.delete_plant(2)
+
+    changes = history.undo()
+
+    assert changes == [("plant", 2, inventory.get_plant(2).to_dict(), True)]
+    assert inventory.get_supplier("Green Co").plants_served == {1, 2}
+    assert inventory.greenhouse_plants_exist()
+
+def test_undo_a_plant_id_change():
+    inventory, history = sample_history()
+    inventory.update_plant(1, plant_id=7)
+
+    history.undo()
+
+    assert sorted(inventory.plants) == [1, 2]
+    assert inventory.get_supplier("Green Co").plants_served == {1, 2}
+
+def test_undo_a_supplier_rename_in_one_step():
+    inventory, history = sample_history()
+    inventory.update_supplier("Green Co", "Blue Co", "555-0199", "2 Main St")
+
+    history.undo()
+
+    assert inventory.supplier_names() == ["Green Co"]
+    assert inventory.get_supplier("Green Co").phone_number == "555-0100"
+    assert {plant.supplier for plant in inventory.plants.values()} == {"Green Co"}
+    assert not history.can_undo()
+
+def test_a_new_change_drops_the_redo_steps():
+    inventory, history = sample_history()
+    inventory.update_plant(1, quantity=3)
+    history.undo()
+
+    inventory.update_plant(2, quantity=1)
+
+    assert not history.can_redo()
+    assert history.redo() is None
@@ -0,0 +1,117 @@
+import pytest
+from model import Plant, Supplier, Inventory, NO_SUPPLIER
+
+@pytest.mark.parametrize("name", [None, "", "   ", 12])
+def test_supplier_name_is_required(name):
+    inventory = Inventory()
+
+    with pytest.raises(ValueError, match="Supplier name is required"):
+        inventory.add_supplier(Supplier(name, "555-0100", "1 Main St"))
+    assert inventory.suppliers == {}
+
+def test_supplier_cannot_be_renamed_to_a_blank_name():
+    inventory = Inventory()
+    inventory.add_supplier(Supplier("Green Co", "555-0100", "1 Main St"))
+
+    with pytest.raises(ValueError, match="Supplier name is required"):
+        inventory.update_supplier("Green Co", " ", "555-0100", "1 Main St")
+    assert list(inventory.suppliers) == ["Green Co"]
+
+def test_load_skips_and_reports_bad_rows():
+    rows = [{"id": 1, "name": "Rose", "description": "", "quantity": 3, "greenhouse_required": "no", "supplier": "Green Co"},
+            {"id": 1, "name": "Tulip", "description": "", "quantity": 4, "greenhouse_required": "no", "supplier": "Green Co"},
+            {"id": 2, "name": "Lily"}]
+    inventory = Inventory()
+
+    errors = inventory.load(rows, [{"name": "Green Co", "phone_number": "", "address": ""}])
+
+    assert [plant.name for plant in inventory.plants.values()] == ["Rose"]
+    assert len(errors) == 2
+    assert "already exists" in errors[0]
+
+# Method that returns an inventory with two suppliers and three plants
+def sample_inventory():
+    inventory = Inventory()
+    inventory.add_supplier(Supplier("Green Co", "555-0100", "1 Main St"))
+    inventory.add_supplier(Supplier("Blue Co", "555-0101", "2 Main St"))
+    inventory.add_plant(Plant(1, "Rose", "Red", 10, "no", "Green Co"))
+    inventory.add_plant(Plant(2, "Rose", "White", 3, "yes", "Blue Co"))
+    inventory.add_plant(Plant(3, "Fern", "", 0, "yes", "Green Co"))
+    return inventory
+
+def test_plants_are_indexed_by_name_supplier_and_greenhouse():
+    inventory = sample_inventory()
+
+    assert sorted(plant.plant_id for plant in inventory.find_plants_by_name("Rose")) == [1, 2]
+    assert [plant.plant_id for plant in inventory.find_plants_by_name("Fern")] == [3]
+    assert inventory.find_plants_by_name("Tulip") == []
+    assert sorted(plant.plant_id for plant in inventory.plants_for_supplier("Green Co")) == [1, 3]
+    assert inventory.get_supplier("Green Co").plants_served == {1, 3}
+    assert inventory.greenhouse_count == 2
+
+def test_indexes_follow_updates_and_deletes():
+    inventory = sample_inventory()
+
+    inventory.update_plant(2, plant_id=20, name="Tulip", supplier="Green Co", greenhouse_required="no")
+    inventory.delete_plant(3)
+
+    assert inventory.get_plant(2) is None
+    assert [plant.plant_id for plant in inventory.find_plants_by_name("Rose")] == [1]
+    assert [plant.plant_id for plant in inventory.find_plants_by_name("Tulip")] == [20]
+    assert inventory.find_plants_by_name("Fern") == []
+    assert inventory.get_supplier("Green Co").plants_served == {1, 20}
+    assert inventory.get_supplier("Blue Co").plants_served == set()
+    assert not inventory.greenhouse_plants_exist()
+
+def test_supplier_rename_moves_its_plants():
+    inventory = sample_inventory()
+
+    renamed = inventory.update_supplier("Green Co", "Red Co", "555-0199", "3 Main St")
+
+    assert sorted(plant.plant_id for plant in renamed) == [1, 3]
+    assert inventory.supplier_names() == ["Red Co", "Blue Co"]
+    assert inventory.get_plant(1).supplier == "Red Co"
+    assert inventory.plants_for_supplier("Green Co") == []
+
+def test_removed_supplier_leaves_its_plants_without_one():
+    inventory = sample_inventory()
+
+    orphaned = inventory.remove_supplier("Blue Co")
+
+    assert [plant.plant_id for plant in orphaned] == [2]
+    assert inventory.get_plant(2).supplier == NO_SUPPLIER
+    assert inventory.get_supplier("Blue Co") is None
+
+def test_add_plants_adds_nothing_when_one_is_refused():
+    inventory = sample_inventory()
+    changes = []
+    inventory.listeners.append(changes.append)
+
+    with pytest.raises(ValueError, match="already exists"):
+        inventory.add_plants([Plant(4, "Lily", "", 1, "no", "Green Co"), Plant(1, "Daisy", "", 1, "no", "Green Co")])
+
+    assert inventory.get_plant(4) is None
+    assert inventory.find_plants_by_name("Lily") == []
+    assert changes == []
+
+def test_adjust_quantities_is_all_or_nothing():
+    inventory = sample_inventory()
+
+    with pytest.raises(ValueError) as error:
+        inventory.adjust_quantities([(1, -4), (2, -5), (9, 1)])
+    assert "cannot take away 5" in str(error.value)
+    assert "9 does not exist" in str(error.value)
+    assert inventory.get_plant(1).quantity == 10
+
+    changed = inventory.adjust_quantities([(1, -4), (2, 2), (1, 1)])
+    assert {plant.plant_id: plant.quantity for plant in changed} == {1: 7, 2: 5}
+
+def test_unique_names_per_supplier():
+    inventory = sample_inventory()
+    inventory.unique_names = True
+
+    with pytest.raises(ValueError, match="already has a plant named 'Rose'"):
+        inventory.add_plant(Plant(4, "Rose", "", 1, "no", "Green Co"))
+    inventory.add_plant(Plant(5, "Rose", "", 1, "no", NO_SUPPLIER))
+    with pytest.raises(ValueError):
+        inventory.update_plant(2, supplier="Green Co")
@@ -0,0 +1,48 @@
+import pytest
+from service import Conflict, InventoryService
+from storage import JsonStore
+
+# Method that returns a plant row for the service
+def plant_row(plant_id, name="Rose", quantity=5):
+    return {"id": plant_id, "name": name, "description": "", "quantity": quantity,
+            "greenhouse_required": "no", "supplier": "No Supplier Assigned"}
+
+@pytest.fixture
+def service(tmp_path):
+    service = InventoryService(JsonStore(str(tmp_path / "plants.json"), str(tmp_path / "suppliers.json"),
+                                         str(tmp_path / "journal.jsonl")))
+    yield service
+    service.close()
+
+def test_write_from_an_old_version_is_refused(service):
+    version = service.add_plants([plant_row(1)])[0][4]
+    service.update_plant(1, version, {"quantity": 3})
+
+    with pytest.raises(Conflict) as conflict:
+        service.update_plant(1, version, {"quantity": 9})
+    assert conflict.value.row["quantity"] == 3
+    assert service.inventory.get_plant(1).quantity == 3
+
+def test_write_to_a_removed_record_is_refused(service):
+    version = service.add_plants([plant_row(1)])[0][4]
+    service.delete_plant(1, version)
+
+    with pytest.raises(Conflict, match="removed"):
+        service.update_plant(1, version, {"quantity": 9})
+
+def test_record_added_again_does_not_take_an_old_version(service):
+    old_version = service.add_plants([plant_row(1)])[0][4]
+    service.delete_plant(1, old_version)
+    service.add_plants([plant_row(1, name="Tulip")])
+
+    with pytest.raises(Conflict):
+        service.update_plant(1, old_version, {"quantity": 9})
+    assert service.inventory.get_plant(1).name == "Tulip"
+
+def test_changes_since_returns_only_later_changes(service):
+    service.add_plants([plant_row(1)])
+    sequence, _ = service.changes_since(0)
+    service.add_plants([plant_row(2)])
+
+    _, changes = service.changes_since(sequence)
+    assert [key for _, _, key, _, _ in changes] == [2]
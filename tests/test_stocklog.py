@@ -0,0 +1,62 @@
+from analytics import forecast_stockouts
+from autosave import SaveScheduler
+from history import History
+from model import Plant, Inventory, NO_SUPPLIER
+from stocklog import StockLog
+
+# This class is a store that keeps the changes written to it
+class MemoryStore:
+    def __init__(self):
+        self.written = []
+
+    def attach(self, inventory, listen=True):
+        pass
+
+    def record(self, changes):
+        self.written.extend(changes)
+
+# Method that returns an inventory with one plant of 10 logging to stock_log
+def logged_inventory(stock_log):
+    inventory = Inventory()
+    inventory.add_plant(Plant(1, "Rose", "", 10, "no", NO_SUPPLIER))
+    stock_log.attach(inventory)
+    return inventory
+
+def test_changes_are_written_on_flush(tmp_path):
+    stock_log = StockLog(str(tmp_path))
+    inventory = logged_inventory(stock_log)
+
+    inventory.update_plant(1, quantity=7)
+    assert stock_log.count == 0
+    stock_log.flush()
+
+    assert stock_log.count == 1
+    assert list(stock_log.read("changes")) == [-3]
+    assert StockLog(str(tmp_path)).count == 1
+
+def test_saver_flushes_the_log_with_each_save(tmp_path):
+    stock_log = StockLog(str(tmp_path))
+    inventory = logged_inventory(stock_log)
+    saver = SaveScheduler(MemoryStore(), delay=0)
+    saver.attach(inventory)
+    saver.add_log(stock_log)
+
+    inventory.update_plant(1, quantity=4)
+    assert saver.flush() is None
+    saver.close()
+
+    assert list(stock_log.read("quantities")) == [4]
+
+def test_undone_sales_are_left_out_of_the_forecast(tmp_path):
+    stock_log = StockLog(str(tmp_path))
+    inventory = logged_inventory(stock_log)
+    history = History(inventory)
+
+    inventory.update_plant(1, quantity=8)  # sold 2
+    inventory.update_plant(1, quantity=2)  # sold 6 by mistake
+    history.undo()
+    stock_log.flush()
+
+    forecast = forecast_stockouts(inventory, stock_log, 28)
+    assert list(stock_log.read("undone")) == [0, 0, 1]
+    assert forecast.rates == {1: 2.0}
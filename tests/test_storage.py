@@ -0,0 +1,159 @@
+import io
+import json
+import pytest
+import storage
+from model import Plant, Supplier, Inventory
+from storage import Journal, JsonStore, iter_json_array, open_store
+
+# Method that returns a plants.json row
+def plant_row(plant_id, name="Rose", quantity=5, supplier="Green Co"):
+    return {"id": plant_id, "name": name, "description": "", "quantity": quantity,
+            "greenhouse_required": "no", "supplier": supplier}
+
+def test_journal_torn_last_line_is_cut_off(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    Journal(str(path)).append([("plant", 1, plant_row(1))])
+    # A crash in the middle of the next append leaves half a line at the end
+    with open(path, 'a') as f:
+        f.write('{"kind": "plant", "key": 3, "ro')
+
+    journal = Journal(str(path))
+    journal.append([("plant", 2, plant_row(2))])
+
+    assert [key for _, key, _ in Journal(str(path)).replay()] == [1, 2]
+
+def test_journal_replay_skips_bad_lines(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    with open(path, 'w') as f:
+        f.write(json.dumps({"kind": "plant", "key": 1, "row": plant_row(1)}) + "\n")
+        f.write("not json\n")
+        f.write(json.dumps({"kind": "plant", "key": 2, "row": None}) + "\n")
+
+    journal = Journal(str(path))
+
+    assert [key for _, key, _ in journal.replay()] == [1, 2]
+    assert journal.bad_lines == 1
+    assert journal.entries == 2
+
+def test_store_keeps_changes_saved_after_a_torn_write(tmp_path):
+    store = JsonStore(str(tmp_path / "plants.json"), str(tmp_path / "suppliers.json"), str(tmp_path / "journal.jsonl"))
+    store.record([("plant", 1, plant_row(1))])
+    with open(store.journal.path, 'a') as f:
+        f.write('{"kind": "plant"')
+
+    store = JsonStore(str(tmp_path / "plants.json"), str(tmp_path / "suppliers.json"), str(tmp_path / "journal.jsonl"))
+    store.record([("plant", 2, plant_row(2, name="Tulip"))])
+    store.compact()
+
+    plants, _ = JsonStore(str(tmp_path / "plants.json"), str(tmp_path / "suppliers.json"),
+                          str(tmp_path / "journal.jsonl")).load()
+    assert [row["name"] for row in plants] == ["Rose", "Tulip"]
+
+# Method that opens a backend on the files in folder
+def open_backend(backend, folder):
+    return open_store(backend, str(folder / "plants.json"), str(folder / "suppliers.json"),
+                      str(folder / "journal.jsonl"), str(folder / "inventory.db"))
+
+def test_switching_between_json_and_sharded_keeps_every_change(tmp_path):
+    store = open_backend("json", tmp_path)
+    store.record([("plant", 1, plant_row(1)), ("supplier", "Green Co", {"name": "Green Co", "phone_number": "",
+                                                                          "address": "", "plants_served": []})])
+
+    store = open_backend("sharded", tmp_path)
+    assert [row["name"] for row in store.load()[0]] == ["Rose"]
+    store.record([("plant", 2, plant_row(2, name="Tulip"))])
+
+    store = open_backend("json", tmp_path)
+    plants, suppliers = store.load()
+    assert [row["name"] for row in plants] == ["Rose", "Tulip"]
+    assert suppliers[0]["plants_served"] == [1, 2]
+    assert not (tmp_path / "plants").exists()
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 5, 64])
+def test_json_array_numbers_split_across_chunks(monkeypatch, chunk):
+    monkeypatch.setattr(storage, "READ_CHUNK", chunk)
+    text = '[1.5, -1.5e10, 12345, true, "a,b", {"id": 7}, [1, 2.25]]'
+
+    assert list(iter_json_array(io.StringIO(text))) == json.loads(text)
+
+# Method that returns a JsonStore on the files in folder
+def json_store(folder, compact_every=storage.COMPACT_EVERY):
+    return JsonStore(str(folder / "plants.json"), str(folder / "suppliers.json"), str(folder / "journal.jsonl"),
+                     compact_every)
+
+def test_journal_replay_applies_the_last_change_of_each_record(tmp_path):
+    store = json_store(tmp_path)
+    store.record([("plant", 1, plant_row(1)), ("plant", 2, plant_row(2, name="Fern"))])
+    store.compact()
+    store.record([("plant", 1, plant_row(1, quantity=9))])
+    store.record([("plant", 2, None)])
+    store.record([("plant", 3, plant_row(3, name="Tulip"))])
+    store.record([("plant", 1, None)])
+    store.record([("plant", 1, plant_row(1, quantity=4))])
+
+    plants, _ = json_store(tmp_path).load()
+
+    assert [(row["id"], row["quantity"]) for row in plants] == [(1, 4), (3, 5)]
+
+def test_compaction_folds_the_journal_into_the_files(tmp_path):
+    store = json_store(tmp_path, compact_every=3)
+    store.record([("supplier", "Green Co", {"name": "Green Co", "phone_number": "", "address": "",
+                                            "plants_served": []})])
+    store.record([("plant", 1, plant_row(1)), ("plant", 2, plant_row(2, name="Fern"))])
+    assert store.journal.entries == 0
+    assert not (tmp_path / "journal.jsonl").exists()
+    with open(tmp_path / "suppliers.json") as f:
+        assert json.load(f)[0]["plants_served"] == [1, 2]
+
+    store.record([("plant", 2, None)])
+    store = json_store(tmp_path)
+    assert (tmp_path / ("plants" + storage.SNAPSHOT_EXTENSION)).exists()
+    from_snapshot = store.load()
+    store.use_snapshot = False
+
+    from_json = store.load()
+
+    # The snapshot leaves plants_served empty, as it is rebuilt from the plants when loading
+    assert from_json[0] == from_snapshot[0]
+    assert [row["id"] for row in from_snapshot[0]] == [1]
+    assert [{**row, "plants_served": []} for row in from_json[1]] == from_snapshot[1]
+
+# Method that makes the same edits to an inventory saved by store
+def edit_inventory(inventory):
+    inventory.add_supplier(Supplier("Green Co", "555-0100", "1 Main St"))
+    inventory.add_supplier(Supplier("Blue Co", "555-0101", "2 Main St"))
+    inventory.add_plants([Plant(1, "Rose", "Red", 10, "no", "Green Co"), Plant(2, "Fern", "", 4, "yes", "Blue Co"),
+                          Plant(3, "Tulip", "", 0, "no", "Green Co")])
+    inventory.update_plant(1, quantity=7, supplier="Blue Co")
+    inventory.delete_plant(3)
+    inventory.update_supplier("Green Co", "Red Co", "555-0199", "3 Main St")
+    inventory.adjust_quantities([(2, 6)])
+
+# Method that returns the rows of an inventory loaded from the backend on the files in folder,
+# sorted by key since the backends do not keep the same order
+def saved_rows(backend, folder, compact=False):
+    store = open_backend(backend, folder)
+    inventory = Inventory()
+    try:
+        assert inventory.load(*store.load()) == []
+        if compact:
+            store.compact()
+    finally:
+        if backend == "sqlite":
+            store.close()
+    return (sorted(inventory.plant_rows(), key=lambda row: row["id"]),
+            sorted(inventory.supplier_rows(), key=lambda row: row["name"]))
+
+@pytest.mark.parametrize("backend", ["json", "sharded", "sqlite"])
+def test_backends_load_what_was_saved(tmp_path, backend):
+    inventory = Inventory()
+    store = open_backend(backend, tmp_path)
+    store.attach(inventory)
+    edit_inventory(inventory)
+    if backend == "sqlite":
+        store.close()
+    expected = (sorted(inventory.plant_rows(), key=lambda row: row["id"]),
+                sorted(inventory.supplier_rows(), key=lambda row: row["name"]))
+
+    assert saved_rows(backend, tmp_path, compact=True) == expected
+    assert saved_rows(backend, tmp_path) == expected
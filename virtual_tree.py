@@ -0,0 +1,223 @@
+import tkinter as tk
+from tkinter import ttk
+
+# Row height used when the Treeview style does not set one
+DEFAULT_ROW_HEIGHT = 20
+# Height of the column headings above the first row
+HEADING_HEIGHT = 25
+# Rows scrolled for each turn of the mouse wheel
+WHEEL_ROWS = 3
+
+# This class is a Treeview that only creates the rows that fit in the window
+# The rows are identified by keys (plant ids for the inventory table) and the
+# values of a row are looked up with get_row(key) when the row scrolls into view,
+# so the widget stays small and fast no matter how many keys there are.
+class VirtualTreeview(ttk.Treeview):
+    def __init__(self, master, get_row, **kwargs):
+        kwargs.setdefault("selectmode", "browse")
+        super().__init__(master, **kwargs)
+        self.get_row = get_row
+        self.keys = []  # every row key in display order
+        self.first = 0  # position in keys of the top row in the window
+        self.rows = 1  # number of rows that fit in the window
+        self.selected_key = None
+        self.window_keys = {}  # row id -> key for the rows currently in the widget
+        self.scroll_command = None
+        self.sort_column = None
+        self.sort_reverse = False
+
+        # Clicking a column heading sorts the backing keys by that column
+        for col in self["columns"]:
+            self.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+
+        self.bind("<Configure>", self._on_resize)
+        self.bind("<<TreeviewSelect>>", self._on_select)
+        self.bind("<MouseWheel>", self._on_mousewheel)
+        self.bind("<Button-4>", lambda event: self.yview("scroll", -WHEEL_ROWS, "units"))
+        self.bind("<Button-5>", lambda event: self.yview("scroll", WHEEL_ROWS, "units"))
+        self.bind("<Up>", lambda event: self._move_selection(-1))
+        self.bind("<Down>", lambda event: self._move_selection(1))
+
+    # ---------- Scrolling ----------
+    # Method that sets the function the vertical scrollbar uses to show the position, usually scrollbar.set
+    def set_yscrollcommand(self, command):
+        self.scroll_command = command
+        self._update_scrollbar()
+
+    # Method called by the vertical scrollbar; moves the window over the backing keys
+    def yview(self, *args):
+        if not args:
+            return self._fractions()
+        if args[0] == "moveto":
+            first = int(float(args[1]) * len(self.keys))
+        else:
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.rows
+            first = self.first + step
+        self.scroll_to(first)
+
+    # Method that puts the key at the given position at the top of the window
+    def scroll_to(self, first):
+        self.first = max(0, min(first, len(self.keys) - self.rows))
+        self.render()
+
+    # Method that returns the part of the keys shown in the window as (top, bottom) fractions
+    def _fractions(self):
+        if not self.keys:
+            return 0.0, 1.0
+        last = min(self.first + self.rows, len(self.keys))
+        return self.first / len(self.keys), last / len(self.keys)
+
+    # Method that moves the scrollbar to match the window
+    def _update_scrollbar(self):
+        if self.scroll_command:
+            self.scroll_command(*self._fractions())
+
+    # Method that works out how many rows fit when the widget is resized
+    def _on_resize(self, event):
+        row_height = ttk.Style().lookup("Treeview", "rowheight") or DEFAULT_ROW_HEIGHT
+        rows = max(1, (event.height - HEADING_HEIGHT) // int(row_height))
+        if rows != self.rows:
+            self.rows = rows
+            self.scroll_to(self.first)
+
+    # Method that scrolls the window with the mouse wheel (Windows and macOS)
+    def _on_mousewheel(self, event):
+        if event.delta:
+            direction = -1 if event.delta > 0 else 1
+            self.yview("scroll", direction * WHEEL_ROWS, "units")
+
+    # ---------- Rendering ----------
+    # Method that replaces the widget rows with the keys that fall inside the window
+    def render(self):
+        self.delete(*self.get_children())
+        self.window_keys = {}
+        for key in self.keys[self.first:self.first + self.rows]:
+            row_id = str(key)
+            self.insert('', tk.END, iid=row_id, values=self.get_row(key))
+            self.window_keys[row_id] = key
+        if self.selected_key is not None and str(self.selected_key) in self.window_keys:
+            self.selection_set(str(self.selected_key))
+        self._update_scrollbar()
+
+    # ---------- Selection ----------
+    # Method that remembers the selected key so it survives scrolling out of the window
+    def _on_select(self, event):
+        selection = self.selection()
+        if selection:
+            self.selected_key = self.window_keys.get(selection[0], self.selected_key)
+        elif str(self.selected_key) in self.window_keys:
+            # The selected row is still in the window, so it was deselected
+            self.selected_key = None
+
+    # Method that returns the selected key, or None
+    def selected(self):
+        return self.selected_key
+
+    # Method that moves the selection up or down, scrolling when it leaves the window
+    def _move_selection(self, step):
+        if not self.keys:
+            return "break"
+        if self.selected_key in self.window_keys.values():
+            index = self.first + list(self.window_keys.values()).index(self.selected_key) + step
+        else:
+            index = self.first
+        index = max(0, min(index, len(self.keys) - 1))
+        self.selected_key = self.keys[index]
+        if index < self.first:
+            self.scroll_to(index)
+        elif index >= self.first + self.rows:
+            self.scroll_to(index - self.rows + 1)
+        else:
+            self.selection_set(str(self.selected_key))
+        self.focus(str(self.selected_key))
+        return "break"
+
+    # ---------- Backing keys ----------
+    # Method that replaces every key shown by the table
+    def set_keys(self, keys):
+        self.keys = list(keys)
+        if self.sort_column is not None:
+            self._sort_keys()
+        self.scroll_to(self.first)
+
+    # Method that adds a key to the end of the table, or where it belongs when the table is sorted
+    def append_key(self, key):
+        if self.sort_column is None:
+            self.keys.append(key)
+        else:
+            self.keys.insert(self._sorted_position(key), key)
+        self.render()
+
+    # Method that adds several keys to the end of the table, drawing the window once
+    # When the table is sorted they are sorted in with the others
+    def extend_keys(self, keys):
+        self.keys.extend(keys)
+        if self.sort_column is not None:
+            self._sort_keys()
+        self.render()
+
+    # Method that removes a key from the table
+    def remove_key(self, key):
+        try:
+            self.keys.remove(key)
+        except ValueError:
+            # The key is not in the table, for example because a search is hiding it
+            return
+        if self.selected_key == key:
+            self.selected_key = None
+        self.scroll_to(self.first)
+
+    # Method that redraws a row after its values changed, or after its key changed from old_key to new_key
+    def refresh_key(self, old_key, new_key=None):
+        if new_key is not None and new_key != old_key:
+            try:
+                self.keys[self.keys.index(old_key)] = new_key
+            except ValueError:
+                # The key is not in the table, for example because a search is hiding it
+                return
+            if self.selected_key == old_key:
+                self.selected_key = new_key
+        if str(old_key) in self.window_keys or new_key is not None:
+            self.render()
+
+    # ---------- Sorting ----------
+    # Method that sorts the table by a column, reversing the order when the same column is clicked again
+    def sort_by(self, column):
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        self._sort_keys()
+        self.scroll_to(0)
+
+    # Method that returns a function giving the value a key is sorted by in the sort column
+    def _sort_value(self):
+        index = list(self["columns"]).index(self.sort_column)
+
+        def sort_value(key):
+            value = self.get_row(key)[index]
+            return value.lower() if isinstance(value, str) else value
+
+        return sort_value
+
+    # Method that sorts the backing keys by the values of the sort column
+    def _sort_keys(self):
+        self.keys.sort(key=self._sort_value(), reverse=self.sort_reverse)
+
+    # Method that returns where a new key goes in the sorted keys: after the keys with the same
+    # value, as if it had been there when they were sorted, found by a binary search
+    def _sorted_position(self, key):
+        sort_value = self._sort_value()
+        value = sort_value(key)
+        low, high = 0, len(self.keys)
+        while low < high:
+            middle = (low + high) // 2
+            other = sort_value(self.keys[middle])
+            if (value < other) if not self.sort_reverse else (value > other):
+                high = middle
+            else:
+                low = middle + 1
+        return low